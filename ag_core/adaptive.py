@@ -0,0 +1,163 @@
+# ag_core/adaptive.py
+import logging
+
+import numpy as np
+
+logger_adapt = logging.getLogger(f"{__name__}")
+
+_UNIFORM_STD = 1.0 / np.sqrt(12.0)  # Desviación típica de una uniforme en [0, 1]
+
+
+class AdaptiveControl:
+    """
+    Control autoadaptativo de los parámetros del AG, llamado una vez por generación con la
+    población y su fitness. Mide la diversidad genotípica (desviación típica de los genes,
+    relativa a la de la primera generación) y la tasa de mejora (fracción de las últimas
+    'window' generaciones que mejoraron el mejor fitness), y ajusta:
+
+    - Paso de mutación: regla de 1/5 de Rechenberg sobre la tasa de mejora. Más de 1/5:
+      el paso crece; menos: se reduce.
+    - Probabilidad de mutación: baja (hasta la mitad) mientras hay mejoras, para no
+      deshacer el progreso, y vuelve a la inicial cuando dejan de llegar.
+    - Probabilidad de cruce: sube con el estancamiento (recombina más los individuos
+      existentes) y vuelve a la inicial con cada mejora.
+    - Presión de selección (K del torneo): sube mientras hay mejoras y baja hasta 2 con
+      el estancamiento ('patience' generaciones sin mejora) o sin diversidad.
+
+    Los parámetros se mueven en bandas alrededor de los iniciales (STEP_RANGE,
+    MUTATION_RANGE, CROSSOVER_MAX_FACTOR): el control corrige la configuración elegida,
+    no la sustituye. Cada generación queda en history (trayectoria para análisis).
+    """
+    STEP_FACTOR = 0.85
+    STEP_RANGE = (0.25, 2.0)        # Paso: entre 1/4 y el doble del inicial
+    MUTATION_RANGE = (0.5, 1.0)     # Pm: entre la mitad y la inicial
+    CROSSOVER_MAX_FACTOR = 1.25     # Pc: hasta 1.25 veces la inicial (máximo 1)
+    MIN_K, MAX_K = 2, 7
+    MIN_DIVERSITY = 0.05
+
+    def __init__(self, mutation_prob, crossover_prob, mutation_step=0.1, K_tournament=3, window=10, patience=10):
+        self.base_mutation_prob = float(mutation_prob)
+        self.base_crossover_prob = float(crossover_prob)
+        self.base_mutation_step = float(mutation_step)
+        self.window = max(1, int(window))
+        self.patience = max(1, int(patience))
+        self.mutation_prob = self.base_mutation_prob
+        self.crossover_prob = self.base_crossover_prob
+        self.mutation_step = self.base_mutation_step
+        self.K_tournament = int(np.clip(K_tournament, self.MIN_K, self.MAX_K))
+        self.history = []
+        self._improvements = []
+        self._best = -np.inf
+        self._stagnation = 0
+        self._initial_diversity = None
+
+    @staticmethod
+    def diversity(population, low, high):
+        """Diversidad en [0, 1]: desviación típica media de los genes respecto a la de una población uniforme."""
+        population = np.atleast_2d(np.asarray(population, dtype=float))
+        width = np.broadcast_to(np.asarray(high, dtype=float) - np.asarray(low, dtype=float), population.shape[1:])
+        return float(np.clip(np.mean(population.std(axis=0) / (width * _UNIFORM_STD)), 0.0, 1.0))
+
+    def update(self, generation, population, fitness, low, high):
+        """Mide la generación y recalcula los parámetros; devuelve la entrada añadida a history."""
+        fitness = np.asarray(fitness, dtype=float)
+        finite = fitness[np.isfinite(fitness)]
+        diversity = self.diversity(population, low, high)
+        if self._initial_diversity is None:
+            self._initial_diversity = max(diversity, 1e-12)
+        diversity_rel = min(1.0, diversity / self._initial_diversity)  # 1 = tan diversa como al empezar
+
+        best = finite.max() if len(finite) else -np.inf
+        improved = bool(np.isfinite(best) and (not np.isfinite(self._best)
+                                               or best > self._best + 1e-12 * max(1.0, abs(self._best))))
+        if improved:
+            self._best = best
+        self._stagnation = 0 if improved else self._stagnation + 1
+        self._improvements = (self._improvements + [improved])[-self.window:]
+        improvement_rate = float(np.mean(self._improvements))
+
+        # Regla de 1/5 y Pm: solo con la ventana completa, para no reaccionar al ruido inicial
+        if len(self._improvements) == self.window:
+            if improvement_rate > 0.2:
+                self.mutation_step /= self.STEP_FACTOR
+            elif improvement_rate < 0.2:
+                self.mutation_step *= self.STEP_FACTOR
+            low_pm, high_pm = self.MUTATION_RANGE
+            self.mutation_prob = self.base_mutation_prob * (high_pm - (high_pm - low_pm) * improvement_rate)
+        self.mutation_step = float(np.clip(self.mutation_step, *(self.base_mutation_step * np.array(self.STEP_RANGE))))
+
+        max_crossover = min(1.0, self.CROSSOVER_MAX_FACTOR * self.base_crossover_prob)
+        self.crossover_prob = self.base_crossover_prob + \
+            (max_crossover - self.base_crossover_prob) * min(1.0, self._stagnation / self.patience)
+
+        if self._stagnation >= self.patience or diversity_rel < self.MIN_DIVERSITY:
+            self.K_tournament = max(self.MIN_K, self.K_tournament - 1)
+        elif improvement_rate >= 0.2:
+            self.K_tournament = min(self.MAX_K, self.K_tournament + 1)
+
+        entry = {
+            'generation': int(generation), 'diversity': diversity, 'improvement_rate': improvement_rate,
+            'stagnation': self._stagnation, 'mutation_prob': self.mutation_prob,
+            'mutation_step': self.mutation_step, 'crossover_prob': self.crossover_prob,
+            'K_tournament': self.K_tournament,
+        }
+        self.history.append(entry)
+        logger_adapt.debug(f"AdaptiveControl: Gen {generation}: diversidad {diversity:.3f}, mejora {improvement_rate:.2f}, "
+                           f"estancamiento {self._stagnation} -> Pm {self.mutation_prob:.3f}, paso {self.mutation_step:.4f}, "
+                           f"Pc {self.crossover_prob:.3f}, K {self.K_tournament}")
+        return entry
+
+    def apply(self, ga_instance, low, high):
+        """
+        Escribe los parámetros en el motor. NumpyGA: probabilidad y escala de la mutación
+        gaussiana y probabilidad de cruce. PyGAD (configurado sin mutation_probability, con
+        gene_space acotado) muta un gen por hijo sumando un valor en
+        [random_mutation_min_val, random_mutation_max_val]: ahí se adapta ese paso; la
+        probabilidad de mutación no tiene equivalente, y la de cruce solo se toca si el motor
+        se creó con una (sin ella PyGAD cruza todas las parejas). K solo se escribe si el
+        motor selecciona por torneo.
+        """
+        width = float(np.max(np.asarray(high, dtype=float) - np.asarray(low, dtype=float)))
+        if getattr(ga_instance, 'crossover_probability', None) is not None:
+            ga_instance.crossover_probability = self.crossover_prob
+        if getattr(ga_instance, 'parent_selection_type', None) == 'tournament':
+            ga_instance.K_tournament = self.K_tournament
+        if hasattr(ga_instance, 'mutation_scale'):
+            ga_instance.mutation_probability = self.mutation_prob
+            ga_instance.mutation_scale = self.mutation_step
+        else:
+            ga_instance.random_mutation_min_val = -self.mutation_step * width
+            ga_instance.random_mutation_max_val = self.mutation_step * width
+
+    def summary(self):
+        """Resumen de la trayectoria (valores inicial, final y rango de cada parámetro)."""
+        if not self.history:
+            return "sin generaciones"
+        parts = []
+        for key, fmt in (('mutation_prob', '.3f'), ('mutation_step', '.4f'), ('crossover_prob', '.3f'), ('K_tournament', 'd')):
+            values = [h[key] for h in self.history]
+            parts.append(f"{key} {values[0]:{fmt}} -> {values[-1]:{fmt}} [{min(values):{fmt}}, {max(values):{fmt}}]")
+        return "; ".join(parts)
+
+
+if __name__ == '__main__':
+    from .numpy_ga import NumpyGA
+
+    # Rastrigin 8-D en [-5.12, 5.12] (a minimizar): muchos óptimos locales
+    f = lambda X: -(10 * X.shape[1] + (X ** 2 - 10 * np.cos(2 * np.pi * X)).sum(axis=1))
+    for adaptive in (False, True):
+        results = []
+        for seed in range(12):
+            control = AdaptiveControl(0.1, 0.8, mutation_step=0.1) if adaptive else None
+
+            def on_generation(ga):
+                if control is not None:
+                    control.update(ga.generations_completed, ga.population, ga.last_generation_fitness, -5.12, 5.12)
+                    control.apply(ga, -5.12, 5.12)
+
+            ga = NumpyGA(200, 40, 8, -5.12, 5.12, lambda ga, X, idx: f(X), parent_selection_type='tournament',
+                         crossover_type='blend', random_seed=seed, on_generation=on_generation)
+            ga.run()
+            results.append(-max(ga.best_solutions_fitness))
+        print(f"{'Adaptativo' if adaptive else 'Estático':>10}: f mínimo medio {np.mean(results):.3f} (12 semillas)")
+    print("Trayectoria (última semilla):", control.summary())
@@ -0,0 +1,189 @@
+# ag_core/archive.py
+import numpy as np
+
+from .evaluators import Evaluator
+
+
+class _KDTree:
+    """KD-tree estático sobre un array (n, d), con hojas de hasta 'leaf_size' puntos."""
+    def __init__(self, points, leaf_size=16):
+        self.points = points
+        self.leaf_size = leaf_size
+        # Cada nodo: (indices, None, None, None) para hojas o (None, eje, umbral, (izq, der))
+        self.root = self._build(np.arange(len(points)), depth=0)
+
+    def _build(self, indices, depth):
+        if len(indices) <= self.leaf_size:
+            return (indices, None, None, None)
+        axis = depth % self.points.shape[1]
+        values = self.points[indices, axis]
+        median = np.median(values)
+        left, right = indices[values <= median], indices[values > median]
+        if len(left) == 0 or len(right) == 0:  # Todos iguales en este eje
+            return (indices, None, None, None)
+        return (None, axis, median, (self._build(left, depth + 1), self._build(right, depth + 1)))
+
+    def nearest(self, query):
+        best_idx, best_dist = -1, np.inf
+        stack = [self.root]
+        while stack:
+            indices, axis, threshold, children = stack.pop()
+            if indices is not None:
+                dists = np.sqrt(((self.points[indices] - query) ** 2).sum(axis=1))
+                i = int(np.argmin(dists))
+                if dists[i] < best_dist:
+                    best_idx, best_dist = int(indices[i]), float(dists[i])
+                continue
+            diff = query[axis] - threshold
+            near, far = (children[0], children[1]) if diff <= 0 else (children[1], children[0])
+            # Visitar primero la rama cercana (se apila al final); la lejana solo si puede mejorar
+            if abs(diff) < best_dist:
+                stack.append(far)
+            stack.append(near)
+        return best_idx, best_dist
+
+
+class EvaluationArchive:
+    """
+    Archivo de todos los puntos evaluados y su f(x) real, en arrays contiguos que
+    crecen por duplicación. Para consultas de vecino más cercano mantiene un índice
+    ordenado (1-D) o un KD-tree (N-D) que se reconstruye de forma perezosa.
+    Los puntos cuya evaluación falló se guardan con f(x) = NaN.
+    Con num_objectives > 1 (modo multiobjetivo) cada valor es una fila (num_objectives,).
+    dtype (float64 por defecto o float32) es el tipo en que se guardan puntos y valores.
+    """
+    def __init__(self, num_genes=1, initial_capacity=1024, num_objectives=1, dtype=float):
+        self.num_genes = int(num_genes)
+        self.num_objectives = int(num_objectives)
+        self._value_shape = () if self.num_objectives == 1 else (self.num_objectives,)
+        self._x = np.empty((initial_capacity, self.num_genes), dtype=dtype)
+        self._y = np.empty((initial_capacity,) + self._value_shape, dtype=dtype)
+        self._size = 0
+        self._index = None  # Índice ordenado (1-D) o _KDTree (N-D); None = desactualizado
+
+    def __len__(self):
+        return self._size
+
+    def add(self, solutions, values):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        n = len(solutions)
+        values = np.asarray(values, dtype=float).reshape((n,) + self._value_shape)
+        if self._size + n > len(self._y):
+            capacity = max(2 * len(self._y), self._size + n)
+            self._x = np.resize(self._x, (capacity, self.num_genes))
+            self._y = np.resize(self._y, (capacity,) + self._value_shape)
+        self._x[self._size:self._size + n] = solutions
+        self._y[self._size:self._size + n] = values
+        self._size += n
+        self._index = None
+
+    @property
+    def points(self):
+        """Vista de solo lectura de los puntos evaluados (n, num_genes)."""
+        view = self._x[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def values(self):
+        """Vista de solo lectura de los f(x) evaluados (n,) o (n, num_objectives)."""
+        view = self._y[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def as_arrays(self):
+        """Copias (X, y) del archivo completo, p. ej. para exportar."""
+        return self._x[:self._size].copy(), self._y[:self._size].copy()
+
+    def unique_count(self):
+        """Número exacto de puntos distintos evaluados."""
+        if self._size == 0:
+            return 0
+        return len(np.unique(self._x[:self._size], axis=0))
+
+    def _ensure_index(self):
+        if self._index is None:
+            if self.num_genes == 1:
+                order = np.argsort(self._x[:self._size, 0], kind='stable')
+                self._index = (order, self._x[order, 0])
+            else:
+                self._index = _KDTree(self._x[:self._size])
+        return self._index
+
+    def nearest(self, queries):
+        """
+        Vecino más cercano de cada consulta (m, num_genes).
+        Devuelve (indices, distancias); índice -1 y distancia inf si el archivo está vacío.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=float))
+        m = len(queries)
+        if self._size == 0:
+            return np.full(m, -1), np.full(m, np.inf)
+        index = self._ensure_index()
+
+        if self.num_genes == 1:
+            # Búsqueda binaria vectorizada sobre el índice ordenado
+            index, sorted_x = index
+            q = queries[:, 0]
+            pos = np.searchsorted(sorted_x, q)
+            left = np.clip(pos - 1, 0, self._size - 1)
+            right = np.clip(pos, 0, self._size - 1)
+            d_left, d_right = np.abs(q - sorted_x[left]), np.abs(sorted_x[right] - q)
+            use_right = d_right < d_left
+            return np.where(use_right, index[right], index[left]), np.where(use_right, d_right, d_left)
+
+        result = np.array([index.nearest(q) for q in queries], dtype=object)
+        return result[:, 0].astype(int), result[:, 1].astype(float)
+
+    def lookup(self, queries, tolerance=0.0):
+        """
+        Valores archivados para las consultas que tienen un punto evaluado a distancia
+        <= tolerance. Devuelve (encontrado: bool (m,), valores (m,) con NaN si no).
+        """
+        indices, distances = self.nearest(queries)
+        found = distances <= tolerance
+        values = np.full((len(indices),) + self._value_shape, np.nan)
+        values[found] = self._y[indices[found]]
+        return found, values
+
+
+class ArchiveEvaluator(Evaluator):
+    """
+    Evaluador que registra en un EvaluationArchive cada evaluación real del evaluador
+    interno. Con 'tolerance' (no None) reutiliza el valor archivado de un punto a
+    distancia <= tolerance en vez de volver a evaluarlo (0.0 = solo duplicados exactos).
+    Con 'budget' el archivo no pasa de ese número de evaluaciones reales: los puntos que
+    ya no caben se devuelven sin evaluar (NaN) y se cuentan en 'skipped'.
+    """
+    def __init__(self, inner, archive, tolerance=None, budget=None):
+        self.inner = inner
+        self.archive = archive
+        self.tolerance = tolerance
+        self.budget = int(budget) if budget else None
+        self.reused = 0
+        self.skipped = 0
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        values = np.full((len(solutions),) + self.archive._value_shape, np.nan)
+        if self.tolerance is None or len(self.archive) == 0:
+            pending = np.ones(len(solutions), dtype=bool)
+        else:
+            found, values = self.archive.lookup(solutions, self.tolerance)
+            found &= np.isfinite(values).reshape(len(values), -1).all(axis=1)  # Los puntos fallidos se vuelven a intentar
+            self.reused += int(found.sum())
+            pending = ~found
+
+        if self.budget is not None:
+            remaining = max(0, self.budget - len(self.archive))
+            over = np.flatnonzero(pending)[remaining:]
+            pending[over] = False
+            self.skipped += len(over)
+        if pending.any():
+            new_values = np.asarray(self.inner.evaluate(solutions[pending]), dtype=float)
+            values[pending] = new_values.reshape(values[pending].shape)
+            self.archive.add(solutions[pending], new_values)
+        return values
+
+    def close(self):
+        self.inner.close()
@@ -0,0 +1,115 @@
+# ag_core/constraints.py
+import ast
+
+import numpy as np
+
+from .function_parser import evaluate_function_batch
+
+HANDLING_MODES = ('penalty', 'feasibility', 'repair')
+
+
+def parse_constraint(text):
+    """
+    Convierte una restricción 'a <= b', 'a >= b' o 'a == b' (a y b con la misma sintaxis
+    que func_str) en (g, tipo): g es una expresión de x tal que la restricción equivale
+    a g(x) <= 0 ('ineq') o g(x) == 0 ('eq').
+    """
+    text = text.strip()
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Restricción con sintaxis inválida: '{text}' ({e.msg}).")
+    node = tree.body
+    if not isinstance(node, ast.Compare) or len(node.ops) != 1:
+        raise ValueError(f"La restricción '{text}' debe tener exactamente un operador <=, >= o ==.")
+    left, right = ast.unparse(node.left), ast.unparse(node.comparators[0])
+    op = node.ops[0]
+    if isinstance(op, (ast.LtE, ast.Lt)):
+        return f"({left}) - ({right})", 'ineq'
+    if isinstance(op, (ast.GtE, ast.Gt)):
+        return f"({right}) - ({left})", 'ineq'
+    if isinstance(op, ast.Eq):
+        return f"({left}) - ({right})", 'eq'
+    raise ValueError(f"Operador no soportado en la restricción '{text}' (use <=, >= o ==).")
+
+
+class ConstraintSet:
+    """
+    Conjunto de restricciones de desigualdad/igualdad sobre x (primer gen), evaluadas
+    por lotes con la misma ruta (compilada o intérprete seguro) que la función objetivo.
+    Las igualdades se consideran satisfechas con |h(x)| <= equality_tolerance.
+    """
+    def __init__(self, constraint_strs, equality_tolerance=1e-4):
+        if isinstance(constraint_strs, str):
+            constraint_strs = [c for c in constraint_strs.split(';') if c.strip()]
+        self.constraint_strs = [c.strip() for c in constraint_strs]
+        self.parsed = [parse_constraint(c) for c in self.constraint_strs]
+        self.equality_tolerance = float(equality_tolerance)
+
+    def __len__(self):
+        return len(self.parsed)
+
+    def violations(self, solutions):
+        """
+        Violación total de cada solución (n,): suma de max(0, g(x)) y de
+        max(0, |h(x)| - tolerancia). 0 = factible; inf si alguna restricción no se pudo evaluar.
+        """
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        total = np.zeros(len(solutions))
+        for g_str, kind in self.parsed:
+            g = evaluate_function_batch(g_str, solutions[:, 0])
+            if kind == 'eq':
+                g = np.abs(g) - self.equality_tolerance
+            total += np.where(np.isnan(g), np.inf, np.maximum(g, 0.0))
+        return total
+
+    def repair(self, solutions, anchor, iterations=20):
+        """
+        Operador de reparación: mueve cada solución no factible por el segmento hacia
+        'anchor' (un punto factible) hasta el primer punto factible encontrado por bisección.
+        Devuelve (soluciones reparadas, máscara de las que se modificaron).
+        """
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        anchor = np.asarray(anchor, dtype=float)
+        infeasible = self.violations(solutions) > 0
+        repaired = solutions.copy()
+        if not infeasible.any():
+            return repaired, infeasible
+        start = solutions[infeasible]
+        lo = np.zeros(len(start))  # t = 0: punto original (no factible)
+        hi = np.ones(len(start))   # t = 1: punto ancla (factible)
+        for _ in range(iterations):
+            mid = 0.5 * (lo + hi)
+            feasible = self.violations(start + mid[:, None] * (anchor - start)) <= 0
+            hi = np.where(feasible, mid, hi)
+            lo = np.where(feasible, lo, mid)
+        repaired[infeasible] = start + hi[:, None] * (anchor - start)
+        return repaired, infeasible
+
+
+def apply_penalty(fitness, violation, coefficient):
+    """Penalización estática: fitness - coeficiente * violación (fitness a maximizar)."""
+    fitness = np.asarray(fitness, dtype=float)
+    violation = violation.reshape((-1,) + (1,) * (fitness.ndim - 1))
+    return fitness - coefficient * violation
+
+
+def apply_feasibility_rules(fitness, violation, worst_feasible):
+    """
+    Reglas de factibilidad de Deb en forma escalar: una solución factible conserva su fitness;
+    una no factible vale (peor fitness factible conocido) - violación, de modo que
+    (1) toda factible supera a toda no factible, (2) entre factibles decide el objetivo y
+    (3) entre no factibles, la de menor violación.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    violation = violation.reshape((-1,) + (1,) * (fitness.ndim - 1))
+    return np.where(violation > 0, worst_feasible - violation, fitness)
+
+
+def create_constraint_set(params):
+    """ConstraintSet de params['constraints'] (lista o texto separado por ';'), o None si no hay."""
+    constraints = params.get('constraints')
+    if not constraints:
+        return None
+    constraint_set = ConstraintSet(constraints, equality_tolerance=float(params.get('constraint_tolerance', 1e-4)))
+    return constraint_set if len(constraint_set) else None
@@ -0,0 +1,164 @@
+# ag_core/disk_cache.py
+import hashlib
+import io
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+try:  # Bloqueo entre procesos (POSIX); en otras plataformas la expulsión no se serializa
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger_cache = logging.getLogger(f"{__name__}")
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_root():
+    """Raíz de la caché en disco: GA_OPTIMIZER_CACHE_DIR o ~/.cache/ga_optimizer."""
+    return os.environ.get('GA_OPTIMIZER_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'ga_optimizer')
+
+
+class DiskCache:
+    """
+    Caché direccionada por contenido en un directorio: cada entrada es un fichero cuyo
+    nombre es el hash SHA-256 de su clave. Es segura entre procesos:
+    - las escrituras van a un fichero temporal y se publican con os.replace (atómico),
+      de modo que un lector nunca ve una entrada a medio escribir;
+    - la expulsión (LRU por fecha de modificación, que se actualiza en cada acierto)
+      se serializa con un lock de fichero y tolera entradas borradas por otro proceso.
+    El tamaño total se mantiene por debajo de max_bytes.
+    """
+    def __init__(self, namespace, max_bytes=None, root=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('GA_OPTIMIZER_CACHE_MAX_MB', DEFAULT_MAX_BYTES / 2**20)) * 2**20)
+        self.max_bytes = int(max_bytes)
+        self.directory = os.path.join(root or default_cache_root(), namespace)
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash estable de las partes de la clave (su repr, p. ej. expresión, rango y resolución)."""
+        return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:32]
+
+    def path(self, key, suffix=''):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    # --- Bytes ---
+
+    def read(self, key, suffix=''):
+        """Contenido de la entrada o None si no existe (o se expulsó mientras se leía)."""
+        path = self.path(key, suffix)
+        try:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+            os.utime(path)  # Marca de uso reciente para la expulsión LRU
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def write(self, key, data, suffix=''):
+        """Publica la entrada de forma atómica y devuelve su ruta."""
+        path = self.path(key, suffix)
+        # Temporal de nombre único: dos hilos del mismo proceso (GUI y AG) pueden escribir
+        # la misma clave a la vez sin mezclar sus bytes en un mismo fichero
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{key}{suffix}.", suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+        return path
+
+    # --- Arrays de NumPy ---
+
+    def load_arrays(self, key):
+        """Diccionario de arrays guardado con save_arrays, o None. Nunca deserializa objetos Python."""
+        data = self.read(key, '.npz')
+        if data is None:
+            return None
+        try:
+            with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+                return {name: npz[name] for name in npz.files}
+        except (OSError, ValueError) as e:
+            logger_cache.warning(f"DiskCache: Entrada corrupta {key} en {self.directory}: {e}. Se descarta.")
+            return None
+
+    def save_arrays(self, key, **arrays):
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return self.write(key, buffer.getvalue(), '.npz')
+
+    # --- Expulsión ---
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.lock') or entry.name.endswith('.tmp'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        lock_path = os.path.join(self.directory, '.lock')
+        with open(lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self._entries()
+                total = sum(size for _, size, _ in entries)
+                if total <= self.max_bytes:
+                    return
+                evicted = 0
+                for _, size, path in sorted(entries):
+                    if total <= self.max_bytes:
+                        break
+                    try:
+                        os.remove(path)
+                        evicted += 1
+                    except OSError:
+                        pass  # Ya expulsada por otro proceso
+                    total -= size
+                logger_cache.debug(f"DiskCache: {evicted} entradas expulsadas de {self.directory}.")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+_caches = {}
+
+
+def get_cache(namespace):
+    """Instancia compartida de DiskCache para el namespace, o None si el disco no es utilizable."""
+    if namespace not in _caches:
+        try:
+            _caches[namespace] = DiskCache(namespace)
+        except OSError as e:
+            logger_cache.warning(f"DiskCache: No se pudo crear la caché '{namespace}': {e}. Se continúa sin caché en disco.")
+            _caches[namespace] = None
+    return _caches[namespace]
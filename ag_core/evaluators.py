@@ -0,0 +1,302 @@
+# ag_core/evaluators.py
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .function_parser import compile_vectorized_function, optimize_expression, safe_eval_function
+
+logger_eval = logging.getLogger(f"{__name__}")
+
+
+class Evaluator(ABC):
+    """
+    Interfaz de evaluadores de la función objetivo para GeneticOptimizer.
+    evaluate() recibe una matriz (n_soluciones, n_genes) y devuelve un vector con f(x)
+    real para cada solución; los puntos que no se pudieron evaluar valen NaN y
+    GeneticOptimizer los penaliza (ver GeneticOptimizer._failure_fitness).
+    Una subclase sin evaluate() falla al instanciarse, no a mitad de la ejecución.
+    """
+    @abstractmethod
+    def evaluate(self, solutions):
+        """f(x) real de cada fila de 'solutions' (NaN para los puntos fallidos)."""
+
+    def close(self):
+        pass
+
+
+class ExpressionEvaluator(Evaluator):
+    """
+    Evalúa la expresión func_str localmente (x = primer gen).
+    Con use_compiled=True usa la versión vectorizada de compile_vectorized_function
+    cuando la expresión lo permite; si no (o si falla), recurre a safe_eval_function
+    punto a punto.
+    """
+    def __init__(self, func_str, use_compiled=True):
+        self.func_str = func_str
+        self.compiled = compile_vectorized_function(func_str) if use_compiled else None
+        optimized = optimize_expression(func_str)
+        if self.compiled is not None and optimized.changed:
+            logger_eval.info(f"ExpressionEvaluator: Expresión optimizada ({optimized.summary()}): {self.compiled.expression}")
+        elif optimized.source != optimized.func_str:
+            logger_eval.info(f"ExpressionEvaluator: Constantes plegadas para el intérprete: {optimized.source}")
+        if self.compiled is not None:
+            logger_eval.info(f"ExpressionEvaluator: Objetivo compilado (backend: {self.compiled.backend}).")
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        if self.compiled is not None:
+            try:
+                values = self.compiled(solutions[:, 0])
+                failed = np.count_nonzero(np.isnan(values))
+                if failed:
+                    logger_eval.warning(f"ExpressionEvaluator: {failed} soluciones con resultado NaN o Infinito. Aplicando penalización.")
+                return values
+            except Exception as e:
+                logger_eval.warning(f"ExpressionEvaluator: Fallo en la ruta compilada ({e}); usando el intérprete seguro.")
+        values = np.full(len(solutions), np.nan)
+        for i, sol in enumerate(solutions):
+            try:
+                values[i] = safe_eval_function(self.func_str, sol[0])
+            except ValueError as ve:
+                logger_eval.warning(f"ExpressionEvaluator: ValueError: {ve} para solution {sol}. Aplicando penalización.")
+            except Exception as e:
+                logger_eval.error(f"ExpressionEvaluator: CRÍTICO: {e} para solution {sol}. Aplicando penalización.", exc_info=True)
+        return values
+
+
+class MultiObjectiveEvaluator(Evaluator):
+    """
+    Combina varios evaluadores de un objetivo en uno multiobjetivo: evaluate() devuelve
+    una matriz (n_soluciones, n_objetivos) con una columna por evaluador.
+    """
+    def __init__(self, evaluators):
+        self.evaluators = list(evaluators)
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        return np.column_stack([np.asarray(e.evaluate(solutions), dtype=float) for e in self.evaluators])
+
+    def close(self):
+        for evaluator in self.evaluators:
+            evaluator.close()
+
+
+class AsyncServiceEvaluator(Evaluator):
+    """
+    Cliente asyncio para un servicio local de evaluación (p. ej. un simulador).
+    Protocolo: HTTP/1.1 POST con cuerpo JSON {"solutions": [[g0, g1, ...], ...]} y
+    respuesta {"values": [f0, f1, ...]} (null para puntos fallidos).
+    - url: 'http://host:puerto/ruta' o 'unix:///ruta/al/socket' (HTTP sobre socket Unix).
+    - batch_size: soluciones por petición (la generación se reparte en lotes).
+    - max_in_flight: máximo de peticiones simultáneas.
+    - timeout: segundos por petición; un lote que expira devuelve NaN (penalización).
+    - pool_size: conexiones keep-alive que se conservan entre generaciones.
+    """
+    def __init__(self, url, batch_size=16, max_in_flight=8, timeout=10.0, pool_size=None):
+        parts = urlsplit(url)
+        if parts.scheme == 'http':
+            self._host = parts.hostname or 'localhost'
+            self._port = parts.port or 80
+            self._unix_path = None
+            self._path = parts.path or '/'
+        elif parts.scheme == 'unix':
+            self._host = 'localhost'
+            self._port = None
+            self._unix_path = parts.path
+            self._path = '/'
+        else:
+            raise ValueError(f"Esquema de URL no soportado para el evaluador: '{url}' (use http:// o unix://).")
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("batch_size y max_in_flight deben ser >= 1.")
+
+        self.url = url
+        self.batch_size = int(batch_size)
+        self.max_in_flight = int(max_in_flight)
+        self.timeout = float(timeout)
+        self.pool_size = int(pool_size) if pool_size else self.max_in_flight
+        self.timeouts = 0
+        self.failures = 0
+        self.requests_sent = 0
+
+        # Bucle de eventos propio: las conexiones del pool sobreviven entre generaciones
+        self._loop = asyncio.new_event_loop()
+        self._idle_connections = []
+
+    # --- Pool de conexiones ---
+
+    async def _open_connection(self):
+        if self._unix_path:
+            return await asyncio.open_unix_connection(self._unix_path)
+        return await asyncio.open_connection(self._host, self._port)
+
+    async def _acquire(self):
+        while self._idle_connections:
+            reader, writer = self._idle_connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return await self._open_connection()
+
+    def _release(self, reader, writer, keep_alive):
+        if keep_alive and len(self._idle_connections) < self.pool_size and not writer.is_closing():
+            self._idle_connections.append((reader, writer))
+        else:
+            writer.close()
+
+    # --- Protocolo ---
+
+    async def _post(self, body):
+        reader, writer = await self._acquire()
+        try:
+            header = (f"POST {self._path} HTTP/1.1\r\n"
+                      f"Host: {self._host}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      "Connection: keep-alive\r\n\r\n")
+            writer.write(header.encode('ascii') + body)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("El servicio de evaluación cerró la conexión.")
+            status = int(status_line.split()[1])
+            content_length, keep_alive = 0, True
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                name, value = name.strip().lower(), value.strip().lower()
+                if name == 'content-length':
+                    content_length = int(value)
+                elif name == 'connection' and value == 'close':
+                    keep_alive = False
+            payload = await reader.readexactly(content_length)
+        except BaseException:
+            # Conexión en estado desconocido (error, timeout o cancelación): no reutilizar
+            writer.close()
+            raise
+        self._release(reader, writer, keep_alive)
+        if status != 200:
+            raise ConnectionError(f"El servicio de evaluación respondió HTTP {status}.")
+        return json.loads(payload)
+
+    async def _evaluate_batch(self, semaphore, batch):
+        body = json.dumps({"solutions": batch.tolist()}).encode('utf-8')
+        async with semaphore:
+            self.requests_sent += 1
+            try:
+                response = await asyncio.wait_for(self._post(body), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += len(batch)
+                logger_eval.warning(f"AsyncServiceEvaluator: Timeout ({self.timeout}s) evaluando lote de {len(batch)} soluciones.")
+                return np.full(len(batch), np.nan)
+            except (OSError, ConnectionError, ValueError, IndexError, asyncio.IncompleteReadError) as e:
+                self.failures += len(batch)
+                logger_eval.warning(f"AsyncServiceEvaluator: Error evaluando lote de {len(batch)} soluciones: {e}")
+                return np.full(len(batch), np.nan)
+
+        values = response.get("values") if isinstance(response, dict) else None
+        if not isinstance(values, list) or len(values) != len(batch):
+            self.failures += len(batch)
+            logger_eval.warning("AsyncServiceEvaluator: Respuesta con formato inesperado; se penaliza el lote.")
+            return np.full(len(batch), np.nan)
+        try:
+            return np.array([np.nan if v is None else v for v in values], dtype=float)
+        except (TypeError, ValueError):
+            self.failures += len(batch)
+            logger_eval.warning("AsyncServiceEvaluator: Valores no numéricos en la respuesta; se penaliza el lote.")
+            return np.full(len(batch), np.nan)
+
+    async def _evaluate_all(self, solutions):
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        batches = [solutions[i:i + self.batch_size] for i in range(0, len(solutions), self.batch_size)]
+        results = await asyncio.gather(*(self._evaluate_batch(semaphore, b) for b in batches))
+        return np.concatenate(results) if results else np.empty(0)
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        if self._loop.is_closed():  # Reutilización tras close(): nuevo bucle y pool vacío
+            self._loop = asyncio.new_event_loop()
+        values = self._loop.run_until_complete(self._evaluate_all(solutions))
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    def close(self):
+        for _, writer in self._idle_connections:
+            writer.close()
+        self._idle_connections.clear()
+        if not self._loop.is_closed():
+            self._loop.run_until_complete(asyncio.sleep(0))  # Dejar que los transportes se cierren
+            self._loop.close()
+
+
+def create_evaluator(params):
+    """
+    Construye el evaluador indicado en params ('evaluator_url' y opcionales
+    'evaluator_batch_size', 'evaluator_max_in_flight', 'evaluator_timeout',
+    'evaluator_pool_size'). Devuelve None si no se configuró ningún servicio.
+    """
+    url = params.get('evaluator_url')
+    if not url:
+        return None
+    return AsyncServiceEvaluator(
+        url,
+        batch_size=int(params.get('evaluator_batch_size', 16)),
+        max_in_flight=int(params.get('evaluator_max_in_flight', 8)),
+        timeout=float(params.get('evaluator_timeout', 10.0)),
+        pool_size=params.get('evaluator_pool_size'),
+    )
+
+
+if __name__ == '__main__':
+    # Servidor stub local que hace de simulador: f(x) = x*sin(x) + 10 con una latencia artificial
+    import threading
+    import time
+
+    async def _stub_handler(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                content_length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    if line.lower().startswith(b'content-length:'):
+                        content_length = int(line.split(b':')[1])
+                data = json.loads(await reader.readexactly(content_length))
+                await asyncio.sleep(0.05)
+                values = [s[0] * np.sin(s[0]) + 10 for s in data["solutions"]]
+                body = json.dumps({"values": values}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _serve(port_holder, ready):
+        async def main():
+            server = await asyncio.start_server(_stub_handler, '127.0.0.1', 0)
+            port_holder.append(server.sockets[0].getsockname()[1])
+            ready.set()
+            await server.serve_forever()
+        asyncio.run(main())
+
+    port_holder, ready = [], threading.Event()
+    threading.Thread(target=_serve, args=(port_holder, ready), daemon=True).start()
+    ready.wait()
+
+    evaluator = AsyncServiceEvaluator(f"http://127.0.0.1:{port_holder[0]}/", batch_size=10, max_in_flight=5)
+    population = np.random.uniform(-10, 10, size=(100, 1))
+    start = time.perf_counter()
+    result = evaluator.evaluate(population)
+    print(f"100 soluciones en {time.perf_counter() - start:.3f}s (10 lotes, 5 en vuelo), "
+          f"error máximo: {np.max(np.abs(result - (population[:, 0] * np.sin(population[:, 0]) + 10))):.2e}")
+    evaluator.close()
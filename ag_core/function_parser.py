@@ -1,7 +1,17 @@
 # ag_core/function_parser.py
+import ast
+import copy
 import math
 import numpy as np
 from asteval import Interpreter # Interpreter class
+from asteval.astutils import MAX_EXPONENT
+
+from .disk_cache import get_cache
+
+try:  # numba es opcional: si no está instalado se usa la ruta vectorizada de NumPy
+    import numba
+except ImportError:
+    numba = None
 
 def safe_eval_function(func_str, x_value):
     """
@@ -9,6 +19,7 @@ def safe_eval_function(func_str, x_value):
     Permite el uso de 'x', funciones de 'math' y 'numpy'.
     Esta versión crea una nueva instancia de Interpreter para cada evaluación
     para mayor compatibilidad con diferentes versiones de asteval.
+    Se evalúa la forma optimizada de la expresión (ver optimize_expression).
     """
     if not func_str.strip():
         raise ValueError("La cadena de la función objetivo no puede estar vacía.")
@@ -25,7 +36,7 @@ def safe_eval_function(func_str, x_value):
     
     # Evaluar la expresión. El método eval() sin argumentos extra
     # usará la symtable de la instancia.
-    result = aeval_local.eval(func_str, show_errors=False) 
+    result = aeval_local.eval(optimize_expression(func_str).source, show_errors=False)
         
     if aeval_local.error:
         last_error = aeval_local.error[-1] # aeval.error es una lista de objetos Error
@@ -45,6 +56,726 @@ def safe_eval_function(func_str, x_value):
         
     return float(result)
 
+_OBJECTIVE_PREFIXES = {'max': 'maximize', 'maximize': 'maximize', 'min': 'minimize', 'minimize': 'minimize'}
+
+
+def parse_objectives(text, default_type='maximize'):
+    """
+    Separa una especificación de varios objetivos en (lista de expresiones, lista de sentidos).
+    Los objetivos se separan con ';' y cada uno puede llevar el prefijo 'max:' o 'min:';
+    sin prefijo se usa default_type. Ej.: "max: x*np.sin(x); min: x**2".
+    """
+    func_strs, objective_types = [], []
+    for part in text.split(';'):
+        part = part.strip()
+        if not part:
+            continue
+        head, sep, tail = part.partition(':')
+        if sep and head.strip().lower() in _OBJECTIVE_PREFIXES:
+            objective_types.append(_OBJECTIVE_PREFIXES[head.strip().lower()])
+            part = tail.strip()
+        else:
+            objective_types.append(default_type)
+        if not part:
+            raise ValueError("Hay un objetivo vacío en la especificación de la función objetivo.")
+        func_strs.append(part)
+    return func_strs, objective_types
+
+
+# --- Diferenciación simbólica sobre el AST de la expresión ---
+
+class NotDifferentiableError(ValueError):
+    """La expresión contiene construcciones que no se pueden derivar simbólicamente."""
+
+
+_DIFF_MODULES = ('math', 'np')
+
+
+def _const(value):
+    return ast.Constant(value=value)
+
+
+def _is_const(node, value=None):
+    if not isinstance(node, ast.Constant) or not isinstance(node.value, (int, float)):
+        return False
+    return value is None or node.value == value
+
+
+def _call(module, name, *args):
+    return ast.Call(func=ast.Attribute(value=ast.Name(id=module, ctx=ast.Load()), attr=name, ctx=ast.Load()),
+                    args=list(args), keywords=[])
+
+
+def _add(a, b):
+    if _is_const(a, 0): return b
+    if _is_const(b, 0): return a
+    return ast.BinOp(left=a, op=ast.Add(), right=b)
+
+
+def _sub(a, b):
+    if _is_const(b, 0): return a
+    if _is_const(a, 0): return _neg(b)
+    return ast.BinOp(left=a, op=ast.Sub(), right=b)
+
+
+def _mul(a, b):
+    if _is_const(a, 0) or _is_const(b, 0): return _const(0)
+    if _is_const(a, 1): return b
+    if _is_const(b, 1): return a
+    return ast.BinOp(left=a, op=ast.Mult(), right=b)
+
+
+def _div(a, b):
+    if _is_const(a, 0): return _const(0)
+    if _is_const(b, 1): return a
+    return ast.BinOp(left=a, op=ast.Div(), right=b)
+
+
+def _pow(a, b):
+    if _is_const(b, 1): return a
+    if _is_const(b, 0): return _const(1)
+    return ast.BinOp(left=a, op=ast.Pow(), right=b)
+
+
+def _neg(a):
+    if _is_const(a, 0): return a
+    return ast.UnaryOp(op=ast.USub(), operand=a)
+
+
+def _derive_call(node, var):
+    """Regla de la cadena para llamadas math.f(u) / np.f(u) de la lista blanca."""
+    func = node.func
+    if isinstance(func, ast.Name) and func.id == 'abs' and len(node.args) == 1 and not node.keywords:
+        # abs() builtin de asteval: misma regla que np.abs
+        func = ast.Attribute(value=ast.Name(id='np', ctx=ast.Load()), attr='abs', ctx=ast.Load())
+    if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+            and func.value.id in _DIFF_MODULES and not node.keywords):
+        raise NotDifferentiableError(f"Llamada no derivable: {ast.unparse(node)}")
+    mod, name, args = func.value.id, func.attr, node.args
+
+    if name in ('pow', 'power') and len(args) == 2:
+        return _derive(ast.BinOp(left=args[0], op=ast.Pow(), right=args[1]), var)
+    if len(args) != 1:
+        raise NotDifferentiableError(f"Llamada no derivable: {ast.unparse(node)}")
+
+    u = args[0]
+    du = _derive(u, var)
+    if _is_const(du, 0):
+        return _const(0)
+
+    # Derivada externa f'(u) para cada función soportada
+    if name == 'sin':
+        outer = _call(mod, 'cos', u)
+    elif name == 'cos':
+        outer = _neg(_call(mod, 'sin', u))
+    elif name == 'tan':
+        outer = _div(_const(1), _pow(_call(mod, 'cos', u), _const(2)))
+    elif name in ('exp',):
+        outer = _call(mod, 'exp', u)
+    elif name == 'expm1':
+        outer = _call(mod, 'exp', u)
+    elif name == 'log':
+        outer = _div(_const(1), u)
+    elif name == 'log1p':
+        outer = _div(_const(1), _add(_const(1), u))
+    elif name == 'log10':
+        outer = _div(_const(1), _mul(u, _call(mod, 'log', _const(10))))
+    elif name == 'log2':
+        outer = _div(_const(1), _mul(u, _call(mod, 'log', _const(2))))
+    elif name == 'sqrt':
+        outer = _div(_const(0.5), _call(mod, 'sqrt', u))
+    elif name == 'sinh':
+        outer = _call(mod, 'cosh', u)
+    elif name == 'cosh':
+        outer = _call(mod, 'sinh', u)
+    elif name == 'tanh':
+        outer = _sub(_const(1), _pow(_call(mod, 'tanh', u), _const(2)))
+    elif name in ('asin', 'arcsin'):
+        outer = _div(_const(1), _call(mod, 'sqrt', _sub(_const(1), _pow(u, _const(2)))))
+    elif name in ('acos', 'arccos'):
+        outer = _neg(_div(_const(1), _call(mod, 'sqrt', _sub(_const(1), _pow(u, _const(2))))))
+    elif name in ('atan', 'arctan'):
+        outer = _div(_const(1), _add(_const(1), _pow(u, _const(2))))
+    elif name in ('fabs', 'abs', 'absolute'):
+        outer = _call('np', 'sign', u)
+    else:
+        raise NotDifferentiableError(f"Función '{mod}.{name}' sin derivada simbólica registrada.")
+    return _mul(outer, du)
+
+
+def _derive(node, var):
+    """Devuelve el AST de d(node)/d(var)."""
+    if isinstance(node, ast.Expression):
+        return _derive(node.body, var)
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)):
+            return _const(0)
+        raise NotDifferentiableError(f"Constante no numérica: {node.value!r}")
+    if isinstance(node, ast.Name):
+        return _const(1 if node.id == var else 0)
+    if isinstance(node, ast.Attribute):
+        # Constantes de módulo como math.pi o np.e
+        if isinstance(node.value, ast.Name) and node.value.id in _DIFF_MODULES:
+            return _const(0)
+        raise NotDifferentiableError(f"Atributo no soportado: {ast.unparse(node)}")
+    if isinstance(node, ast.UnaryOp):
+        d = _derive(node.operand, var)
+        if isinstance(node.op, ast.USub):
+            return _neg(d)
+        if isinstance(node.op, ast.UAdd):
+            return d
+        raise NotDifferentiableError(f"Operador unario no soportado: {ast.unparse(node)}")
+    if isinstance(node, ast.BinOp):
+        u, v = node.left, node.right
+        du, dv = _derive(u, var), _derive(v, var)
+        if isinstance(node.op, ast.Add):
+            return _add(du, dv)
+        if isinstance(node.op, ast.Sub):
+            return _sub(du, dv)
+        if isinstance(node.op, ast.Mult):
+            return _add(_mul(du, v), _mul(u, dv))
+        if isinstance(node.op, ast.Div):
+            if _is_const(dv, 0):
+                return _div(du, v)
+            return _div(_sub(_mul(du, v), _mul(u, dv)), _pow(v, _const(2)))
+        if isinstance(node.op, ast.Pow):
+            if _is_const(dv, 0):
+                # d(u**c) = c * u**(c-1) * du
+                if _is_const(v):
+                    exponent = _const(v.value - 1)
+                else:
+                    exponent = _sub(v, _const(1))
+                return _mul(_mul(v, _pow(u, exponent)), du)
+            # Caso general: d(u**v) = u**v * (dv*log(u) + v*du/u)
+            return _mul(node, _add(_mul(dv, _call('np', 'log', u)), _div(_mul(v, du), u)))
+        raise NotDifferentiableError(f"Operador no soportado: {ast.unparse(node)}")
+    if isinstance(node, ast.Call):
+        return _derive_call(node, var)
+    raise NotDifferentiableError(f"Construcción no derivable: {type(node).__name__}")
+
+
+def differentiate_expression(func_str, var='x'):
+    """
+    Deriva simbólicamente la expresión func_str respecto a la variable 'var'.
+    Soporta aritmética (+, -, *, /, **) y las funciones de 'math'/'np' habituales.
+    Devuelve la derivada como string evaluable por safe_eval_function.
+    Lanza NotDifferentiableError (subclase de ValueError) si no es posible.
+    """
+    if not func_str or not func_str.strip():
+        raise NotDifferentiableError("La cadena de la función objetivo no puede estar vacía.")
+    try:
+        tree = ast.parse(func_str.strip(), mode='eval')
+    except SyntaxError as e:
+        raise NotDifferentiableError(f"Sintaxis inválida en '{func_str}': {e}")
+    derivative = _derive(tree.body, var)
+    return ast.unparse(ast.fix_missing_locations(derivative))
+
+
+def build_gradient_function(func_str):
+    """
+    Construye el gradiente analítico de f(x) a partir de func_str.
+    Devuelve un callable grad(x_value) -> np.ndarray de forma (1,), evaluado con
+    el mismo intérprete seguro que la función objetivo, o None si la expresión
+    no es derivable simbólicamente (el llamador debe recurrir a métodos sin derivadas).
+    """
+    try:
+        derivative_str = differentiate_expression(func_str, 'x')
+    except NotDifferentiableError:
+        return None
+
+    def gradient(x_value):
+        x_scalar = float(np.asarray(x_value, dtype=float).ravel()[0])
+        return np.array([safe_eval_function(derivative_str, x_scalar)])
+
+    gradient.expression = derivative_str
+    return gradient
+
+
+# --- Ruta compilada/vectorizada para expresiones aritméticas puras ---
+
+class NotCompilableError(ValueError):
+    """La expresión usa construcciones fuera de la lista blanca de la ruta compilada."""
+
+
+# Funciones elementales permitidas (nombre en math/np o builtin de asteval -> ufunc de NumPy)
+_UFUNC_ALIASES = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'asin': 'arcsin', 'acos': 'arccos', 'atan': 'arctan',
+    'arcsin': 'arcsin', 'arccos': 'arccos', 'arctan': 'arctan',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh',
+    'asinh': 'arcsinh', 'acosh': 'arccosh', 'atanh': 'arctanh',
+    'arcsinh': 'arcsinh', 'arccosh': 'arccosh', 'arctanh': 'arctanh',
+    'exp': 'exp', 'expm1': 'expm1', 'exp2': 'exp2',
+    'log': 'log', 'log10': 'log10', 'log2': 'log2', 'log1p': 'log1p',
+    'sqrt': 'sqrt', 'cbrt': 'cbrt', 'abs': 'abs', 'fabs': 'abs', 'absolute': 'abs',
+    'floor': 'floor', 'ceil': 'ceil', 'trunc': 'trunc', 'sign': 'sign',
+    'degrees': 'degrees', 'radians': 'radians',
+    'pow': 'power', 'power': 'power', 'atan2': 'arctan2', 'arctan2': 'arctan2',
+    'hypot': 'hypot', 'fmod': 'fmod', 'minimum': 'minimum', 'maximum': 'maximum',
+}
+_CONSTANTS = {'pi': math.pi, 'e': math.e, 'tau': math.tau}
+_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.FloorDiv)
+_CMPOPS = (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+
+def _np_attr(name):
+    return ast.Attribute(value=ast.Name(id='np', ctx=ast.Load()), attr=name, ctx=ast.Load())
+
+
+def _to_numpy_ast(node, names=('x',)):
+    """
+    Traduce un nodo del AST validado a su equivalente vectorizado con ufuncs de NumPy.
+    Solo se aceptan aritmética, comparaciones simples, 'a if cond else b', las variables de
+    'names' ('x' y las temporales de optimize_expression), constantes numéricas (convertidas
+    a float: sin aritmética de enteros arbitrarios) y las funciones/constantes de la lista
+    blanca. Cualquier otra cosa lanza NotCompilableError.
+    """
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise NotCompilableError(f"Constante no soportada: {node.value!r}")
+        try:
+            return ast.Constant(value=float(node.value))
+        except OverflowError:
+            raise NotCompilableError(f"Constante demasiado grande: {node.value!r}")
+    if isinstance(node, ast.Name):
+        if node.id in names:
+            return ast.Name(id=node.id, ctx=ast.Load())
+        if node.id in _CONSTANTS:
+            return ast.Constant(value=_CONSTANTS[node.id])
+        raise NotCompilableError(f"Nombre no soportado: '{node.id}'")
+    if isinstance(node, ast.Attribute):
+        if isinstance(node.value, ast.Name) and node.value.id in _DIFF_MODULES and node.attr in _CONSTANTS:
+            return ast.Constant(value=_CONSTANTS[node.attr])
+        raise NotCompilableError(f"Atributo no soportado: {ast.unparse(node)}")
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        return ast.UnaryOp(op=node.op, operand=_to_numpy_ast(node.operand, names))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        # Mismo límite de exponente que el intérprete seguro (asteval.MAX_EXPONENT)
+        return ast.Call(func=ast.Name(id='_safe_pow', ctx=ast.Load()),
+                        args=[_to_numpy_ast(node.left, names), _to_numpy_ast(node.right, names)], keywords=[])
+    if isinstance(node, ast.BinOp) and isinstance(node.op, _BINOPS):
+        return ast.BinOp(left=_to_numpy_ast(node.left, names), op=node.op, right=_to_numpy_ast(node.right, names))
+    if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], _CMPOPS):
+        return ast.Compare(left=_to_numpy_ast(node.left, names), ops=node.ops,
+                           comparators=[_to_numpy_ast(node.comparators[0], names)])
+    if isinstance(node, ast.IfExp):
+        return ast.Call(func=_np_attr('where'), args=[_to_numpy_ast(node.test, names), _to_numpy_ast(node.body, names),
+                                                      _to_numpy_ast(node.orelse, names)], keywords=[])
+    if isinstance(node, ast.Call) and not node.keywords:
+        func = node.func
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in _DIFF_MODULES:
+            name = func.attr
+        elif isinstance(func, ast.Name):
+            name = func.id
+        else:
+            raise NotCompilableError(f"Llamada no soportada: {ast.unparse(node)}")
+        if name not in _UFUNC_ALIASES:
+            raise NotCompilableError(f"Función no soportada en la ruta compilada: '{name}'")
+        return ast.Call(func=_np_attr(_UFUNC_ALIASES[name]),
+                        args=[_to_numpy_ast(a, names) for a in node.args], keywords=[])
+    raise NotCompilableError(f"Construcción no soportada: {type(node).__name__}")
+
+
+# --- Optimización del AST de la expresión ---
+
+# Construcciones con ámbito propio: sus nombres no son los de la expresión, no se reescriben por dentro
+_SCOPE_NODES = (ast.Lambda, ast.GeneratorExp, ast.ListComp, ast.SetComp, ast.DictComp)
+_MAX_EXPANDED_POWER = 4
+_FOLD_OPERATORS = {
+    ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b, ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b, ast.FloorDiv: lambda a, b: a // b, ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+}
+REWRITE_KINDS = {
+    'constant_folding': "plegado de constantes", 'math_to_numpy': "math.* -> np.*",
+    'power_expansion': "potencias -> productos", 'common_subexpressions': "subexpresiones comunes",
+}
+
+
+class OptimizedExpression:
+    """
+    Resultado de optimize_expression: temporaries es la lista de asignaciones (nombre, AST) que
+    se evalúan antes que body (AST de la expresión final); rewrites cuenta las reescrituras
+    aplicadas por tipo (claves de REWRITE_KINDS). source es la expresión para el intérprete
+    seguro, solo con las constantes plegadas: en asteval el coste crece con el número de
+    nodos y cada asignación cuesta más de lo que ahorra, así que las demás reescrituras
+    solo las usa la ruta compilada.
+    """
+    def __init__(self, func_str, temporaries, body, rewrites, source=None):
+        self.func_str = func_str
+        self.temporaries = temporaries
+        self.body = body
+        self.rewrites = rewrites
+        self.source = source or func_str  # Sin plegado: se evalúa exactamente lo escrito
+
+    @property
+    def changed(self):
+        return any(self.rewrites.values())
+
+    def summary(self):
+        applied = [f"{REWRITE_KINDS[kind]}: {count}" for kind, count in self.rewrites.items() if count]
+        return ", ".join(applied) if applied else "sin cambios"
+
+
+def _numeric_constant(node):
+    return isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+
+
+def _foldable_value(value):
+    """El valor plegado se acepta si es un número real finito (los enteros, representables en float64 sin pérdida)."""
+    if isinstance(value, np.floating):
+        value = float(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, int) and abs(value) > 2 ** 53:
+        return None
+    return ast.Constant(value=value)
+
+
+def _numpy_ufunc(name):
+    func = getattr(np, name, None)
+    return func if isinstance(func, np.ufunc) else None
+
+
+def _is_pure(node):
+    """Sin llamadas fuera de la lista blanca (que podrían tener efectos o ser aleatorias) ni ámbitos propios."""
+    for child in ast.walk(node):
+        if isinstance(child, _SCOPE_NODES + (ast.NamedExpr, ast.Subscript, ast.Starred)):
+            return False
+        if isinstance(child, ast.Call):
+            func = child.func
+            whitelisted = isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and \
+                func.value.id in _DIFF_MODULES and func.attr in _UFUNC_ALIASES
+            if child.keywords or not (whitelisted or (isinstance(func, ast.Name) and func.id == 'abs')):
+                return False
+    return True
+
+
+def _simplify(node, counts, kinds=frozenset(REWRITE_KINDS)):
+    """
+    Reescritura de abajo arriba: math.f(...) -> np.f(...) (ufunc con la misma aridad),
+    plegado de constantes (aritmética, constantes de módulo y funciones de math/np con
+    argumentos constantes; solo si el resultado es un número finito, para conservar los
+    errores en tiempo de evaluación) y u**n -> u*u*...*u para enteros
+    2 <= n <= _MAX_EXPANDED_POWER. kinds limita las reescrituras de math.* y potencias;
+    el plegado de constantes se aplica siempre.
+    """
+    if isinstance(node, _SCOPE_NODES):
+        return node
+    for field, value in ast.iter_fields(node):
+        if isinstance(value, list):
+            setattr(node, field, [_simplify(v, counts, kinds) if isinstance(v, ast.AST) else v for v in value])
+        elif isinstance(value, ast.expr):
+            setattr(node, field, _simplify(value, counts, kinds))
+
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in _DIFF_MODULES \
+            and node.attr in _CONSTANTS and hasattr({'math': math, 'np': np}[node.value.id], node.attr):
+        counts['constant_folding'] += 1
+        return ast.Constant(value=_CONSTANTS[node.attr])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)) and _numeric_constant(node.operand):
+        folded = _foldable_value(-node.operand.value if isinstance(node.op, ast.USub) else node.operand.value)
+        return folded if folded is not None else node  # Literal negativo: no cuenta como reescritura
+    if isinstance(node, ast.BinOp) and type(node.op) in _FOLD_OPERATORS \
+            and _numeric_constant(node.left) and _numeric_constant(node.right):
+        if not (isinstance(node.op, ast.Pow) and abs(node.right.value) > MAX_EXPONENT):
+            try:
+                folded = _foldable_value(_FOLD_OPERATORS[type(node.op)](node.left.value, node.right.value))
+            except (ArithmeticError, ValueError):
+                folded = None  # División por cero, etc.: el error se produce al evaluar, como antes
+            if folded is not None:
+                counts['constant_folding'] += 1
+                return folded
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) \
+            and not node.keywords:
+        module, name = node.func.value.id, node.func.attr
+        if module == 'math' and name in _UFUNC_ALIASES:
+            ufunc = _numpy_ufunc(_UFUNC_ALIASES[name])
+            if ufunc is not None and ufunc.nin == len(node.args) and 'math_to_numpy' in kinds:
+                node.func = _np_attr(_UFUNC_ALIASES[name])
+                counts['math_to_numpy'] += 1
+        elif module == 'np':
+            ufunc = _numpy_ufunc(name)
+        else:
+            ufunc = None
+        if ufunc is not None and ufunc.nin == len(node.args) and all(_numeric_constant(a) for a in node.args):
+            with np.errstate(all='ignore'):
+                folded = _foldable_value(ufunc(*[a.value for a in node.args]))
+            if folded is not None:
+                counts['constant_folding'] += 1
+                return folded
+    if 'power_expansion' in kinds and isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow) \
+            and _numeric_constant(node.right) and float(node.right.value).is_integer() and 2 <= node.right.value <= _MAX_EXPANDED_POWER \
+            and _is_pure(node.left):
+        # El mismo AST repetido: la eliminación de subexpresiones comunes lo calcula una sola vez
+        product = node.left
+        for _ in range(int(node.right.value) - 1):
+            product = ast.BinOp(left=product, op=ast.Mult(), right=copy.deepcopy(node.left))
+        counts['power_expansion'] += 1
+        return product
+    return node
+
+
+def _collect_subexpressions(node, conditional, found):
+    """
+    Cuenta las apariciones de cada subexpresión candidata (clave: ast.dump): [nodo, total,
+    fuera de ramas condicionales]. Solo se puede calcular por adelantado una subexpresión
+    que se evalúa siempre: las ramas de 'a if c else b', los operandos tras el primero de
+    and/or y de las comparaciones encadenadas son condicionales.
+    """
+    if isinstance(node, _SCOPE_NODES):
+        return
+    if isinstance(node, (ast.BinOp, ast.Call)) or \
+            (isinstance(node, ast.UnaryOp) and not isinstance(node.operand, (ast.Constant, ast.Name))):
+        entry = found.setdefault(ast.dump(node), [node, 0, 0])
+        entry[1] += 1
+        entry[2] += not conditional
+    if isinstance(node, ast.IfExp):
+        _collect_subexpressions(node.test, conditional, found)
+        _collect_subexpressions(node.body, True, found)
+        _collect_subexpressions(node.orelse, True, found)
+    elif isinstance(node, ast.BoolOp):
+        for i, value in enumerate(node.values):
+            _collect_subexpressions(value, conditional or i > 0, found)
+    elif isinstance(node, ast.Compare):
+        _collect_subexpressions(node.left, conditional, found)
+        for i, comparator in enumerate(node.comparators):
+            _collect_subexpressions(comparator, conditional or i > 0, found)
+    else:
+        for child in ast.iter_child_nodes(node):
+            _collect_subexpressions(child, conditional, found)
+
+
+class _ReplaceSubexpression(ast.NodeTransformer):
+    def __init__(self, key, name):
+        self.key, self.name = key, name
+
+    def visit(self, node):
+        if isinstance(node, _SCOPE_NODES):
+            return node
+        if isinstance(node, ast.expr) and ast.dump(node) == self.key:
+            return ast.Name(id=self.name, ctx=ast.Load())
+        return self.generic_visit(node)
+
+
+def _eliminate_common_subexpressions(body, counts, reserved):
+    """
+    Sustituye cada subexpresión pura repetida (de la más grande a la más pequeña) por una
+    variable temporal. Devuelve (temporales en orden de evaluación, body). Una temporal
+    creada después es más pequeña que las anteriores y puede aparecer en su definición,
+    nunca al revés: el orden de evaluación es el inverso al de creación.
+    """
+    temporaries = []
+    while True:
+        found = {}
+        _collect_subexpressions(body, False, found)
+        for _, definition in temporaries:
+            _collect_subexpressions(definition, False, found)
+        candidates = [(sum(1 for _ in ast.walk(node)), key, node) for key, (node, total, unconditional) in found.items()
+                      if total >= 2 and unconditional >= 1 and _is_pure(node)]
+        if not candidates:
+            break
+        _, key, node = max(candidates, key=lambda c: c[0])
+        name = f"_t{len(temporaries)}"
+        while name in reserved:
+            name = f"_{name}"
+        replacer = _ReplaceSubexpression(key, name)
+        body = replacer.visit(body)
+        temporaries = [(n, replacer.visit(d)) for n, d in temporaries]
+        temporaries.append((name, copy.deepcopy(node)))
+        counts['common_subexpressions'] += 1
+    return temporaries[::-1], body
+
+
+_optimized_expressions = {}
+
+
+def optimize_expression(func_str):
+    """
+    Pasada de optimización sobre el AST de func_str, tras validarla y antes de evaluarla:
+    reescribe math.* como ufuncs de NumPy (vectorizables), pliega constantes, sustituye
+    potencias enteras pequeñas por productos y calcula una sola vez las subexpresiones
+    repetidas (temporales _t0, _t1..., solo en la ruta compilada). Devuelve un OptimizedExpression con las
+    reescrituras aplicadas; si la expresión no es una expresión Python válida (o usa
+    construcciones que la pasada no trata, como ':='), se devuelve sin cambios y el error
+    lo da el intérprete al evaluarla. Cacheado en memoria por expresión.
+    Las potencias expandidas pueden diferir en el último bit de u**n (dos redondeos).
+    """
+    key = func_str.strip()
+    if key in _optimized_expressions:
+        return _optimized_expressions[key]
+    counts = dict.fromkeys(REWRITE_KINDS, 0)
+    try:
+        tree = ast.parse(key, mode='eval')
+        if any(isinstance(node, ast.NamedExpr) for node in ast.walk(tree)):
+            raise NotCompilableError("':=' no se optimiza")
+        folding = {'constant_folding': 0}
+        folded = _simplify(copy.deepcopy(tree.body), folding, kinds=frozenset())
+        reserved = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        body = _simplify(tree.body, counts)
+        temporaries, body = _eliminate_common_subexpressions(body, counts, reserved)
+        optimized = OptimizedExpression(key, temporaries, ast.fix_missing_locations(body), counts,
+                                        ast.unparse(folded) if folding['constant_folding'] else None)
+    except (SyntaxError, NotCompilableError, RecursionError):
+        optimized = OptimizedExpression(key, [], None, dict.fromkeys(REWRITE_KINDS, 0))
+    _optimized_expressions[key] = optimized
+    return optimized
+
+
+def _generate_source(body, use_numba, statements=()):
+    """Código de objective(x): las asignaciones de las temporales (statements) y return body."""
+    function = "".join(f"    {statement}\n" for statement in statements) + f"    return {body}\n"
+    if use_numba:
+        return ("@numba.njit(cache=True)\n"
+                "def _safe_pow(a, b):\n"
+                f"    return np.nan if b > {MAX_EXPONENT:.1f} else a ** b\n\n"
+                "@numba.vectorize(['float64(float64)'], cache=True)\n"
+                f"def objective(x):\n{function}")
+    return ("def _safe_pow(a, b):\n"
+            f"    return np.where(b > {MAX_EXPONENT:.1f}, np.nan, np.power(a, np.minimum(b, {MAX_EXPONENT:.1f})))\n\n"
+            f"def objective(x):\n{function}")
+
+
+def _load_compiled_source(source, use_numba):
+    """
+    Carga el código generado desde la caché en disco 'compiled' (una entrada por hash
+    del código). El fichero se re-escribe si su contenido no coincide exactamente con
+    el código generado a partir del AST validado, de modo que nunca se ejecuta nada distinto.
+    """
+    path = None
+    cache = get_cache('compiled')
+    if cache is not None:
+        key = cache.make_key(np.__version__, source)
+        try:
+            cached = cache.read(key, '.py')
+            path = cache.path(key, '.py') if cached == source.encode('utf-8') \
+                else cache.write(key, source.encode('utf-8'), '.py')
+        except OSError:
+            path = None  # Sin caché en disco: compilar solo en memoria
+
+    namespace = {'np': np, '__builtins__': {}}
+    if use_numba:
+        namespace['numba'] = numba
+    # numba usa el nombre de fichero real para su caché de código máquina (cache=True)
+    exec(compile(source, path or '<ga_objective>', 'exec'), namespace)
+    return namespace['objective']
+
+
+_compiled_functions = {}
+
+
+def compile_vectorized_function(func_str, use_numba=True):
+    """
+    Compila func_str a una función vectorizada f(x_array) -> np.ndarray de float64.
+    Usa numba (si está instalado y use_numba) o, si no, código NumPy generado con compile().
+    Compila la forma optimizada de la expresión (optimize_expression): las subexpresiones
+    comunes son temporales de la función generada.
+    El resultado se cachea en memoria por expresión y el código generado en disco por hash.
+    Los puntos con resultado NaN/Infinito devuelven NaN (mismo criterio que safe_eval_function).
+    Devuelve None si la expresión no se puede compilar; el llamador debe usar el intérprete seguro.
+    """
+    key = (func_str.strip(), bool(use_numba and numba is not None))
+    if key in _compiled_functions:
+        return _compiled_functions[key]
+
+    optimized = optimize_expression(key[0])
+    try:
+        if optimized.body is None:
+            raise NotCompilableError("Expresión no válida")
+        names = ('x',) + tuple(name for name, _ in optimized.temporaries)
+        statements = [f"{name} = {ast.unparse(ast.fix_missing_locations(_to_numpy_ast(node, names)))}"
+                      for name, node in optimized.temporaries]
+        body = ast.unparse(ast.fix_missing_locations(_to_numpy_ast(optimized.body, names)))
+    except (NotCompilableError, RecursionError):
+        _compiled_functions[key] = None
+        return None
+
+    raw, backend = None, None
+    if key[1]:
+        try:
+            raw, backend = _load_compiled_source(_generate_source(body, True, statements), True), 'numba'
+        except Exception:
+            raw = None  # numba no soporta la expresión: recurrir a NumPy
+    if raw is None:
+        raw, backend = _load_compiled_source(_generate_source(body, False, statements), False), 'numpy'
+
+    def vectorized(x_values):
+        x_arr = np.asarray(x_values, dtype=float)
+        with np.errstate(all='ignore'):
+            result = raw(x_arr)
+        result = np.array(np.broadcast_to(np.asarray(result, dtype=float), x_arr.shape))
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+    vectorized.backend = backend
+    vectorized.expression = "; ".join(statements + [body])
+    vectorized.rewrites = optimized.rewrites
+    _compiled_functions[key] = vectorized
+    return vectorized
+
+
+def evaluate_function_batch(func_str, x_values, use_compiled=True):
+    """
+    Evalúa func_str en un array de valores de x y devuelve un array de f(x) con NaN
+    en los puntos inválidos. Usa la ruta compilada cuando es posible y, si no
+    (o si falla en tiempo de ejecución), el intérprete seguro punto a punto.
+    """
+    x_arr = np.asarray(x_values, dtype=float)
+    if use_compiled:
+        compiled = compile_vectorized_function(func_str)
+        if compiled is not None:
+            try:
+                return compiled(x_arr)
+            except Exception:
+                pass
+    values = np.full(x_arr.shape, np.nan)
+    flat_x, flat_v = x_arr.ravel(), values.ravel()
+    for i, x_val in enumerate(flat_x):
+        try:
+            flat_v[i] = safe_eval_function(func_str, float(x_val))
+        except ValueError:
+            pass
+    return values
+
+
+_curve_samples = {}
+_MAX_CURVES_IN_MEMORY = 32
+
+
+def sample_function_curve(func_str, x_range, resolution=200):
+    """
+    Muestrea f(x) en np.linspace(x_range[0], x_range[1], resolution) y devuelve (x, y),
+    con NaN en los puntos inválidos. Las curvas se cachean en memoria y en la caché en
+    disco 'curves' (clave: expresión, rango y resolución), de modo que repetir un
+    experimento no vuelve a evaluar la función para dibujarla.
+    Los arrays devueltos son de solo lectura (se comparten entre llamadas).
+    """
+    key_parts = (func_str.strip(), float(x_range[0]), float(x_range[1]), int(resolution))
+    if key_parts in _curve_samples:
+        return _curve_samples[key_parts]
+
+    cache = get_cache('curves')
+    key = cache.make_key(np.__version__, *key_parts) if cache is not None else None
+    cached = cache.load_arrays(key) if cache is not None else None
+    if cached is not None and cached.get('y') is not None and len(cached['y']) == key_parts[3]:
+        x_values, y_values = cached['x'], cached['y']
+    else:
+        x_values = np.linspace(key_parts[1], key_parts[2], key_parts[3])
+        y_values = evaluate_function_batch(func_str, x_values)
+        if cache is not None:
+            try:
+                cache.save_arrays(key, x=x_values, y=y_values)
+            except OSError:
+                pass  # La caché en disco es solo una optimización
+    x_values.flags.writeable = False
+    y_values.flags.writeable = False
+    if len(_curve_samples) >= _MAX_CURVES_IN_MEMORY:
+        _curve_samples.pop(next(iter(_curve_samples)))  # La más antigua
+    _curve_samples[key_parts] = (x_values, y_values)
+    return x_values, y_values
+
+
 if __name__ == '__main__':
     print("Probando safe_eval_function (con instancia local de Interpreter):")
     test_functions = [
@@ -78,4 +809,41 @@ if __name__ == '__main__':
         except ValueError as e:
             print(f"Error (esperado) para f(x) = {func_str:<20}, x = {val:<5}: {e}")
         except Exception as e_gen:
-            print(f"Error GENERAL (inesperado) para f(x) = {func_str:<20}, x = {val:<5}: {e_gen}")
\ No newline at end of file
+            print(f"Error GENERAL (inesperado) para f(x) = {func_str:<20}, x = {val:<5}: {e_gen}")
+
+    print("\nProbando derivación simbólica:")
+    for func_str, _ in test_functions:
+        gradient = build_gradient_function(func_str)
+        if gradient is None:
+            print(f"f(x) = {func_str:<20} | no derivable simbólicamente")
+        else:
+            print(f"f(x) = {func_str:<20} | f'(x) = {gradient.expression}")
+
+    print("\nProbando ruta compilada/vectorizada:")
+    x_grid = np.linspace(-5, 5, 11)
+    for func_str, _ in test_functions:
+        compiled = compile_vectorized_function(func_str)
+        if compiled is None:
+            print(f"f(x) = {func_str:<20} | no compilable (se usa el intérprete seguro)")
+        else:
+            print(f"f(x) = {func_str:<20} | backend {compiled.backend}: {np.round(compiled(x_grid), 3)}")
+
+    print("\nProbando la optimización de expresiones:")
+    import time
+    for func_str in ("x*np.sin(x) + np.sin(x)**2 + math.pi*2", "(x+1)**4 + (x+1)**2", "math.exp(-x**2) * 2**3"):
+        optimized = optimize_expression(func_str)
+        compiled = compile_vectorized_function(func_str)
+        print(f"f(x) = {func_str} | {optimized.summary()}\n    intérprete: {optimized.source}"
+              f"\n    compilada: {compiled.expression if compiled is not None else '-'}")
+        timings = []
+        for source in (func_str, optimized.source):
+            start = time.perf_counter()
+            aeval = Interpreter(usersyms={'math': math, 'np': np})
+            for _ in range(100):
+                values = []
+                for v in x_grid:
+                    aeval.symtable['x'] = v
+                    values.append(aeval.eval(source))
+            timings.append(1e6 * (time.perf_counter() - start) / (100 * len(x_grid)))
+        match = compiled is not None and np.allclose(compiled(x_grid), values)
+        print(f"    intérprete: {timings[0]:.0f} -> {timings[1]:.0f} us por punto; compilada coincide: {match}")
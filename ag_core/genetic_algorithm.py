@@ -1,12 +1,43 @@
+import datetime
+import time
+
 import pygad
 import numpy as np
-from .function_parser import safe_eval_function
+from .function_parser import build_gradient_function
+from .local_search import refine_solution
+from .adaptive import AdaptiveControl
+from .evaluators import create_evaluator, ExpressionEvaluator, MultiObjectiveEvaluator
+from .parallel_evaluator import ProcessPoolEvaluator
+from .sandbox import SandboxedEvaluator
+from .precision import precision_dtype
+from .initialization import INIT_STRATEGIES, RESTART_STRATEGIES, best_points, build_initial_population, restart_population
+from .surrogate import SurrogateEvaluator
+from .archive import EvaluationArchive, ArchiveEvaluator
+from .numpy_ga import NumpyGA
+from .pareto import ParetoArchive, nsga2_key, nsga2_tournament_selection
+from .constraints import HANDLING_MODES, apply_feasibility_rules, apply_penalty, create_constraint_set
+from .snapshot import GenerationSnapshot, frozen
+from .statistics import STAT_FIELDS, generation_statistics
 import logging
 
 logger_ga = logging.getLogger(f"{__name__}.GeneticOptimizer")
 
+
+class _VectorizedNSGA2GA(pygad.GA):
+    """pygad.GA con la ordenación NSGA-II (elitismo) vectorizada de ag_core.pareto."""
+    def sort_solutions_nsga2(self, fitness):
+        fitness = np.asarray(fitness, dtype=float)
+        ranking = nsga2_key(fitness) if fitness.ndim == 2 else fitness
+        return np.argsort(-ranking, kind='stable').tolist()
+
+
 class GeneticOptimizer:
-    def __init__(self, params, fitness_func_str, on_generation_callback=None, on_stop_callback=None):
+    """
+    Configura y ejecuta el AG (PyGAD o motor NumPy) sobre la cadena de evaluación.
+    on_generation_callback(snapshot) y on_stop_callback(snapshot) reciben un
+    GenerationSnapshot inmutable, nunca la instancia viva del AG.
+    """
+    def __init__(self, params, fitness_func_str, on_generation_callback=None, on_stop_callback=None, evaluator=None):
         logger_ga.debug(f"__init__: Recibidos params: {params}")
         if params is None:
             logger_ga.error("__init__: Los parámetros (params) son None.")
@@ -24,38 +55,706 @@ class GeneticOptimizer:
 
         self.params = params
         self.fitness_func_str = params['func_str']
+        # Modo multiobjetivo: 'func_strs' con más de una expresión (y 'objective_types' opcional,
+        # por defecto optimization_type para todas)
+        self.objective_strs = list(params.get('func_strs') or [self.fitness_func_str])
+        self.objective_types = list(params.get('objective_types') or [params['optimization_type']] * len(self.objective_strs))
+        if len(self.objective_types) != len(self.objective_strs):
+            raise ValueError("'objective_types' debe tener un sentido por cada expresión de 'func_strs'.")
+        self.multi_objective = len(self.objective_strs) > 1
+        self._objective_signs = np.array([1.0 if t == 'maximize' else -1.0 for t in self.objective_types])
         self.on_generation_callback = on_generation_callback
         self.on_stop_callback = on_stop_callback
         self.ga_instance = None
+        # Cadena de evaluación: objetivo real (expresión func_str local o evaluador externo
+        # de ag_core.evaluators), archivo de evaluaciones y, opcionalmente, el filtro sustituto
+        self._owns_evaluator = evaluator is None
+        objective = evaluator if evaluator is not None else create_evaluator(params)
+        self._expression_objective = objective is None
+        if objective is None:
+            use_compiled = params.get('compile_objective', True)
+            eval_workers = int(params.get('eval_workers') or 0)
+            if params.get('eval_timeout') or params.get('generation_timeout') or params.get('eval_memory_mb'):
+                # Presupuestos de tiempo/memoria: procesos con límites que se reinician si una evaluación se cuelga
+                objective = SandboxedEvaluator(self.objective_strs, workers=max(1, eval_workers), use_compiled=use_compiled,
+                                               eval_timeout=params.get('eval_timeout'),
+                                               generation_timeout=params.get('generation_timeout'),
+                                               memory_mb=params.get('eval_memory_mb'))
+            elif eval_workers > 1:
+                # Reparto del lote entre procesos con la población en memoria compartida
+                objective = ProcessPoolEvaluator(self.objective_strs, eval_workers, use_compiled=use_compiled)
+            elif self.multi_objective:
+                objective = MultiObjectiveEvaluator(
+                    [ExpressionEvaluator(func_str, use_compiled=use_compiled) for func_str in self.objective_strs])
+            else:
+                objective = ExpressionEvaluator(self.fitness_func_str, use_compiled=use_compiled)
+        # Precisión ('precision': 'float64' o 'float32') de la población, el fitness del motor,
+        # el historial de estadísticas y el archivo; el objetivo se evalúa siempre en float64
+        self.dtype = precision_dtype(params)
+        self.archive = EvaluationArchive(num_genes=1, num_objectives=len(self.objective_strs), dtype=self.dtype)
+        # 'max_evaluations' es un límite duro: el archivo deja sin evaluar lo que no cabe
+        self.evaluator = ArchiveEvaluator(objective, self.archive, tolerance=params.get('archive_tolerance'),
+                                          budget=params.get('max_evaluations'))
+        # Modo sustituto (opcional): un RBF filtra cada lote y solo la fracción más prometedora
+        # llega al objetivo real (y al archivo)
+        self.surrogate = None
+        if params.get('surrogate', False) and self.multi_objective:
+            logger_ga.warning("__init__: El modo sustituto no admite varios objetivos; se desactiva.")
+        elif params.get('surrogate', False):
+            self.surrogate = SurrogateEvaluator(
+                self.evaluator, params['range_min'], params['range_max'],
+                maximize=params['optimization_type'] == 'maximize',
+                true_fraction=float(params.get('surrogate_fraction', 0.3)),
+                retrain_interval=int(params.get('surrogate_retrain_interval', 5)),
+                min_archive=int(params.get('surrogate_min_archive', 2 * int(params['pop_size']))),
+                archive=self.archive,
+            )
+            self.evaluator = self.surrogate
         self.population_history = []
         self.best_solution_fitness_history = []
+        # Resumen por generación (estadísticas de ag_core.statistics, aptitud en unidades del primer objetivo)
+        self.generation_summaries = []
+        self.run_started_at = None
+        self.run_duration_s = None
+        self._run_start = None
+        self._last_generation_time = None
+        self._stop_requested = False
+        # Buffer de las estadísticas por generación (una fila por generación, columnas STAT_FIELDS;
+        # la primera es la mejor aptitud): solo se añade al final, así que los snapshots
+        # comparten una vista de solo lectura de su prefijo sin copiarlo
+        self._history_buffer = np.full((int(params['num_generations']) + 1, len(STAT_FIELDS)), np.nan, dtype=self.dtype)
+        self._history_size = 0
+        # Valores reales del objetivo de los últimos individuos evaluados (clave: genes),
+        # para que el snapshot lleve f(x) sin volver a evaluar. Los que solo tienen la
+        # predicción del sustituto guardan NaN y su clave va en _predicted_keys
+        self._recent_values = {}
+        self._predicted_keys = set()
+        # Fitness interno real de los puntos predichos que después se evaluaron con el objetivo:
+        # los supervivientes del motor conservan la predicción y _verify_predicted_elites la corrige
+        self._resolved_fitness = {}
         self.optimization_type = params['optimization_type']
-        self._fitness_penalty = -np.inf if self.optimization_type == 'maximize' else np.inf
-        logger_ga.info(f"GeneticOptimizer inicializado para {self.optimization_type} f(x)={self.fitness_func_str}")
+        # Peor fitness interno válido visto hasta ahora (por objetivo); las evaluaciones
+        # fallidas reciben un valor finito por debajo de él (ver _failure_fitness)
+        self._worst_fitness_seen = None
+
+        # Restricciones (opcionales): 'constraints' ('g(x) <= h(x)', '>=' o '==', separadas por ';'),
+        # 'constraint_handling' ('penalty', 'feasibility' = reglas de Deb, 'repair'),
+        # 'constraint_penalty' (coeficiente de la penalización) y 'constraint_tolerance' (igualdades)
+        self.constraints = create_constraint_set(params)
+        self.constraint_handling = params.get('constraint_handling', 'feasibility')
+        if self.constraint_handling not in HANDLING_MODES:
+            raise ValueError(f"Manejo de restricciones desconocido: '{self.constraint_handling}' (use {', '.join(HANDLING_MODES)}).")
+        if params.get('init_strategy', 'random') not in INIT_STRATEGIES:
+            raise ValueError(f"Estrategia de inicialización desconocida: '{params['init_strategy']}' (use {', '.join(INIT_STRATEGIES)}).")
+        self.constraint_penalty = float(params.get('constraint_penalty', 1e3))
+        self._worst_feasible_fitness = None
+        self._best_feasible_fitness = -np.inf
+        self._best_feasible_solution = None
+        self._best_feasible_value = np.nan
+        self._best_feasible_generation = None
+        self.repaired_count = 0
+        self.feasibility_history = []
+        if self.constraints is not None:
+            logger_ga.info(f"__init__: {len(self.constraints)} restricciones ({self.constraint_handling}): "
+                           f"{'; '.join(self.constraints.constraint_strs)}")
+
+        # Semilla: si no se especifica se genera una y se registra para poder reproducir la ejecución
+        seed = params.get('random_seed')
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % (2**32))
+        self.random_seed = int(seed)
+
+        # Modo memético (opcional): refinamiento local periódico de los mejores individuos
+        self.memetic_enabled = bool(params.get('memetic', False))
+        if self.memetic_enabled and self.multi_objective:
+            logger_ga.warning("__init__: El modo memético no admite varios objetivos; se desactiva.")
+            self.memetic_enabled = False
+        self.memetic_interval = max(1, int(params.get('memetic_interval', 10)))
+        self.memetic_top_k = max(1, int(params.get('memetic_top_k', 2)))
+        self.memetic_max_evals = max(3, int(params.get('memetic_max_evals', 40)))
+        self.memetic_radius = float(params.get('memetic_radius', 0.05))
+        self.memetic_use_gradient = bool(params.get('memetic_use_gradient', True))
+        # Gradiente analítico de f(x); None si la expresión no es derivable simbólicamente
+        self.gradient_func = None
+        if self.memetic_enabled and self.memetic_use_gradient and self._expression_objective:
+            self.gradient_func = build_gradient_function(self.fitness_func_str)
+            if self.gradient_func is None:
+                logger_ga.info("__init__: f(x) no es derivable simbólicamente; la búsqueda local usará métodos sin derivadas.")
+            else:
+                logger_ga.info(f"__init__: Gradiente analítico f'(x) = {self.gradient_func.expression}")
+        self.local_search_evaluations = 0
+        self.local_search_improvements = 0
+
+        # Control autoadaptativo (opcional): Pm, paso de mutación, Pc y K del torneo se
+        # recalculan cada generación a partir de la diversidad y la tasa de mejora
+        self.adaptive = None
+        if params.get('adaptive', False) and self.multi_objective:
+            logger_ga.warning("__init__: El control adaptativo no admite varios objetivos; se desactiva.")
+        elif params.get('adaptive', False):
+            self.adaptive = AdaptiveControl(
+                params['mutation_prob'], params['crossover_prob'],
+                mutation_step=self._base_mutation_step(),
+                window=int(params.get('adaptive_window', 10)),
+                patience=int(params.get('adaptive_patience', 10)),
+            )
+
+        # Reinicios (opcionales) al estancarse: 'restart_strategy' ('ipop' = población nueva
+        # 'restart_pop_factor' veces mayor, 'partial' = conserva los mejores y re-muestrea
+        # 'restart_fraction', 'reseed' = alrededor del mejor global) tras 'restart_patience'
+        # generaciones sin mejora. 'max_evaluations' limita las evaluaciones reales del objetivo
+        # de toda la ejecución (límite exacto: los individuos que no caben en el presupuesto
+        # quedan sin evaluar, con el fitness de fallo, y la ejecución se detiene)
+        self.restart_strategy = params.get('restart_strategy') or 'none'
+        if self.restart_strategy not in RESTART_STRATEGIES:
+            raise ValueError(f"Estrategia de reinicio desconocida: '{self.restart_strategy}' (use {', '.join(RESTART_STRATEGIES)}).")
+        if self.restart_strategy != 'none' and self.multi_objective:
+            logger_ga.warning("__init__: Los reinicios no admiten varios objetivos; se desactivan.")
+            self.restart_strategy = 'none'
+        self.restart_patience = max(1, int(params.get('restart_patience', 20)))
+        self.restart_pop_factor = float(params.get('restart_pop_factor', 2.0))
+        self.restart_max_pop_size = int(params.get('restart_max_pop_size', 16 * int(params['pop_size'])))
+        self.restart_fraction = float(params.get('restart_fraction', 0.5))
+        self.restart_radius = float(params.get('restart_radius', 0.1))
+        self.max_evaluations = int(params['max_evaluations']) if params.get('max_evaluations') else None
+        self.evaluations_used = 0
+        self.restarts = 0
+        self.restart_log = []
+        self._restart_pending = False
+        self._generation_offset = 0  # Generaciones de los tramos anteriores a cada reinicio
+        self._run_best_fitness = -np.inf
+        self._run_stagnation = 0
+        # Mejor solución de toda la ejecución (sobrevive a los reinicios)
+        self._best_ever_solution = None
+        self._best_ever_fitness = -np.inf
+        self._best_ever_generation = -1
+        self._best_ever_value = np.nan
+
+        # Frente de Pareto acumulado (solo en modo multiobjetivo)
+        self.pareto_archive = None
+        if self.multi_objective:
+            self.pareto_archive = ParetoArchive(1, len(self.objective_strs), max_size=int(params.get('pareto_archive_size', 200)))
+            objectives_desc = ", ".join(f"{t} {f}" for t, f in zip(self.objective_types, self.objective_strs))
+            logger_ga.info(f"GeneticOptimizer inicializado en modo multiobjetivo: {objectives_desc} (semilla={self.random_seed})")
+        else:
+            logger_ga.info(f"GeneticOptimizer inicializado para {self.optimization_type} f(x)={self.fitness_func_str} (semilla={self.random_seed})")
+
+    def _base_mutation_step(self):
+        """
+        Paso de mutación inicial relativo al ancho del intervalo: 'mutation_scale' si se da;
+        si no, el del motor (NumpyGA: 0.1; PyGAD: suma un valor en [-1, 1]).
+        """
+        if self.params.get('mutation_scale') is not None:
+            return float(self.params['mutation_scale'])
+        if self.params.get('backend', 'pygad') == 'numpy':
+            return 0.1
+        return 1.0 / (float(self.params['range_max']) - float(self.params['range_min']))
 
     def _fitness_wrapper(self, ga_inst, solution, sol_idx):
+        """Fitness interno de una única solución (usado fuera del ciclo por lotes de PyGAD)."""
+        return self._batch_fitness_wrapper(ga_inst, np.atleast_2d(solution), [sol_idx])[0]
+
+    def _batch_fitness_wrapper(self, ga_inst, solutions, sol_indices):
+        """
+        Evalúa un lote completo (toda la generación) con la cadena de evaluación y aplica
+        el manejo de restricciones. Devuelve el fitness interno (a maximizar): un valor por
+        solución o, en modo multiobjetivo, una fila por solución.
+        """
+        return self._evaluate_batch(ga_inst, solutions, sol_indices)
+
+    def _evaluate_batch(self, ga_inst, solutions, sol_indices, use_surrogate=True):
+        """
+        Cuerpo de _batch_fitness_wrapper (PyGAD exige que la función de fitness tenga tres
+        argumentos). Con use_surrogate=False todo el lote va al objetivo real aunque el modo
+        sustituto esté activo.
+        """
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        if self.constraints is not None and self.constraint_handling == 'repair':
+            solutions = self._repair_solutions(ga_inst, solutions, sol_indices)
+        evaluated = np.ones(len(solutions), dtype=bool)  # Filas con f(x) real (no predicho)
         try:
-            x_val = solution[0]
-            raw = safe_eval_function(self.fitness_func_str, x_val)
-            return -raw if self.optimization_type == 'minimize' else raw
-        except ValueError as ve:
-            logger_ga.warning(f"_fitness_wrapper: ValueError: {ve} para solution {solution}. Aplicando penalización.")
-            return self._fitness_penalty
+            if self.surrogate is None:
+                raw = np.asarray(self.evaluator.evaluate(solutions), dtype=float)
+            elif use_surrogate:
+                raw, evaluated = self.surrogate.evaluate_with_mask(solutions)
+            else:
+                raw = self.surrogate.evaluate_true(solutions)
         except Exception as e:
-            logger_ga.error(f"_fitness_wrapper: CRÍTICO: {e} para solution {solution}. Aplicando penalización.", exc_info=True)
-            return self._fitness_penalty
+            logger_ga.error(f"_batch_fitness_wrapper: CRÍTICO: {e} evaluando {len(solutions)} soluciones. Aplicando penalización.", exc_info=True)
+            raw = np.full((len(solutions), len(self.objective_strs)), np.nan)
+        raw = raw.reshape(len(solutions), -1)
+        # Presupuesto: solo cuentan las llamadas al objetivo real, que el archivo registra todas
+        # (no las predicciones del sustituto ni los valores reutilizados del archivo)
+        self.evaluations_used = len(self.archive)
+        keys = [solution.tobytes() for solution in solutions]
+        resolved = [i for i in np.flatnonzero(evaluated) if keys[i] in self._predicted_keys]
+        for i in np.flatnonzero(evaluated):
+            self._recent_values[keys[i]] = raw[i]
+            self._predicted_keys.discard(keys[i])
+        # Predicciones de puntos con f(x) real conocido (duplicados en el lote o de generaciones
+        # anteriores): se usa el valor real, no la predicción
+        evaluated = np.array(evaluated, dtype=bool)
+        for i in np.flatnonzero(~evaluated):
+            known = self._recent_values.get(keys[i])
+            if known is not None and keys[i] not in self._predicted_keys:
+                raw[i] = known
+                evaluated[i] = True
+            else:
+                self._recent_values[keys[i]] = np.full_like(raw[i], np.nan)
+                self._predicted_keys.add(keys[i])
+        # Internamente siempre (n, n_objetivos), cada objetivo en sentido de maximización
+        fitness = raw * self._objective_signs
+        failed = ~np.isfinite(fitness).all(axis=1)
+
+        if self.constraints is not None:
+            violation = self.constraints.violations(solutions)
+            failed |= ~np.isfinite(violation)
+            feasible = ~failed & (violation <= 0)
+            self._track_feasible(solutions, fitness, feasible & evaluated, raw)
+            if self.constraint_handling == 'penalty':
+                fitness = apply_penalty(fitness, violation, self.constraint_penalty)
+            else:  # 'feasibility' y las que siguen sin reparar en 'repair'
+                baseline = self._worst_feasible_fitness if self._worst_feasible_fitness is not None \
+                    else self._worst_fitness_seen
+                fitness = apply_feasibility_rules(fitness, violation, baseline if baseline is not None else 0.0)
+
+        if failed.any():
+            logger_ga.warning(f"_batch_fitness_wrapper: {int(failed.sum())}/{len(fitness)} soluciones sin valor válido. Aplicando penalización.")
+        if not failed.all():
+            batch_worst = fitness[~failed].min(axis=0)
+            self._worst_fitness_seen = batch_worst if self._worst_fitness_seen is None \
+                else np.minimum(self._worst_fitness_seen, batch_worst)
+        fitness[failed] = self._failure_fitness()
+        for i in resolved:
+            self._resolved_fitness[keys[i]] = fitness[i, 0]
+        return fitness.tolist() if self.multi_objective else fitness[:, 0].tolist()
+
+    def _failure_fitness(self):
+        """
+        Fitness de las evaluaciones fallidas: finito y por debajo del peor valor visto,
+        para no anular la presión de selección (±inf hace degenerar la selección
+        proporcional y la ordenación). -inf solo si aún no hay ningún valor válido.
+        """
+        if self._worst_fitness_seen is None:
+            return -np.inf
+        worst = self._worst_fitness_seen
+        return worst - (np.abs(worst) + 1.0)
+
+    def _track_feasible(self, solutions, fitness, feasible, raw):
+        """
+        Actualiza el peor fitness factible (reglas de Deb) y el mejor punto factible (ancla de
+        reparación y mejor solución informada). 'fitness' es el de antes de la penalización y
+        'raw' el valor real del objetivo; solo cuentan los puntos evaluados con el objetivo real.
+        """
+        if not feasible.any():
+            return
+        feasible_fitness = fitness[feasible]
+        batch_worst = feasible_fitness.min(axis=0)
+        self._worst_feasible_fitness = batch_worst if self._worst_feasible_fitness is None \
+            else np.minimum(self._worst_feasible_fitness, batch_worst)
+        best = int(np.argmax(feasible_fitness[:, 0]))
+        if feasible_fitness[best, 0] > self._best_feasible_fitness:
+            self._best_feasible_fitness = feasible_fitness[best, 0]
+            self._best_feasible_solution = solutions[feasible][best].copy()
+            self._best_feasible_value = float(raw[feasible][best, 0])
+            self._best_feasible_generation = None  # Se fija en la próxima generación completada
+
+    def _repair_solutions(self, ga_inst, solutions, sol_indices):
+        """
+        Repara las soluciones no factibles hacia el mejor punto factible conocido y escribe
+        los genes reparados en la población. Solo se aplica a individuos de la población
+        (índices >= 0), no a los puntos de prueba de la búsqueda local.
+        """
+        if self._best_feasible_solution is None or ga_inst is None or min(sol_indices, default=-1) < 0:
+            return solutions
+        repaired, changed = self.constraints.repair(solutions, self._best_feasible_solution)
+        if changed.any():
+            # Redondeo a la precisión de la población: la clave de _recent_values es la del gen guardado
+            repaired = np.clip(repaired, self.params['range_min'], self.params['range_max']).astype(self.dtype).astype(float)
+            ga_inst.population[np.asarray(sol_indices)] = repaired
+            self.repaired_count += int(changed.sum())
+        return repaired
+
+    def _record_feasibility(self, ga_inst):
+        """Estadísticas de factibilidad de la población actual (una entrada por generación)."""
+        violation = self.constraints.violations(ga_inst.population)
+        finite = violation[np.isfinite(violation)]
+        stats = {
+            'generation': self.generation_number(ga_inst),
+            'feasible_ratio': float(np.mean(violation <= 0)),
+            'mean_violation': float(finite.mean()) if len(finite) else float('inf'),
+            'min_violation': float(finite.min()) if len(finite) else float('inf'),
+        }
+        self.feasibility_history.append(stats)
+        logger_ga.debug(f"_record_feasibility: Gen {stats['generation']}: {stats['feasible_ratio']:.0%} factibles, "
+                        f"violación media {stats['mean_violation']:.4g}, mínima {stats['min_violation']:.4g}")
+
+    def close(self):
+        """Libera los recursos del evaluador externo (conexiones) si lo creó este optimizador."""
+        if self._owns_evaluator and self.evaluator is not None:
+            self.evaluator.close()
+
+    def request_stop(self):
+        """Pide terminar la ejecución al final de la generación en curso (seguro desde otro hilo)."""
+        self._stop_requested = True
+
+    def __getstate__(self):
+        # Copia de resultados (p. ej. devuelta por un proceso hijo, ver ag_core.process_runner):
+        # sin la cadena de evaluación (objetivo compilado, conexiones) ni los callbacks
+        state = self.__dict__.copy()
+        state.update(evaluator=None, surrogate=None, on_generation_callback=None,
+                     on_stop_callback=None, _owns_evaluator=False)
+        return state
+
+    def evaluator_reused(self):
+        """Evaluaciones resueltas con el archivo (por tolerancia) sin llamar al objetivo."""
+        chain = self.surrogate.inner if self.surrogate is not None else self.evaluator
+        return chain.reused
+
+    def evaluation_timeouts(self):
+        """Soluciones penalizadas por agotar el límite de tiempo (0 sin presupuestos de evaluación)."""
+        chain = self.surrogate.inner if self.surrogate is not None else self.evaluator
+        return getattr(chain.inner, 'timeouts', 0)
+
+    def spawn_rngs(self, n_streams):
+        """
+        Devuelve n_streams generadores NumPy independientes derivados de la semilla
+        de la ejecución (SeedSequence.spawn). El flujo i depende solo de la semilla y de i:
+        asignando los flujos por tarea (isla, bloque de individuos) y no por proceso,
+        los resultados son idénticos sea cual sea el número de workers en paralelo.
+        """
+        children = np.random.SeedSequence(self.random_seed).spawn(int(n_streams))
+        return [np.random.default_rng(child) for child in children]
+
+    def _internal_fitness(self, solution):
+        """Evalúa una solución con el mismo objetivo (y penalización) que usa PyGAD."""
+        return self._fitness_wrapper(self.ga_instance, solution, -1)
+
+    def _internal_gradient(self, solution):
+        """Gradiente del fitness interno (signo invertido al minimizar), o None si falla."""
+        try:
+            grad = self.gradient_func(solution)
+        except ValueError:
+            return None
+        return -grad if self.optimization_type == 'minimize' else grad
+
+    def _refine_elites(self, ga_inst):
+        """
+        Refina con búsqueda local los 'memetic_top_k' mejores individuos y escribe
+        los genes mejorados (y su fitness) de vuelta en la población de PyGAD.
+        """
+        fitness = ga_inst.last_generation_fitness
+        if fitness is None:
+            return
+        top_k = min(self.memetic_top_k, len(fitness))
+        elite_indices = np.argsort(fitness)[::-1][:top_k]
+        low, high = self.params['range_min'], self.params['range_max']
+
+        for idx in elite_indices:
+            if not np.isfinite(fitness[idx]):
+                continue
+            x_new, f_new, n_evals = refine_solution(
+                self._internal_fitness, ga_inst.population[idx], low, high,
+                radius=self.memetic_radius, max_evals=self.memetic_max_evals,
+                grad=self._internal_gradient if self.gradient_func else None
+            )
+            self.local_search_evaluations += n_evals
+            if f_new > fitness[idx]:
+                ga_inst.population[idx] = x_new
+                fitness[idx] = f_new
+                self.local_search_improvements += 1
+
+        logger_ga.debug(f"_refine_elites: Gen {self.generation_number(ga_inst)}, "
+                        f"evaluaciones locales acumuladas: {self.local_search_evaluations}, "
+                        f"mejoras: {self.local_search_improvements}")
+
+    def _record_generation_summary(self, ga_inst):
+        """
+        Estadísticas de la generación actual (vectorizadas sobre la población, ver ag_core.statistics).
+        Las aptitudes salen del valor real f(x) del primer objetivo, no del fitness interno.
+        """
+        values = self._population_values(ga_inst.population, prune=False)[:, 0]
+        stats = generation_statistics(
+            ga_inst.population, values,
+            self.params['range_min'], self.params['range_max'], sign=self._objective_signs[0],
+            previous_fitness=getattr(ga_inst, 'previous_generation_fitness', None),
+            parents_indices=getattr(ga_inst, 'last_generation_parents_indices', None))
+        summary = {'generation': self.generation_number(ga_inst), **stats}
+        if self.feasibility_history:
+            summary['feasible_ratio'] = self.feasibility_history[-1]['feasible_ratio']
+        self.generation_summaries.append(summary)
+        self.best_solution_fitness_history.append(summary['best'])
+        if self._history_size == len(self._history_buffer):
+            # Buffer nuevo: los snapshots anteriores conservan sus vistas del antiguo
+            grown = np.full((2 * len(self._history_buffer), len(STAT_FIELDS)), np.nan, dtype=self.dtype)
+            grown[:self._history_size] = self._history_buffer[:self._history_size]
+            self._history_buffer = grown
+        self._history_buffer[self._history_size] = [stats[name] for name in STAT_FIELDS]
+        self._history_size += 1
+
+    @property
+    def statistics_history(self):
+        """Estadísticas por generación (generaciones, len(STAT_FIELDS)), columnas en el orden de STAT_FIELDS."""
+        return self._history_buffer[:self._history_size]
+
+    def _population_values(self, population, prune=True):
+        """
+        Valor real de cada objetivo de la población (n, objetivos) a partir de las
+        evaluaciones ya hechas. NaN para los puntos fallidos y para los que solo tienen
+        la predicción del sustituto: el fitness interno no es f(x) (penalizaciones,
+        predicciones, _failure_fitness), así que nunca se usa en su lugar.
+        Con prune=True olvida los valores de los individuos que ya no están en la población.
+        """
+        values = np.full((len(population), len(self.objective_strs)), np.nan)
+        current = {}
+        for i, solution in enumerate(np.asarray(population, dtype=float)):
+            key = solution.tobytes()
+            row = self._recent_values.get(key)
+            if row is not None:
+                values[i] = row
+                current[key] = row
+        if prune:
+            self._recent_values = current  # Solo se conservan los individuos vivos
+            self._predicted_keys &= current.keys()
+            self._resolved_fitness = {key: self._resolved_fitness[key] for key in
+                                      current.keys() & self._resolved_fitness.keys()}
+        return values
+
+    def population_objective_values(self):
+        """
+        Valor real de cada objetivo de la población actual (n, objetivos), el mismo que llevan
+        los snapshots en f_values: NaN si la evaluación falló o solo hay predicción del sustituto.
+        """
+        if self.ga_instance is None:
+            return np.empty((0, len(self.objective_strs)))
+        return self._population_values(self.ga_instance.population, prune=False)
+
+    def _verify_predicted_elites(self, ga_inst):
+        """
+        Modo sustituto: evalúa con el objetivo real los individuos con fitness predicho que
+        están entre los mejores de la población (las élites que pasan a la generación siguiente
+        y el candidato a mejor global), y sustituye en el motor la predicción por el fitness
+        real. Se repite hasta que todas las élites tienen un valor real. Los individuos cuya
+        predicción ya se resolvió en otro lote recuperan antes su fitness real.
+        """
+        fitness = ga_inst.last_generation_fitness
+        n_elite = max(1, int(getattr(ga_inst, 'keep_elitism', 1) or 1))
+        verified = 0
+        while True:
+            if self._resolved_fitness:
+                for i, solution in enumerate(np.asarray(ga_inst.population, dtype=float)):
+                    real = self._resolved_fitness.get(solution.tobytes())
+                    if real is not None:
+                        fitness[i] = real
+            if not self._predicted_keys:
+                break
+            ranking = np.where(np.isfinite(fitness), fitness, -np.inf)
+            top = np.argsort(-ranking, kind='stable')[:n_elite]
+            pending = [int(i) for i in top
+                       if np.asarray(ga_inst.population[i], dtype=float).tobytes() in self._predicted_keys]
+            if not pending:
+                break
+            fitness[pending] = self._evaluate_batch(ga_inst, ga_inst.population[pending], pending, use_surrogate=False)
+            verified += len(pending)
+        if verified:
+            logger_ga.debug(f"_verify_predicted_elites: Gen {self.generation_number(ga_inst)}: "
+                            f"{verified} élites con fitness predicho re-evaluadas con el objetivo real.")
+
+    def make_snapshot(self, ga_inst, final=False):
+        """GenerationSnapshot inmutable del estado actual (llamar desde el hilo del AG)."""
+        now = time.perf_counter()
+        fitness = np.asarray(ga_inst.last_generation_fitness, dtype=self.dtype)
+        f_values = self._population_values(ga_inst.population)
+        ranking = fitness[:, 0] if fitness.ndim == 2 else fitness
+        ranking = np.where(np.isfinite(ranking), ranking, -np.inf)
+        best_idx = int(np.argmax(ranking)) if len(ranking) else -1
+        best_details = self.get_best_solution_details()
+        pareto = self.get_pareto_front()
+        statistics = frozen(self._history_buffer[:self._history_size], copy=False)
+        snapshot = GenerationSnapshot(
+            generation=self.generation_number(ga_inst),
+            num_generations=int(self.params['num_generations']),
+            optimization_type=self.optimization_type,
+            multi_objective=self.multi_objective,
+            objective_labels=tuple(f"{t[:3]}: {f}" for t, f in zip(self.objective_types, self.objective_strs)),
+            population=frozen(ga_inst.population),
+            fitness=frozen(fitness),
+            f_values=frozen(f_values if self.multi_objective else f_values[:, 0]),
+            best_x=float(ga_inst.population[best_idx][0]) if best_idx >= 0 else np.nan,
+            best_f=float(f_values[best_idx, 0]) if best_idx >= 0 else np.nan,
+            best_details=dict(best_details) if best_details else None,
+            fitness_history=statistics[:, 0],
+            pareto_X=frozen(pareto[0]) if pareto is not None else None,
+            pareto_F=frozen(pareto[1]) if pareto is not None else None,
+            feasible_ratio=self.feasibility_history[-1]['feasible_ratio'] if self.feasibility_history else None,
+            archive_points=frozen(self.archive.points) if final else None,
+            archive_values=frozen(self.archive.values) if final else None,
+            elapsed_s=now - self._run_start if self._run_start is not None else 0.0,
+            generation_time_s=now - self._last_generation_time if self._last_generation_time is not None else 0.0,
+            final=final,
+            restarts=self.restarts,
+            statistics_history=statistics,
+        )
+        self._last_generation_time = now
+        return snapshot
+
+    def _cast_engine_fitness(self, ga_inst):
+        """
+        Fitness del motor en la precisión de la ejecución: PyGAD lo reconstruye en float64 en
+        cada generación (NumpyGA ya lo devuelve en self.dtype, y la conversión no copia).
+        """
+        if ga_inst.last_generation_fitness is not None:
+            ga_inst.last_generation_fitness = np.asarray(ga_inst.last_generation_fitness, dtype=self.dtype)
 
     def _on_generation_capture(self, ga_inst):
+        self._cast_engine_fitness(ga_inst)
+        if self.surrogate is not None and ga_inst.last_generation_fitness is not None:
+            self._verify_predicted_elites(ga_inst)
+            self.surrogate.next_generation()
+        if self.pareto_archive is not None and ga_inst.last_generation_fitness is not None:
+            self.pareto_archive.update(ga_inst.population, ga_inst.last_generation_fitness)
+        if self.constraints is not None:
+            self._record_feasibility(ga_inst)
+        if ga_inst.last_generation_fitness is not None:
+            self._record_generation_summary(ga_inst)
+        if self.memetic_enabled and self.generation_number(ga_inst) % self.memetic_interval == 0:
+            self._refine_elites(ga_inst)
+        if not self.multi_objective and ga_inst.last_generation_fitness is not None:
+            self._track_progress(ga_inst)
+        if self.adaptive is not None and ga_inst.last_generation_fitness is not None:
+            low, high = self.params['range_min'], self.params['range_max']
+            self.adaptive.update(self.generation_number(ga_inst), ga_inst.population, ga_inst.last_generation_fitness, low, high)
+            self.adaptive.apply(ga_inst, low, high)
         if self.on_generation_callback:
-            self.on_generation_callback(ga_inst)
+            self.on_generation_callback(self.make_snapshot(ga_inst))
+        if self._stop_requested:
+            logger_ga.info(f"_on_generation_capture: Parada solicitada; se termina tras la generación {self.generation_number(ga_inst)}.")
+            return "stop"  # PyGAD y NumpyGA terminan run() con este valor
+        if self.max_evaluations is not None and self.evaluations_used >= self.max_evaluations:
+            logger_ga.info(f"_on_generation_capture: Presupuesto de {self.max_evaluations} evaluaciones agotado "
+                           f"en la generación {self.generation_number(ga_inst)}.")
+            return "stop"
+        if self._should_restart(ga_inst):
+            self._restart_pending = True  # run() crea el motor siguiente al volver
+            return "stop"
+
+    def generation_number(self, ga_inst):
+        """Generación de toda la ejecución (la del motor actual más las de los tramos antes de cada reinicio)."""
+        return self._generation_offset + int(ga_inst.generations_completed)
+
+    def _track_progress(self, ga_inst):
+        """Actualiza el mejor global y el contador de estancamiento del tramo actual (un objetivo)."""
+        fitness = np.asarray(ga_inst.last_generation_fitness, dtype=float)
+        fitness = np.where(np.isfinite(fitness), fitness, -np.inf)
+        if not len(fitness):
+            return
+        idx = int(np.argmax(fitness))
+        best = fitness[idx]
+        if best > self._run_best_fitness + 1e-12 * max(1.0, abs(self._run_best_fitness)) or not np.isfinite(self._run_best_fitness):
+            self._run_best_fitness = best
+            self._run_stagnation = 0
+        else:
+            self._run_stagnation += 1
+        if best > self._best_ever_fitness:
+            self._best_ever_fitness = best
+            self._best_ever_solution = np.array(ga_inst.population[idx], dtype=float)
+            self._best_ever_generation = self.generation_number(ga_inst)
+            # Valor real del objetivo: con penalizaciones el fitness interno no es f(x)
+            row = self._recent_values.get(self._best_ever_solution.tobytes())
+            self._best_ever_value = float(row[0]) if row is not None else np.nan
+        if self._best_feasible_solution is not None and self._best_feasible_generation is None:
+            self._best_feasible_generation = self.generation_number(ga_inst)
+
+    def _should_restart(self, ga_inst):
+        """Reiniciar si el tramo actual lleva 'restart_patience' generaciones sin mejora y queda margen."""
+        if self.restart_strategy == 'none' or self._run_stagnation < self.restart_patience:
+            return False
+        if self.generation_number(ga_inst) >= int(self.params['num_generations']):
+            return False
+        if self.max_evaluations is not None and \
+                self.max_evaluations - self.evaluations_used < self._restart_pop_size(len(ga_inst.population)):
+            return False  # El presupuesto no alcanza ni para evaluar la población nueva
+        return True
+
+    def _restart_pop_size(self, pop_size):
+        if self.restart_strategy != 'ipop':
+            return pop_size
+        return max(pop_size, min(int(round(pop_size * self.restart_pop_factor)), self.restart_max_pop_size))
+
+    def _restart(self):
+        """Crea un motor nuevo (mismos callbacks) con la población de la estrategia de reinicio."""
+        ga = self.ga_instance
+        params = self.params
+        low, high = params['range_min'], params['range_max']
+        self._generation_offset += int(ga.generations_completed)
+        self.restarts += 1
+        pop_size = self._restart_pop_size(len(ga.population))
+        # Flujo propio por reinicio (derivado de la semilla): reproducible y distinto del anterior
+        rng = self.spawn_rngs(self.restarts + 1)[self.restarts]
+        engine_seed = int(rng.integers(0, 2**32))
+        num_genes = np.asarray(ga.population).shape[1]
+        population = restart_population(
+            self.restart_strategy, pop_size, [low] * num_genes, [high] * num_genes, rng,
+            population=ga.population, fitness=ga.last_generation_fitness, best=self._best_ever_solution,
+            fraction=self.restart_fraction, radius=self.restart_radius,
+            init_strategy=params.get('init_strategy', 'random'),
+            evaluate=lambda X: self._batch_fitness_wrapper(None, X, [-1] * len(X)))
+        self.restart_log.append({
+            'restart': self.restarts, 'generation': self._generation_offset, 'pop_size': pop_size,
+            'evaluations': self.evaluations_used, 'best_fitness': float(self._best_ever_fitness),
+        })
+        logger_ga.info(f"_restart: Reinicio {self.restarts} ('{self.restart_strategy}') en la generación {self._generation_offset} "
+                       f"tras {self._run_stagnation} sin mejora: población {pop_size}, {self.evaluations_used} evaluaciones usadas.")
+        self._run_best_fitness = -np.inf
+        self._run_stagnation = 0
+        self.setup_ga_instance(pop_size=pop_size, num_generations=int(params['num_generations']) - self._generation_offset,
+                               initial_population=population, random_seed=engine_seed)
+        if self.adaptive is not None:
+            self.adaptive.apply(self.ga_instance, low, high)
 
     def _on_stop_capture(self, ga_inst, last_gen_fit):
+        self._cast_engine_fitness(ga_inst)
+        if self._restart_pending:
+            return  # Fin de un tramo: la ejecución sigue con el motor del reinicio
+        # La duración se fija antes del callback: el controlador la lee al recibir la parada
+        if self._run_start is not None:
+            self.run_duration_s = time.perf_counter() - self._run_start
+            logger_ga.info(f"_on_stop_capture: Optimización terminada en {self.run_duration_s:.2f} s.")
         logger_ga.info(f"_on_stop_capture: AG detenido. Última gen fitness: {last_gen_fit}")
+        logger_ga.info(f"_on_stop_capture: {len(self.archive)} evaluaciones reales, "
+                       f"{self.archive.unique_count()} puntos únicos, {self.evaluator_reused()} reutilizadas del archivo.")
+        if self.evaluation_timeouts():
+            logger_ga.info(f"_on_stop_capture: {self.evaluation_timeouts()} evaluaciones penalizadas por agotar el límite de tiempo.")
+        if self.feasibility_history:
+            last = self.feasibility_history[-1]
+            logger_ga.info(f"_on_stop_capture: Restricciones: {last['feasible_ratio']:.0%} de la población final factible, "
+                           f"{self.repaired_count} soluciones reparadas.")
+        if self.pareto_archive is not None:
+            logger_ga.info(f"_on_stop_capture: Frente de Pareto con {len(self.pareto_archive)} soluciones no dominadas.")
+        if self.restarts:
+            logger_ga.info(f"_on_stop_capture: {self.restarts} reinicios ('{self.restart_strategy}'); "
+                           f"mejor global en la generación {self._best_ever_generation}.")
+        if self.max_evaluations is not None:
+            chain = self.surrogate.inner if self.surrogate is not None else self.evaluator
+            skipped = getattr(chain, 'skipped', 0)
+            logger_ga.info(f"_on_stop_capture: {self.evaluations_used} de {self.max_evaluations} evaluaciones del presupuesto"
+                           + (f" ({skipped} soluciones sin evaluar por falta de presupuesto)." if skipped else "."))
+        if self.adaptive is not None:
+            logger_ga.info(f"_on_stop_capture: Control adaptativo: {self.adaptive.summary()}")
+        if self.surrogate is not None:
+            logger_ga.info(f"_on_stop_capture: Sustituto: {self.surrogate.true_evaluations} evaluaciones reales, "
+                           f"{self.surrogate.surrogate_evaluations} predichas (ahorro {self.surrogate.savings():.1%}).")
         if self.on_stop_callback:
-            self.on_stop_callback(ga_inst)
+            self.on_stop_callback(self.make_snapshot(ga_inst, final=True))
 
-    def setup_ga_instance(self):
+    def setup_ga_instance(self, pop_size=None, num_generations=None, initial_population=None, random_seed=None):
+        """
+        Crea el motor del AG. Sin argumentos usa los parámetros de la ejecución; los reinicios
+        pasan el tamaño de población, las generaciones restantes, la población y la semilla.
+        """
         params = self.params
+        pop_size = int(params['pop_size']) if pop_size is None else int(pop_size)
+        num_generations = int(params['num_generations']) if num_generations is None else int(num_generations)
+        random_seed = self.random_seed if random_seed is None else random_seed
         logger_ga.debug(f"setup_ga_instance: Entrando. params: {params}")
 
         # Validar rango
@@ -80,23 +779,51 @@ class GeneticOptimizer:
                 isinstance(gene_space_val[0].get('high'), (int, float))):
             raise TypeError(f"Validación gene_space fallida: {gene_space_val}")
 
+        if initial_population is None:
+            initial_population = self._initial_population(range_min, range_max, num_genes_val)
+
+        backend = params.get('backend', 'pygad')
+        if backend == 'numpy':
+            self._setup_numpy_instance(range_min, range_max, num_genes_val, initial_population,
+                                       pop_size, num_generations, random_seed)
+            return
+        if backend != 'pygad':
+            raise ValueError(f"Motor de AG desconocido: '{backend}' (use 'pygad' o 'numpy').")
+        logger_ga.warning("setup_ga_instance: el motor PyGAD usa su selección, cruce, mutación y elitismo por defecto; "
+                          "'selection_type', 'crossover_type', 'crossover_prob', 'mutation_prob' y 'keep_elitism' "
+                          "solo se aplican con backend='numpy'.")
+
         # Padres para mating
-        n_parents = max(2, int(params['pop_size'] * 0.4))
+        n_parents = max(2, int(pop_size * 0.4))
         if n_parents % 2 != 0:
             n_parents -= 1
             if n_parents < 2:
                 n_parents = 2
 
+        # Varios objetivos: selección por torneo NSGA-II y ordenación NSGA-II vectorizadas
+        optional_args = {}
+        if initial_population is not None:
+            optional_args['initial_population'] = initial_population
+        ga_class = pygad.GA
+        if self.multi_objective:
+            optional_args['parent_selection_type'] = nsga2_tournament_selection
+            ga_class = _VectorizedNSGA2GA
+
         # Simplificación de la llamada a PyGAD
         try:
-            self.ga_instance = pygad.GA(
-                num_generations=int(params['num_generations']),
+            self.ga_instance = ga_class(
+                num_generations=num_generations,
                 num_parents_mating=n_parents,
-                fitness_func=self._fitness_wrapper,
-                sol_per_pop=int(params['pop_size']),
+                fitness_func=self._batch_fitness_wrapper,
+                fitness_batch_size=pop_size,
+                sol_per_pop=pop_size,
                 num_genes=num_genes_val,
                 gene_space=gene_space_val,
-                gene_type=float
+                gene_type=self.dtype.type,
+                on_generation=self._on_generation_capture,
+                on_stop=self._on_stop_capture,
+                random_seed=random_seed,
+                **optional_args
                 # Aislado: agregar opcionales uno a uno si todo funciona
             )
             logger_ga.info("setup_ga_instance: PyGAD Instance configured con los parámetros esenciales.")
@@ -104,23 +831,155 @@ class GeneticOptimizer:
             logger_ga.error(f"Error inicializando pygad.GA con gene_space: {gene_space_val}", exc_info=True)
             raise
 
+    def _initial_population(self, range_min, range_max, num_genes_val):
+        """
+        Población inicial según 'init_strategy' ('random' por defecto, 'lhs', 'sobol', 'halton',
+        'opposition') y 'warm_start' (soluciones de una ejecución anterior, de mejor a peor;
+        ocupan como mucho 'warm_start_fraction' de la población). None = inicialización
+        uniforme propia del motor, idéntica a la de versiones anteriores con la misma semilla.
+        """
+        params = self.params
+        strategy = params.get('init_strategy', 'random')
+        warm_start = params.get('warm_start')
+        if strategy == 'random' and not warm_start:
+            return None
+        rng = self.spawn_rngs(1)[0]  # Flujo propio: no altera la secuencia aleatoria del motor
+        # La oposición evalúa 2 x pop_size candidatos (cuentan como evaluaciones y quedan en el archivo)
+        evaluate = lambda X: self._batch_fitness_wrapper(None, X, [-1] * len(X))
+        population = build_initial_population(
+            strategy, int(params['pop_size']), [range_min] * num_genes_val, [range_max] * num_genes_val, rng,
+            evaluate=evaluate, warm_start=warm_start,
+            warm_start_fraction=float(params.get('warm_start_fraction', 0.5)))
+        logger_ga.info(f"_initial_population: Población inicial '{strategy}'"
+                       + (f" con arranque en caliente ({len(warm_start)} soluciones previas)." if warm_start else "."))
+        return population
+
+    def _setup_numpy_instance(self, range_min, range_max, num_genes_val, initial_population=None,
+                              pop_size=None, num_generations=None, random_seed=None):
+        """Crea el motor NumPy vectorizado (backend='numpy') con los mismos callbacks."""
+        params = self.params
+        self.ga_instance = NumpyGA(
+            num_generations=int(params['num_generations']) if num_generations is None else num_generations,
+            sol_per_pop=int(params['pop_size']) if pop_size is None else pop_size,
+            num_genes=num_genes_val,
+            low=range_min,
+            high=range_max,
+            fitness_func=self._batch_fitness_wrapper,
+            parent_selection_type=params['selection_type'],
+            crossover_type=params['crossover_type'],
+            crossover_probability=params['crossover_prob'],
+            mutation_type=params.get('mutation_type', 'gaussian'),
+            mutation_probability=params['mutation_prob'],
+            mutation_scale=float(params.get('mutation_scale', 0.1)),
+            keep_elitism=int(params['keep_elitism']),
+            random_seed=self.random_seed if random_seed is None else random_seed,
+            initial_population=initial_population,
+            on_generation=self._on_generation_capture,
+            on_stop=self._on_stop_capture,
+            dtype=self.dtype,
+        )
+        logger_ga.info("setup_ga_instance: Motor NumPy vectorizado configurado.")
+
     def run(self):
         logger_ga.info("run: Iniciando optimización.")
+        # El tiempo incluye la inicialización (la estrategia 'opposition' ya evalúa)
+        self.run_started_at = datetime.datetime.now().isoformat(timespec='seconds')
+        self._run_start = self._last_generation_time = time.perf_counter()
         if self.ga_instance is None:
             self.setup_ga_instance()
-        self.ga_instance.run()
+            if self.adaptive is not None:
+                self.adaptive.apply(self.ga_instance, self.params['range_min'], self.params['range_max'])
+        while True:
+            self.ga_instance.run()
+            if not self._restart_pending:
+                break
+            self._restart_pending = False
+            self._restart()
         return self.ga_instance
 
+    def objective_values(self, fitness):
+        """Convierte fitness interno (todo a maximizar) en el valor real de cada objetivo."""
+        fitness = np.asarray(fitness, dtype=float)
+        if self.multi_objective:
+            return fitness * self._objective_signs
+        return -fitness if self.optimization_type == 'minimize' else fitness
+
+    def warm_start_solutions(self, n):
+        """
+        Las n mejores soluciones distintas evaluadas en esta ejecución (del archivo de
+        evaluaciones, de mejor a peor), como lista para el parámetro 'warm_start' de otra.
+        """
+        if self.archive is None or len(self.archive) == 0:
+            return []
+        values = np.asarray(self.archive.values, dtype=float).reshape(len(self.archive), -1)
+        # objective_values invierte el signo de los objetivos a minimizar: valor real <-> fitness
+        return best_points(self.archive.points, self.objective_values(values), n).tolist()
+
+    def get_pareto_front(self):
+        """
+        Frente de Pareto acumulado como (X (k, genes), F (k, objetivos)) con los valores
+        reales de cada objetivo, ordenado por el primer objetivo. None fuera del modo multiobjetivo.
+        """
+        if self.pareto_archive is None:
+            return None
+        X, F = self.pareto_archive.X, self.objective_values(self.pareto_archive.F)
+        order = np.argsort(F[:, 0], kind='stable') if len(F) else np.arange(0)
+        return X[order], F[order]
+
     def get_best_solution_details(self):
-        if not self.ga_instance or self.ga_instance.best_solution_generation == -1:
+        if self.multi_objective:
+            # Sin un único óptimo: se informa la solución de compromiso del frente de Pareto
+            idx = self.pareto_archive.compromise_index() if self.ga_instance else -1
+            if idx < 0:
+                return None
+            f_values = self.objective_values(self.pareto_archive.F[idx])
+            return {
+                'x_value': self.pareto_archive.X[idx, 0],
+                'f_x_value': f_values[0],
+                'f_values': f_values.tolist(),
+                'internal_fitness': self.pareto_archive.F[idx, 0],
+                'generation': self.generation_number(self.ga_instance),
+                'pareto_size': len(self.pareto_archive)
+            }
+        if self.constraints is not None and self._best_feasible_solution is not None:
+            # Con restricciones se informa el mejor punto factible evaluado (el fitness interno
+            # puede incluir la penalización y favorecer un punto no factible)
+            generation = self._best_feasible_generation
+            return {
+                'x_value': float(self._best_feasible_solution[0]),
+                'f_x_value': self._best_feasible_value,
+                'internal_fitness': float(self._best_feasible_fitness),
+                'generation': generation if generation is not None else
+                              self.generation_number(self.ga_instance) if self.ga_instance else 0,
+                'feasible': True,
+            }
+        # best_solution_generation solo se actualiza al terminar run(): durante la ejecución
+        # basta con que la generación actual tenga fitness
+        if self._best_ever_solution is not None:
+            # Mejor de toda la ejecución: con reinicios puede no estar en la población actual
+            details = {
+                'x_value': float(self._best_ever_solution[0]),
+                'f_x_value': self._best_ever_value,
+                'internal_fitness': float(self._best_ever_fitness),
+                'generation': self._best_ever_generation,
+            }
+            if self.constraints is not None:
+                details['feasible'] = False  # Aún no se ha evaluado ningún punto factible
+            return details
+        if not self.ga_instance or self.ga_instance.last_generation_fitness is None:
             return None
-        sol, fit_int, _ = self.ga_instance.best_solution()
-        fit_act = -fit_int if self.optimization_type == 'minimize' else fit_int
-        return {
+        # Con el fitness ya calculado: sin argumentos, PyGAD vuelve a evaluar toda la población
+        sol, fit_int, _ = self.ga_instance.best_solution(pop_fitness=self.ga_instance.last_generation_fitness)
+        row = self._recent_values.get(np.asarray(sol, dtype=float).tobytes())
+        details = {
             'x_value': sol[0],
-            'f_x_value': fit_act,
+            'f_x_value': float(row[0]) if row is not None else np.nan,
             'internal_fitness': fit_int,
-            'generation': self.ga_instance.best_solution_generation
+            'generation': self.ga_instance.best_solution_generation if self.ga_instance.best_solution_generation != -1
+                          else self.ga_instance.generations_completed
         }
+        if self.constraints is not None:
+            details['feasible'] = False
+        return details
 
 # Fin de genetic_algorithm.py
@@ -0,0 +1,193 @@
+# ag_core/initialization.py
+import numpy as np
+
+from .pareto import nsga2_key
+
+INIT_STRATEGIES = ('random', 'lhs', 'sobol', 'halton', 'opposition')
+RESTART_STRATEGIES = ('none', 'ipop', 'partial', 'reseed')
+
+# Números de dirección de Sobol (Joe y Kuo) para las dimensiones 2..8: (grado s, coeficientes a, m iniciales).
+# La dimensión 1 es la secuencia de van der Corput en base 2.
+_SOBOL_PARAMS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+]
+_SOBOL_BITS = 32
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53)
+
+
+def _sobol_directions(dim):
+    """Números de dirección V (enteros de 32 bits) de la dimensión dim (desde 0)."""
+    bits = _SOBOL_BITS
+    if dim == 0:
+        return np.array([1 << (bits - 1 - k) for k in range(bits)], dtype=np.uint64)
+    s, a, m = _SOBOL_PARAMS[dim - 1]
+    V = [m[k] << (bits - 1 - k) for k in range(s)]
+    for k in range(s, bits):
+        value = V[k - s] ^ (V[k - s] >> s)
+        for j in range(1, s):
+            if (a >> (s - 1 - j)) & 1:
+                value ^= V[k - j]
+        V.append(value)
+    return np.array(V, dtype=np.uint64)
+
+
+def sobol_sequence(n, num_genes, rng):
+    """
+    n puntos de Sobol en [0, 1)^num_genes, aleatorizados con un desplazamiento digital
+    (XOR con un entero aleatorio por dimensión): conserva la baja discrepancia y depende
+    de la semilla. Hasta 8 dimensiones; más allá se usa Halton.
+    """
+    if num_genes > len(_SOBOL_PARAMS) + 1:
+        return halton_sequence(n, num_genes, rng)
+    index = np.arange(n, dtype=np.uint64)
+    points = np.empty((n, num_genes))
+    for dim in range(num_genes):
+        V = _sobol_directions(dim)
+        code = np.zeros(n, dtype=np.uint64)
+        for k in range(_SOBOL_BITS):
+            code ^= np.where((index >> np.uint64(k)) & np.uint64(1), V[k], np.uint64(0))
+        shift = np.uint64(rng.integers(0, 1 << _SOBOL_BITS))
+        points[:, dim] = (code ^ shift).astype(float) / float(1 << _SOBOL_BITS)
+    return points
+
+
+def halton_sequence(n, num_genes, rng):
+    """n puntos de Halton en [0, 1)^num_genes (inverso radical en bases primas) con desplazamiento aleatorio módulo 1."""
+    if num_genes > len(_PRIMES):
+        raise ValueError(f"Halton admite hasta {len(_PRIMES)} genes.")
+    index = np.arange(1, n + 1)
+    points = np.empty((n, num_genes))
+    for dim in range(num_genes):
+        base = _PRIMES[dim]
+        value, factor, i = np.zeros(n), 1.0 / base, index.copy()
+        while i.any():
+            value += factor * (i % base)
+            i //= base
+            factor /= base
+        points[:, dim] = value
+    return (points + rng.random(num_genes)) % 1.0
+
+
+def latin_hypercube(n, num_genes, rng):
+    """Hipercubo latino en [0, 1)^num_genes: un punto por estrato en cada dimensión, con permutaciones independientes."""
+    strata = np.argsort(rng.random((num_genes, n)), axis=1).T  # (n, genes): permutación por dimensión
+    return (strata + rng.random((n, num_genes))) / n
+
+
+def sample_population(strategy, n, low, high, rng):
+    """Muestra n soluciones en [low, high] con 'random', 'lhs', 'sobol' o 'halton'."""
+    low, high = np.atleast_1d(np.asarray(low, dtype=float)), np.atleast_1d(np.asarray(high, dtype=float))
+    num_genes = len(low)
+    if strategy == 'random':
+        unit = rng.random((n, num_genes))
+    elif strategy == 'lhs':
+        unit = latin_hypercube(n, num_genes, rng)
+    elif strategy == 'sobol':
+        unit = sobol_sequence(n, num_genes, rng)
+    elif strategy == 'halton':
+        unit = halton_sequence(n, num_genes, rng)
+    else:
+        raise ValueError(f"Estrategia de muestreo desconocida: '{strategy}' (use random, lhs, sobol o halton).")
+    return low + unit * (high - low)
+
+
+def opposite_points(X, low, high):
+    """Puntos opuestos (aprendizaje por oposición): low + high - x."""
+    return np.asarray(low, dtype=float) + np.asarray(high, dtype=float) - X
+
+
+def best_points(points, fitness, n):
+    """
+    Los n mejores puntos distintos según fitness (a maximizar): una columna, o una fila
+    por punto con varios objetivos (orden de NSGA-II). Los fitness no finitos van al final.
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    fitness = np.asarray(fitness, dtype=float)
+    if fitness.ndim == 2 and fitness.shape[1] > 1:
+        finite = np.isfinite(fitness).all(axis=1)
+        key = np.full(len(points), -np.inf)
+        if finite.any():
+            key[finite] = nsga2_key(fitness[finite])
+    else:
+        key = fitness.reshape(len(points))
+        key = np.where(np.isfinite(key), key, -np.inf)
+    order = np.argsort(-key, kind='stable')
+    _, first = np.unique(points[order], axis=0, return_index=True)  # Sin duplicados (primera aparición = mejor)
+    return points[order[np.sort(first)][:n]]
+
+
+def build_initial_population(strategy, n, low, high, rng, evaluate=None, warm_start=None, warm_start_fraction=0.5):
+    """
+    Población inicial (n, genes):
+    - strategy: 'random', 'lhs', 'sobol', 'halton' u 'opposition' (n puntos aleatorios y
+      sus opuestos; se quedan los n mejores, así que necesita evaluate(X) -> fitness).
+    - warm_start: soluciones de una ejecución anterior (o de un archivo de evaluaciones),
+      ya ordenadas de mejor a peor; ocupan como mucho warm_start_fraction de la población
+      y el resto se muestrea con la estrategia, para no perder diversidad.
+    """
+    if strategy not in INIT_STRATEGIES:
+        raise ValueError(f"Estrategia de inicialización desconocida: '{strategy}' (use {', '.join(INIT_STRATEGIES)}).")
+    low, high = np.atleast_1d(np.asarray(low, dtype=float)), np.atleast_1d(np.asarray(high, dtype=float))
+    seeded = np.empty((0, len(low)))
+    if warm_start is not None and len(warm_start) > 0:
+        seeded = np.asarray(warm_start, dtype=float).reshape(len(warm_start), -1)[:, :len(low)]
+        seeded = np.clip(seeded, low, high)[:int(round(warm_start_fraction * n))]
+    remaining = n - len(seeded)
+    if strategy == 'opposition':
+        if evaluate is None:
+            raise ValueError("La inicialización por oposición necesita una función de evaluación.")
+        candidates = sample_population('random', remaining, low, high, rng)
+        candidates = np.vstack([candidates, opposite_points(candidates, low, high)])
+        sampled = best_points(candidates, evaluate(candidates), remaining)
+        if len(sampled) < remaining:  # Candidatos duplicados (rango degenerado)
+            sampled = np.vstack([sampled, sample_population('random', remaining - len(sampled), low, high, rng)])
+    else:
+        sampled = sample_population(strategy, remaining, low, high, rng)
+    return np.vstack([seeded, sampled])
+
+
+def restart_population(strategy, n, low, high, rng, population=None, fitness=None, best=None,
+                       fraction=0.5, radius=0.1, init_strategy='random', evaluate=None):
+    """
+    Población (n, genes) para reiniciar una ejecución estancada:
+    - 'ipop': población nueva con la estrategia de inicialización (el llamador aumenta n).
+    - 'partial': conserva los mejores individuos distintos de la población actual y
+      re-muestrea una fracción 'fraction' de la población.
+    - 'reseed': el mejor global y muestras gaussianas a su alrededor (desviación 'radius'
+      por el ancho del intervalo), para explorar su entorno con otra población.
+    """
+    if strategy not in RESTART_STRATEGIES or strategy == 'none':
+        raise ValueError(f"Estrategia de reinicio desconocida: '{strategy}' (use {', '.join(RESTART_STRATEGIES[1:])}).")
+    low, high = np.atleast_1d(np.asarray(low, dtype=float)), np.atleast_1d(np.asarray(high, dtype=float))
+    sampler = init_strategy if init_strategy != 'opposition' else 'random'
+    if strategy == 'ipop':
+        return build_initial_population(init_strategy, n, low, high, rng, evaluate=evaluate)
+    if strategy == 'partial':
+        kept = best_points(population, fitness, n - int(round(fraction * n)))
+        return np.vstack([kept, sample_population(sampler, n - len(kept), low, high, rng)])
+    center = np.asarray(best, dtype=float).reshape(1, len(low))
+    around = center + rng.normal(0.0, radius, size=(n - 1, len(low))) * (high - low)
+    return np.vstack([center, np.clip(around, low, high)])
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    n = 64
+    # Cobertura en 1-D: número de celdas de ancho 1/n vacías (0 = cobertura perfecta)
+    for name in ('random', 'lhs', 'sobol', 'halton'):
+        X = sample_population(name, n, [0.0], [1.0], rng)
+        empty = n - len(np.unique(np.floor(X[:, 0] * n)))
+        print(f"{name:>7}: {empty:2d} de {n} celdas vacías")
+    # Sobol en 2-D: con 64 puntos, cada una de las 16 x 4 celdas elementales tiene exactamente uno
+    X = sobol_sequence(64, 2, rng)
+    cells = np.unique(np.floor(X[:, 0] * 16) * 4 + np.floor(X[:, 1] * 4))
+    print(f"Sobol 2-D: {len(cells)} de 64 celdas elementales 16x4 ocupadas")
+    f = lambda X: np.sin(5 * X[:, 0]) * X[:, 0]
+    pop = build_initial_population('opposition', 20, [-3.0], [3.0], rng, evaluate=f)
+    print(f"Oposición: f medio {f(pop).mean():.3f} frente a {f(sample_population('random', 20, [-3.0], [3.0], rng)).mean():.3f} aleatorio")
@@ -0,0 +1,177 @@
+# ag_core/local_search.py
+import numpy as np
+
+# Razón áurea inversa usada por la búsqueda de sección dorada
+_INV_PHI = (np.sqrt(5.0) - 1.0) / 2.0
+
+
+def golden_section_search(func, low, high, tol=1e-10, max_evals=60):
+    """
+    Maximiza una función escalar de una variable en el intervalo [low, high]
+    mediante búsqueda de sección dorada.
+    - func: callable f(x) -> float (se maximiza).
+    - tol: ancho mínimo del intervalo antes de detenerse.
+    - max_evals: número máximo de evaluaciones de func.
+    Devuelve (x_mejor, f_mejor, n_evaluaciones).
+    """
+    a, b = float(low), float(high)
+    c = b - _INV_PHI * (b - a)
+    d = a + _INV_PHI * (b - a)
+    fc, fd = func(c), func(d)
+    n_evals = 2
+
+    while (b - a) > tol and n_evals < max_evals:
+        if fc >= fd:
+            b, d, fd = d, c, fc
+            c = b - _INV_PHI * (b - a)
+            fc = func(c)
+        else:
+            a, c, fc = c, d, fd
+            d = a + _INV_PHI * (b - a)
+            fd = func(d)
+        n_evals += 1
+
+    if fc >= fd:
+        return c, fc, n_evals
+    return d, fd, n_evals
+
+
+def nelder_mead(func, x0, low, high, step=0.05, tol=1e-10, max_evals=200):
+    """
+    Maximiza func(x) con x vectorial usando el simplex de Nelder–Mead.
+    Los vértices se recortan a los límites [low, high] en cada paso.
+    - step: tamaño inicial del simplex relativo al ancho de cada dimensión.
+    Devuelve (x_mejor, f_mejor, n_evaluaciones).
+    """
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    x0 = np.clip(np.asarray(x0, dtype=float), low, high)
+    n = x0.size
+
+    def f_clip(x):
+        return func(np.clip(x, low, high))
+
+    # Simplex inicial: x0 más un desplazamiento por dimensión
+    simplex = np.tile(x0, (n + 1, 1))
+    deltas = step * (high - low)
+    for i in range(n):
+        simplex[i + 1, i] += deltas[i] if x0[i] + deltas[i] <= high[i] else -deltas[i]
+    values = np.array([f_clip(v) for v in simplex])
+    n_evals = n + 1
+
+    while n_evals < max_evals:
+        order = np.argsort(-values)  # Mejor primero (maximización)
+        simplex, values = simplex[order], values[order]
+        if abs(values[0] - values[-1]) <= tol and np.max(np.abs(simplex[1:] - simplex[0])) <= tol:
+            break
+
+        centroid = simplex[:-1].mean(axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_r = f_clip(reflected); n_evals += 1
+
+        if f_r > values[0]:
+            expanded = centroid + 2.0 * (centroid - simplex[-1])
+            f_e = f_clip(expanded); n_evals += 1
+            if f_e > f_r:
+                simplex[-1], values[-1] = expanded, f_e
+            else:
+                simplex[-1], values[-1] = reflected, f_r
+        elif f_r > values[-2]:
+            simplex[-1], values[-1] = reflected, f_r
+        else:
+            contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            f_c = f_clip(contracted); n_evals += 1
+            if f_c > values[-1]:
+                simplex[-1], values[-1] = contracted, f_c
+            else:
+                # Encoger todo el simplex hacia el mejor vértice
+                simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+                values[1:] = [f_clip(v) for v in simplex[1:]]
+                n_evals += n
+
+    best = int(np.argmax(values))
+    return np.clip(simplex[best], low, high), values[best], n_evals
+
+
+def gradient_ascent(func, grad, x0, low, high, step=0.05, tol=1e-10, max_evals=50, f0=None):
+    """
+    Ascenso por gradiente proyectado con búsqueda de paso por retroceso (Armijo).
+    - grad: callable grad(x) -> np.ndarray (gradiente analítico). Si devuelve None
+      o valores no finitos, la búsqueda se detiene.
+    - step: paso inicial relativo al ancho máximo del dominio.
+    - f0: func(x0) si ya se conoce (x0 dentro de [low, high]); evita evaluarlo otra vez.
+    Cada llamada a func o grad cuenta como una evaluación.
+    Devuelve (x_mejor, f_mejor, n_evaluaciones).
+    """
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    x = np.clip(np.asarray(x0, dtype=float), low, high)
+    if f0 is None:
+        f_x, n_evals = func(x), 1
+    else:
+        f_x, n_evals = f0, 0
+    alpha = step * float(np.max(high - low))
+
+    while n_evals < max_evals and alpha > tol:
+        g = grad(x)
+        n_evals += 1
+        if g is None or not np.all(np.isfinite(g)):
+            break
+        g_norm = float(np.linalg.norm(g))
+        if g_norm <= tol:
+            break
+
+        direction = g / g_norm
+        improved = False
+        while n_evals < max_evals and alpha > tol:
+            x_try = np.clip(x + alpha * direction, low, high)
+            f_try = func(x_try)
+            n_evals += 1
+            # Condición de incremento suficiente sobre el desplazamiento proyectado
+            if f_try > f_x + 1e-4 * float(np.dot(g, x_try - x)):
+                x, f_x = x_try, f_try
+                alpha *= 2.0  # Paso aceptado: probar uno más largo en la siguiente iteración
+                improved = True
+                break
+            alpha *= 0.5
+        if not improved:
+            break
+
+    return x, f_x, n_evals
+
+
+def refine_solution(func, x0, low, high, radius=0.05, tol=1e-10, max_evals=50, grad=None):
+    """
+    Refina localmente una solución x0 maximizando func.
+    Si se proporciona 'grad' (gradiente analítico) usa ascenso por gradiente proyectado;
+    si no, sección dorada en 1-D (sobre una vecindad de ancho 'radius' relativo al rango)
+    y Nelder–Mead en N-D. Nunca devuelve una solución peor que x0.
+    Devuelve (x_refinado, f_refinado, n_evaluaciones).
+    """
+    low = np.atleast_1d(np.asarray(low, dtype=float))
+    high = np.atleast_1d(np.asarray(high, dtype=float))
+    x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    f0 = func(x0)
+    n_evals = 1
+
+    if grad is not None:
+        x_new, f_new, used = gradient_ascent(
+            func, grad, x0, low, high, step=radius, tol=tol, max_evals=max_evals - 1, f0=f0
+        )
+    elif x0.size == 1:
+        half_width = radius * (high[0] - low[0])
+        a = max(low[0], x0[0] - half_width)
+        b = min(high[0], x0[0] + half_width)
+        x_new, f_new, used = golden_section_search(
+            lambda v: func(np.array([v])), a, b, tol=tol, max_evals=max_evals - 1
+        )
+        x_new = np.array([x_new])
+    else:
+        x_new, f_new, used = nelder_mead(
+            func, x0, low, high, step=radius, tol=tol, max_evals=max_evals - 1
+        )
+    n_evals += used
+
+    if f_new > f0:
+        return x_new, f_new, n_evals
+    return x0, f0, n_evals
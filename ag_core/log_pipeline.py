@@ -0,0 +1,193 @@
+# ag_core/log_pipeline.py
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+import time
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(processName)s/%(threadName)s - %(message)s'
+
+_pipeline = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limita los mensajes repetidos por punto de llamada (logger, nivel, archivo y línea):
+    deja pasar 'burst' registros por ventana de 'interval' segundos y descarta el resto,
+    contándolos. El primer registro que pasa en la ventana siguiente lleva el resumen
+    "(+N similares suprimidos)". Así un aviso por individuo penalizado no cuesta una
+    escritura por individuo.
+    Si el punto de llamada no vuelve a registrar nada, el resumen se emite aparte con
+    'emit' (el emit del manejador): cuando pasa cualquier otro registro con la ventana ya
+    expirada, y en flush() (al detener el pipeline y al terminar un proceso hijo).
+    """
+    def __init__(self, burst=5, interval=5.0, emit=None):
+        super().__init__()
+        self.burst = int(burst)
+        self.interval = float(interval)
+        self.emit = emit
+        self._windows = {}  # clave -> [inicio de la ventana, emitidos, suprimidos, último suprimido]
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _summary(self, record, suppressed):
+        summary = logging.makeLogRecord(record.__dict__)
+        summary.msg = f"{record.getMessage()} (+{suppressed} similares suprimidos en {self.interval:g} s)"
+        summary.args = None
+        return summary
+
+    def _pending_summaries(self, now, force=False):
+        """Resúmenes de las ventanas expiradas (o de todas con force) con registros suprimidos."""
+        summaries = []
+        for key, window in list(self._windows.items()):
+            if not window[2] or not (force or now - window[0] >= self.interval):
+                continue
+            summaries.append(self._summary(window[3], window[2]))
+            if now - window[0] >= self.interval:
+                del self._windows[key]
+            else:
+                window[2], window[3] = 0, None
+        return summaries
+
+    def filter(self, record):
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window is not None else 0
+                self._windows[key] = [now, 1, 0, None]
+                if suppressed:
+                    record.msg = f"{record.getMessage()} (+{suppressed} similares suprimidos en {self.interval:g} s)"
+                    record.args = None
+                allowed = True
+            elif window[1] < self.burst:
+                window[1] += 1
+                allowed = True
+            else:
+                window[2] += 1
+                window[3] = record
+                allowed = False
+            pending = []
+            if self.emit is not None and now - self._last_sweep >= self.interval:
+                self._last_sweep = now
+                pending = self._pending_summaries(now)
+        for summary in pending:
+            self.emit(summary)
+        return allowed
+
+    def flush(self):
+        """Emite ya los resúmenes pendientes de todas las ventanas (p. ej. al terminar)."""
+        with self._lock:
+            pending = self._pending_summaries(time.monotonic(), force=True) if self.emit is not None else []
+        for summary in pending:
+            self.emit(summary)
+
+
+class LogPipeline:
+    """
+    Logging asíncrono: los hilos (y procesos hijo) solo encolan registros con un
+    QueueHandler; un QueueListener en su propio hilo los escribe en el archivo y en la
+    consola. El nivel se cambia en caliente con set_level. La cola es de multiprocessing
+    para que los procesos del AG (ag_core.process_runner) envíen sus registros a la misma.
+    """
+    def __init__(self, log_file=None, level=logging.INFO, stream=None, burst=5, interval=5.0, file_mode='w'):
+        self.queue = multiprocessing.get_context('spawn').Queue(-1)
+        self.rate_limit = (burst, interval)
+        formatter = logging.Formatter(LOG_FORMAT)
+        self.handlers = []
+        if log_file:
+            self.handlers.append(logging.FileHandler(log_file, mode=file_mode, encoding='utf-8'))
+        if stream is not None:
+            self.handlers.append(logging.StreamHandler(stream))
+        for handler in self.handlers:
+            handler.setFormatter(formatter)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.set_level(level)
+
+    def start(self):
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(make_queue_handler(self.queue, *self.rate_limit))
+        self.listener.start()
+        return self
+
+    def set_level(self, level):
+        """
+        Nivel en caliente. Se aplica también a los manejadores del listener, así que subir
+        el umbral afecta ya a los registros de los procesos hijo en curso (que filtran con
+        el nivel que tenían al arrancar).
+        """
+        level = logging.getLevelName(level) if isinstance(level, str) else int(level)
+        logging.getLogger().setLevel(level)
+        for handler in self.handlers:
+            handler.setLevel(level)
+
+    @property
+    def level(self):
+        return logging.getLogger().level
+
+    def stop(self):
+        """Vacía la cola y detiene el listener (llamar al salir)."""
+        flush_rate_limited()  # Los resúmenes de las ráfagas finales no esperan a otro registro
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        self.queue.close()
+
+
+def make_queue_handler(log_queue, burst=5, interval=5.0):
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(burst, interval, emit=handler.emit))
+    return handler
+
+
+def flush_rate_limited():
+    """Emite los resúmenes pendientes de los filtros RateLimitFilter del logger raíz."""
+    for handler in logging.getLogger().handlers:
+        for log_filter in handler.filters:
+            if isinstance(log_filter, RateLimitFilter):
+                log_filter.flush()
+
+
+def setup_logging(log_file=None, level=logging.INFO, stream=None, **kwargs):
+    """Configura y arranca el LogPipeline del proceso (sustituye a logging.basicConfig)."""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(log_file, level, stream, **kwargs).start()
+    return _pipeline
+
+
+def get_pipeline():
+    return _pipeline
+
+
+def configure_child_logging(log_queue, level):
+    """En un proceso hijo: envía sus registros a la cola del padre (con el mismo límite de repetición)."""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(make_queue_handler(log_queue))
+    root.setLevel(level)
+
+
+if __name__ == '__main__':
+    import sys
+
+    pipeline = setup_logging(level=logging.INFO, stream=sys.stdout, burst=3, interval=0.5)
+    demo_logger = logging.getLogger("demo")
+    for burst_round in range(2):
+        start = time.perf_counter()
+        for i in range(100000):
+            demo_logger.warning(f"Solución {i} penalizada")
+        print(f"100000 avisos repetidos procesados en {time.perf_counter() - start:.2f} s (3 escritos por ventana)")
+        time.sleep(0.6)  # El primero de la ronda siguiente lleva el resumen de los suprimidos
+    pipeline.set_level(logging.ERROR)
+    demo_logger.warning("No se muestra: nivel ERROR")
+    time.sleep(0.1)
+    pipeline.set_level(logging.INFO)
+    for i in range(10):
+        demo_logger.warning(f"Ráfaga final {i}")  # Sin registros después: el resumen lo emite stop()
+    pipeline.stop()
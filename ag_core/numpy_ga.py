@@ -0,0 +1,248 @@
+# ag_core/numpy_ga.py
+import numpy as np
+
+from .pareto import nsga2_key
+
+
+class NumpyGA:
+    """
+    Motor de AG en NumPy puro para problemas de genes reales acotados.
+    La población es un único array contiguo (pop_size, num_genes) y todos los
+    operadores (selección, cruce, mutación, elitismo) están vectorizados: no hay
+    bucles de Python por individuo.
+
+    Expone el subconjunto de la interfaz de pygad.GA que usa el resto de la aplicación
+    (population, last_generation_fitness, previous_generation_fitness,
+    last_generation_parents_indices, generations_completed, best_solution(),
+    best_solution_generation, best_solutions_fitness, cal_pop_fitness(), run(),
+    callbacks on_generation/on_stop), de modo que GeneticOptimizer puede usar
+    cualquiera de los dos motores con los mismos callbacks.
+
+    fitness_func tiene la firma por lotes de PyGAD: fitness_func(ga, soluciones, indices)
+    y devuelve una secuencia con el fitness (a maximizar) de cada solución. Si devuelve
+    una fila por solución (varios objetivos), la selección y el elitismo usan el orden
+    de NSGA-II (frente no dominado y distancia de apiñamiento).
+
+    dtype (float64 por defecto o float32) es el tipo de la población, del fitness y de
+    los números aleatorios de los operadores: con float32 se mueve la mitad de memoria por
+    generación. fitness_func recibe la población tal cual y la evalúa con su propio tipo.
+    """
+    SELECTION_TYPES = ('sss', 'rws', 'sus', 'random', 'tournament', 'rank')
+    CROSSOVER_TYPES = ('single_point', 'two_points', 'uniform', 'scattered', 'blend', 'sbx')
+    MUTATION_TYPES = ('gaussian', 'polynomial', 'random')
+
+    def __init__(self, num_generations, sol_per_pop, num_genes, low, high, fitness_func,
+                 parent_selection_type='tournament', crossover_type='sbx', crossover_probability=0.8,
+                 mutation_type='gaussian', mutation_probability=0.1, mutation_scale=0.1,
+                 keep_elitism=1, K_tournament=3, random_seed=None, initial_population=None,
+                 on_generation=None, on_stop=None, dtype=float):
+        if parent_selection_type not in self.SELECTION_TYPES:
+            raise ValueError(f"Tipo de selección no soportado por el motor NumPy: '{parent_selection_type}'.")
+        if crossover_type not in self.CROSSOVER_TYPES:
+            raise ValueError(f"Tipo de cruce no soportado por el motor NumPy: '{crossover_type}'.")
+        if mutation_type not in self.MUTATION_TYPES:
+            raise ValueError(f"Tipo de mutación no soportado por el motor NumPy: '{mutation_type}'.")
+        if not (0 <= keep_elitism < sol_per_pop):
+            raise ValueError("keep_elitism debe ser >= 0 y menor que sol_per_pop.")
+
+        self.num_generations = int(num_generations)
+        self.sol_per_pop = int(sol_per_pop)
+        self.num_genes = int(num_genes)
+        self.dtype = np.dtype(dtype)
+        self.low = np.broadcast_to(np.asarray(low, dtype=self.dtype), (self.num_genes,)).copy()
+        self.high = np.broadcast_to(np.asarray(high, dtype=self.dtype), (self.num_genes,)).copy()
+        self.fitness_func = fitness_func
+        self.parent_selection_type = parent_selection_type
+        self.crossover_type = crossover_type
+        self.crossover_probability = float(crossover_probability)
+        self.mutation_type = mutation_type
+        self.mutation_probability = float(mutation_probability)
+        self.mutation_scale = float(mutation_scale)
+        self.keep_elitism = int(keep_elitism)
+        self.K_tournament = int(K_tournament)
+        self.random_seed = random_seed
+        self.on_generation = on_generation
+        self.on_stop = on_stop
+        self.rng = np.random.default_rng(random_seed)
+
+        if initial_population is not None:
+            self.population = np.clip(np.asarray(initial_population, dtype=self.dtype), self.low, self.high)
+            self.sol_per_pop = len(self.population)
+        else:
+            self.population = self._uniform(self.low, self.high, (self.sol_per_pop, self.num_genes))
+        self.initial_population = self.population.copy()
+
+        self.generations_completed = 0
+        self.last_generation_fitness = None
+        self.previous_generation_fitness = None
+        self.last_generation_parents_indices = None
+        self.best_solutions_fitness = []
+        self.best_solution_generation = -1
+        self._best_fitness_ever = -np.inf
+        self.run_completed = False
+
+    # --- Evaluación ---
+
+    def _evaluate(self, solutions, indices):
+        return np.asarray(self.fitness_func(self, solutions, indices), dtype=self.dtype)
+
+    def _uniform(self, low, high, shape):
+        """Uniforme en [low, high) generada directamente en self.dtype (rng.uniform solo da float64)."""
+        return low + self.rng.random(shape, dtype=self.dtype) * (high - low)
+
+    def cal_pop_fitness(self):
+        return self._evaluate(self.population, list(range(len(self.population))))
+
+    @staticmethod
+    def _ranking_fitness(fitness):
+        """Fitness escalar para ordenar: el propio fitness o, con varios objetivos, la clave NSGA-II."""
+        fitness = np.asarray(fitness, dtype=float)
+        return nsga2_key(fitness) if fitness.ndim == 2 else fitness
+
+    def best_solution(self, pop_fitness=None):
+        if pop_fitness is None:
+            pop_fitness = self.last_generation_fitness if self.last_generation_fitness is not None else self.cal_pop_fitness()
+        best_idx = int(np.argmax(self._ranking_fitness(pop_fitness)))
+        return self.population[best_idx].copy(), pop_fitness[best_idx], best_idx
+
+    # --- Selección de padres (devuelve índices) ---
+
+    def _select_parents(self, fitness, n):
+        pop_size = len(fitness)
+        finite = np.isfinite(fitness)
+        kind = self.parent_selection_type
+
+        if kind == 'tournament':
+            contenders = self.rng.integers(0, pop_size, size=(n, self.K_tournament))
+            winners = np.argmax(np.where(finite, fitness, -np.inf)[contenders], axis=1)
+            return contenders[np.arange(n), winners]
+        if kind == 'random':
+            return self.rng.integers(0, pop_size, size=n)
+        if kind == 'sss':
+            # Estado estacionario: los mejores, repetidos cíclicamente si hacen falta más
+            order = np.argsort(-np.where(finite, fitness, -np.inf), kind='stable')
+            return np.resize(order, n)
+
+        if kind == 'rank':
+            weights = np.empty(pop_size)
+            weights[np.argsort(np.where(finite, fitness, -np.inf), kind='stable')] = np.arange(1, pop_size + 1)
+            weights[~finite] = 0.0
+        else:  # 'rws' y 'sus': proporcional al fitness desplazado a valores >= 0
+            weights = np.zeros(pop_size)
+            if finite.any():
+                shifted = fitness[finite] - fitness[finite].min()
+                weights[finite] = shifted + 1e-12 * (1.0 + np.abs(fitness[finite]).max())
+        total = weights.sum()
+        probs = weights / total if total > 0 else np.full(pop_size, 1.0 / pop_size)
+
+        if kind == 'sus':
+            cumulative = np.cumsum(probs)
+            cumulative[-1] = 1.0
+            pointers = self.rng.uniform(0, 1.0 / n) + np.arange(n) / n
+            return np.searchsorted(cumulative, pointers)
+        return self.rng.choice(pop_size, size=n, p=probs)
+
+    # --- Cruce ---
+
+    def _crossover(self, p1, p2):
+        n_pairs, n_genes = p1.shape
+        kind = self.crossover_type
+
+        if kind in ('single_point', 'two_points'):
+            genes = np.arange(n_genes)
+            if kind == 'single_point':
+                cut = self.rng.integers(1, max(n_genes, 2), size=(n_pairs, 1))
+                mask = genes < cut
+            else:
+                cuts = np.sort(self.rng.integers(0, n_genes + 1, size=(n_pairs, 2)), axis=1)
+                mask = (genes < cuts[:, :1]) | (genes >= cuts[:, 1:])
+            c1, c2 = np.where(mask, p1, p2), np.where(mask, p2, p1)
+        elif kind in ('uniform', 'scattered'):
+            mask = self.rng.random((n_pairs, n_genes), dtype=self.dtype) < 0.5
+            c1, c2 = np.where(mask, p1, p2), np.where(mask, p2, p1)
+        elif kind == 'blend':
+            # BLX-alpha con alpha = 0.5
+            lo, hi = np.minimum(p1, p2), np.maximum(p1, p2)
+            span = 0.5 * (hi - lo)
+            c1 = self._uniform(lo - span, hi + span, lo.shape)
+            c2 = self._uniform(lo - span, hi + span, lo.shape)
+        else:  # 'sbx' (Simulated Binary Crossover), eta = 15
+            eta = 15.0
+            u = self.rng.random((n_pairs, n_genes), dtype=self.dtype)
+            beta = np.where(u <= 0.5, (2.0 * u) ** (1.0 / (eta + 1.0)),
+                            (1.0 / (2.0 * (1.0 - u))) ** (1.0 / (eta + 1.0)))
+            c1 = 0.5 * ((1.0 + beta) * p1 + (1.0 - beta) * p2)
+            c2 = 0.5 * ((1.0 - beta) * p1 + (1.0 + beta) * p2)
+
+        # Solo las parejas seleccionadas con crossover_probability se cruzan
+        crossed = (self.rng.random(n_pairs) < self.crossover_probability)[:, None]
+        return np.concatenate([np.where(crossed, c1, p1), np.where(crossed, c2, p2)])
+
+    # --- Mutación ---
+
+    def _mutate(self, offspring):
+        mask = self.rng.random(offspring.shape, dtype=self.dtype) < self.mutation_probability
+        width = self.high - self.low
+        if self.mutation_type == 'gaussian':
+            mutated = offspring + self.rng.standard_normal(offspring.shape, dtype=self.dtype) * self.mutation_scale * width
+        elif self.mutation_type == 'random':
+            mutated = self._uniform(self.low, self.high, offspring.shape)
+        else:  # 'polynomial', eta_m = 20
+            eta = 20.0
+            u = self.rng.random(offspring.shape, dtype=self.dtype)
+            delta = np.where(u < 0.5, (2.0 * u) ** (1.0 / (eta + 1.0)) - 1.0,
+                             1.0 - (2.0 * (1.0 - u)) ** (1.0 / (eta + 1.0)))
+            mutated = offspring + delta * width
+        return np.clip(np.where(mask, mutated, offspring), self.low, self.high)
+
+    # --- Ciclo principal ---
+
+    def _track_best(self, fitness):
+        if fitness.ndim == 2:
+            # Varios objetivos: no hay un único mejor; se registra el de mejor clave NSGA-II
+            self.best_solutions_fitness.append(fitness[np.argmax(nsga2_key(fitness))].tolist())
+            self.best_solution_generation = self.generations_completed
+            return
+        best_fit = float(np.max(fitness))
+        self.best_solutions_fitness.append(best_fit)
+        if best_fit > self._best_fitness_ever:
+            self._best_fitness_ever = best_fit
+            self.best_solution_generation = self.generations_completed
+
+    def run(self):
+        if self.last_generation_fitness is None:
+            self.last_generation_fitness = self.cal_pop_fitness()
+            self._track_best(self.last_generation_fitness)
+
+        n_offspring = self.sol_per_pop - self.keep_elitism
+        n_pairs = (n_offspring + 1) // 2
+
+        for _ in range(self.num_generations):
+            fitness = self.last_generation_fitness
+            ranking = self._ranking_fitness(fitness)
+            order = np.argsort(-np.where(np.isfinite(ranking), ranking, -np.inf), kind='stable')
+            elite_idx = order[:self.keep_elitism]
+
+            self.last_generation_parents_indices = self._select_parents(ranking, 2 * n_pairs)
+            parents = self.population[self.last_generation_parents_indices]
+            offspring = self._crossover(parents[0::2], parents[1::2])[:n_offspring]
+            offspring = self._mutate(offspring)
+
+            # Las élites conservan su fitness; solo se evalúa la descendencia. La población se
+            # asigna antes de evaluar para que fitness_func pueda modificarla (p. ej. reparación)
+            self.population = np.concatenate([self.population[elite_idx], offspring])
+            offspring_fitness = self._evaluate(self.population[self.keep_elitism:],
+                                               list(range(self.keep_elitism, self.sol_per_pop)))
+            self.previous_generation_fitness = fitness
+            self.last_generation_fitness = np.concatenate([fitness[elite_idx], offspring_fitness])
+            self.generations_completed += 1
+            self._track_best(self.last_generation_fitness)
+
+            if self.on_generation is not None:
+                result = self.on_generation(self)
+                if isinstance(result, str) and result.lower() == "stop":
+                    break
+
+        self.run_completed = True
+        if self.on_stop is not None:
+            self.on_stop(self, self.last_generation_fitness)
@@ -0,0 +1,226 @@
+# ag_core/parallel_evaluator.py
+import logging
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .evaluators import Evaluator
+
+logger_par = logging.getLogger(f"{__name__}")
+
+
+class SharedArray:
+    """
+    Array de NumPy sobre un bloque de multiprocessing.shared_memory. Entre procesos solo
+    viaja spec (nombre, forma, dtype): cada proceso se adjunta al bloque y lee o escribe
+    en sitio, sin serializar los datos.
+    """
+    def __init__(self, shape, dtype=float, name=None):
+        self.shape = tuple(int(s) for s in shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(create=True, size=size) if self._owner else \
+            shared_memory.SharedMemory(name=name)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    @property
+    def spec(self):
+        return self._shm.name, self.shape, self.dtype.str
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self):
+        self.array = None  # Soltar la vista antes de cerrar el buffer
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _pool_worker(func_strs, use_compiled, tasks, done):
+    """
+    Proceso de evaluación: recibe (lote, spec de X, spec de valores, inicio, fin), evalúa
+    X[inicio:fin] y escribe los valores en sitio. Responde (lote, inicio, fin, error o None).
+    """
+    from .evaluators import ExpressionEvaluator, MultiObjectiveEvaluator  # Importación en el hijo ('spawn')
+
+    logging.getLogger('ag_core').setLevel(logging.ERROR)  # Los avisos por punto ya los resume el padre
+    if len(func_strs) > 1:
+        evaluator = MultiObjectiveEvaluator([ExpressionEvaluator(f, use_compiled=use_compiled) for f in func_strs])
+    else:
+        evaluator = ExpressionEvaluator(func_strs[0], use_compiled=use_compiled)
+    parent = multiprocessing.parent_process()
+    buffers, buffers_key = None, None
+    while True:
+        try:
+            task = tasks.get(timeout=1.0)
+        except queue.Empty:
+            if parent is not None and not parent.is_alive():
+                break  # El proceso del AG murió sin cerrar el pool
+            continue
+        if task is None:
+            break
+        batch, x_spec, y_spec, start, stop = task
+        error = None
+        try:
+            if buffers_key != (x_spec[0], y_spec[0]):
+                # Buffers nuevos (el padre los hizo crecer): soltar los anteriores
+                for shared in buffers or ():
+                    shared.close()
+                buffers, buffers_key = (SharedArray.attach(x_spec), SharedArray.attach(y_spec)), (x_spec[0], y_spec[0])
+            X, Y = buffers
+            values = np.asarray(evaluator.evaluate(X.array[start:stop]), dtype=float)
+            Y.array[start:stop] = values.reshape(Y.array[start:stop].shape)
+        except Exception as e:
+            error = str(e)
+        done.put((batch, start, stop, error))
+    for shared in buffers or ():
+        shared.close()
+
+
+class ProcessPoolEvaluator(Evaluator):
+    """
+    Evalúa las expresiones objetivo en 'workers' procesos. La población y los valores viven
+    en memoria compartida (SharedArray): por la cola solo viajan el número de lote y los
+    índices de cada tramo, así que el coste de reparto no depende del tamaño de la población
+    ni del número de genes. Los buffers crecen (duplicándose) si llega un lote mayor.
+    - timeout: segundos por lote (None = sin límite). Si expira, o si muere un worker, los
+      tramos pendientes se penalizan (NaN) y el pool se reinicia con colas y buffers nuevos:
+      ningún worker del lote expirado puede escribir en los valores del siguiente.
+    """
+    def __init__(self, func_strs, workers, use_compiled=True, chunks_per_worker=2, timeout=None):
+        self.func_strs = list(func_strs)
+        self.num_objectives = len(self.func_strs)
+        self.workers = int(workers)
+        self.use_compiled = use_compiled
+        self.chunks_per_worker = int(chunks_per_worker)
+        self.timeout = float(timeout) if timeout is not None else None
+        self.restarts = 0
+        self._processes = []
+        self._X = None
+        self._Y = None
+        self._batch = 0
+        self._start_workers()
+        logger_par.info(f"ProcessPoolEvaluator: {self.workers} procesos de evaluación con memoria compartida.")
+
+    def _start_workers(self):
+        ctx = multiprocessing.get_context('spawn')
+        self._tasks = ctx.Queue()
+        self._done = ctx.Queue()
+        self._processes = [
+            ctx.Process(target=_pool_worker, args=(self.func_strs, self.use_compiled, self._tasks, self._done),
+                        name=f"EvalWorker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def _restart_workers(self):
+        """
+        Termina los workers (con los tramos que aún evalúan), descarta las colas con las tareas
+        pendientes y libera los buffers compartidos: el lote siguiente empieza desde cero.
+        """
+        for process in self._processes:
+            process.terminate()
+        for process in self._processes:
+            process.join(timeout=2.0)
+        for q in (self._tasks, self._done):
+            q.cancel_join_thread()
+            q.close()
+        for shared in (self._X, self._Y):
+            if shared is not None:
+                shared.close()
+        self._X = self._Y = None
+        self.restarts += 1
+        self._start_workers()
+
+    def _ensure_capacity(self, n, num_genes):
+        if self._X is not None and self._X.shape[0] >= n and self._X.shape[1] == num_genes:
+            return
+        capacity = max(n, 2 * self._X.shape[0] if self._X is not None else n)
+        for shared in (self._X, self._Y):
+            if shared is not None:
+                shared.close()  # unlink: el bloque se libera cuando los workers también lo suelten
+        self._X = SharedArray((capacity, num_genes))
+        self._Y = SharedArray((capacity,) if self.num_objectives == 1 else (capacity, self.num_objectives))
+        logger_par.debug(f"ProcessPoolEvaluator: Buffers compartidos para {capacity} soluciones x {num_genes} genes.")
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        n = len(solutions)
+        if n == 0:
+            return np.empty((0,) if self.num_objectives == 1 else (0, self.num_objectives))
+        self._ensure_capacity(n, solutions.shape[1])
+        self._batch += 1
+        self._X.array[:n] = solutions
+        self._Y.array[:n] = np.nan  # Los tramos que fallen o no lleguen quedan como NaN (penalizados)
+
+        bounds = np.linspace(0, n, min(n, self.workers * self.chunks_per_worker) + 1).astype(int)
+        x_spec, y_spec = self._X.spec, self._Y.spec
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            self._tasks.put((self._batch, x_spec, y_spec, int(start), int(stop)))
+
+        pending = len(bounds) - 1
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        while pending:
+            # Espera por tramos de 1 s como máximo para detectar workers muertos (sin límite de tiempo
+            # un worker que muere con su tramo bloquearía el lote para siempre)
+            wait = 1.0 if deadline is None else min(max(deadline - time.monotonic(), 0.0), 1.0)
+            try:
+                batch, start, stop, error = self._done.get(timeout=wait)
+            except queue.Empty:
+                expired = deadline is not None and time.monotonic() >= deadline
+                dead = [p.name for p in self._processes if not p.is_alive()]
+                if not expired and not dead:
+                    continue
+                reason = f"tras {self.timeout:g} s" if expired else f"al morir {', '.join(dead)}"
+                logger_par.error(f"ProcessPoolEvaluator: {pending} tramos sin respuesta {reason}; "
+                                 f"se penalizan como fallidos y se reinician los workers.")
+                values = self._Y.array[:n].copy()
+                self._restart_workers()
+                return values
+            if batch != self._batch:
+                continue  # Respuesta de un lote anterior (no debería ocurrir: el pool se reinicia al expirar)
+            pending -= 1
+            if error is not None:
+                logger_par.warning(f"ProcessPoolEvaluator: Fallo al evaluar las soluciones {start}-{stop}: {error}")
+        return self._Y.array[:n].copy()
+
+    def close(self):
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        for shared in (self._X, self._Y):
+            if shared is not None:
+                shared.close()
+        self._X = self._Y = None
+
+
+if __name__ == '__main__':
+    from .evaluators import ExpressionEvaluator
+
+    logging.basicConfig(level=logging.WARNING)
+    # Expresión no compilable (comprensión de lista): el intérprete seguro punto a punto es
+    # el caso que se beneficia de repartir el lote entre procesos
+    func_str = "sum([sin(k * x) / k for k in range(1, 40)])"
+    X = np.random.default_rng(0).uniform(-5, 5, size=(4000, 1))
+    start = time.perf_counter()
+    serial = ExpressionEvaluator(func_str).evaluate(X)
+    print(f"Serie: {time.perf_counter() - start:.2f} s")
+    pool = ProcessPoolEvaluator([func_str], workers=4)
+    try:
+        pool.evaluate(X[:8])  # Calentamiento: arranque de los workers
+        start = time.perf_counter()
+        parallel = pool.evaluate(X)
+        print(f"4 procesos: {time.perf_counter() - start:.2f} s; mismos valores: {np.allclose(serial, parallel, equal_nan=True)}")
+    finally:
+        pool.close()
@@ -0,0 +1,155 @@
+# ag_core/pareto.py
+import numpy as np
+
+# Filas de la matriz de dominancia que se comparan a la vez (acota la memoria temporal
+# a dos matrices booleanas de chunk * n)
+_DOMINANCE_CHUNK = 256
+
+
+def _clean(F):
+    """Matriz (n, m) de objetivos a maximizar; NaN se trata como -inf (peor posible)."""
+    F = np.asarray(F, dtype=float)
+    if F.ndim == 1:
+        F = F[:, None]
+    return np.where(np.isnan(F), -np.inf, F)
+
+
+def _dominated_counts(F_dominators, F_targets):
+    """Para cada fila de F_targets, cuántas filas de F_dominators la dominan (maximizando)."""
+    counts = np.zeros(len(F_targets), dtype=np.int64)
+    for start in range(0, len(F_dominators), _DOMINANCE_CHUNK):
+        A = F_dominators[start:start + _DOMINANCE_CHUNK]
+        # Un objetivo cada vez: matrices 2-D contiguas (mucho más rápido que reducir un eje 3-D)
+        no_worse = np.ones((len(A), len(F_targets)), dtype=bool)
+        better = np.zeros_like(no_worse)
+        for k in range(F_targets.shape[1]):
+            a, b = A[:, k, None], F_targets[None, :, k]
+            no_worse &= a >= b
+            better |= a > b
+        counts += (no_worse & better).sum(axis=0)
+    return counts
+
+
+def non_dominated_sort(F):
+    """
+    Ordenación no dominada de NSGA-II, vectorizada sobre NumPy (todos los objetivos se
+    maximizan). Devuelve un array (n,) con el índice de frente de cada solución (0 = frente
+    de Pareto). Solo hay un bucle de Python por frente; las comparaciones se hacen por
+    bloques de filas, así que la memoria es O(n) y escala a poblaciones de miles.
+    """
+    F = _clean(F)
+    n = len(F)
+    ranks = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return ranks
+    counts = _dominated_counts(F, F)
+    remaining = np.ones(n, dtype=bool)
+    rank = 0
+    while remaining.any():
+        front = remaining & (counts == 0)
+        ranks[front] = rank
+        remaining &= ~front
+        if remaining.any():
+            # Quitar la dominancia que ejercía el frente recién asignado
+            rest = np.flatnonzero(remaining)
+            counts[rest] -= _dominated_counts(F[front], F[rest])
+        rank += 1
+    return ranks
+
+
+def crowding_distance(F, ranks=None):
+    """
+    Distancia de apiñamiento de NSGA-II de cada solución dentro de su frente.
+    Vectorizada: un único ordenamiento (frente, valor) por objetivo. Los extremos de cada
+    frente reciben distancia infinita.
+    """
+    F = _clean(F)
+    n, m = F.shape
+    if ranks is None:
+        ranks = non_dominated_sort(F)
+    distance = np.zeros(n)
+    if n == 0:
+        return distance
+    for k in range(m):
+        order = np.lexsort((F[:, k], ranks))
+        r, v = ranks[order], F[order, k]
+        first = np.r_[True, r[1:] != r[:-1]]
+        last = np.r_[r[1:] != r[:-1], True]
+        # Rango del objetivo k dentro de cada frente
+        front_ids = np.cumsum(first) - 1
+        span = (v[last] - v[first])[front_ids]
+        prev_v, next_v = np.r_[v[0], v[:-1]], np.r_[v[1:], v[-1]]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            contrib = np.where(span > 0, (next_v - prev_v) / span, 0.0)
+        contrib = np.where(np.isfinite(contrib), contrib, 0.0)
+        contrib[first | last] = np.inf
+        distance[order] += contrib
+    return distance
+
+
+def nsga2_key(F):
+    """
+    Clave escalar (mayor = mejor) equivalente al orden de NSGA-II: primero el frente y,
+    dentro del frente, la distancia de apiñamiento. Permite usar los operadores de
+    selección y elitismo de un solo objetivo en modo multiobjetivo.
+    """
+    ranks = non_dominated_sort(F)
+    crowd = crowding_distance(F, ranks)
+    # Desempate en [0, 0.5]: nunca alcanza el frente anterior
+    finite_crowd = np.where(np.isinf(crowd), 0.0, crowd)
+    tie_break = np.where(np.isinf(crowd), 0.5, 0.5 * finite_crowd / (1.0 + finite_crowd))
+    return -ranks.astype(float) + tie_break
+
+
+def nsga2_tournament_selection(fitness, num_parents, ga_instance):
+    """
+    Selección por torneo binario con el orden de NSGA-II, con la firma de selección
+    personalizada de PyGAD: (fitness, num_parents, ga_instance) -> (padres, índices).
+    """
+    key = nsga2_key(np.asarray(fitness, dtype=float))
+    contenders = np.random.randint(0, len(key), size=(num_parents, 2))
+    winners = np.where(key[contenders[:, 0]] >= key[contenders[:, 1]], contenders[:, 0], contenders[:, 1])
+    return ga_instance.population[winners].copy(), winners
+
+
+class ParetoArchive:
+    """
+    Archivo acotado de soluciones no dominadas (X, F), con F en sentido de maximización.
+    Al superar max_size se conservan las de mayor distancia de apiñamiento (las más
+    repartidas a lo largo del frente).
+    """
+    def __init__(self, num_genes, num_objectives, max_size=200):
+        self.max_size = int(max_size)
+        self.X = np.empty((0, int(num_genes)))
+        self.F = np.empty((0, int(num_objectives)))
+
+    def __len__(self):
+        return len(self.F)
+
+    def update(self, X, F):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        F = _clean(F)
+        valid = np.isfinite(F).all(axis=1)
+        if not valid.any():
+            return
+        X_all = np.concatenate([self.X, X[valid]])
+        F_all = np.concatenate([self.F, F[valid]])
+        # Quitar soluciones repetidas (mismo punto y mismos objetivos)
+        _, unique_idx = np.unique(np.hstack([X_all, F_all]), axis=0, return_index=True)
+        X_all, F_all = X_all[np.sort(unique_idx)], F_all[np.sort(unique_idx)]
+
+        front = non_dominated_sort(F_all) == 0
+        X_all, F_all = X_all[front], F_all[front]
+        if len(F_all) > self.max_size:
+            keep = np.argsort(-crowding_distance(F_all, np.zeros(len(F_all), dtype=np.int64)), kind='stable')
+            keep = np.sort(keep[:self.max_size])
+            X_all, F_all = X_all[keep], F_all[keep]
+        self.X, self.F = X_all, F_all
+
+    def compromise_index(self):
+        """Índice de la solución más cercana al punto ideal (objetivos normalizados), o -1."""
+        if len(self.F) == 0:
+            return -1
+        low, high = self.F.min(axis=0), self.F.max(axis=0)
+        span = np.where(high > low, high - low, 1.0)
+        return int(np.argmin(np.linalg.norm((high - self.F) / span, axis=1)))
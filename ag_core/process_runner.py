@@ -0,0 +1,178 @@
+# ag_core/process_runner.py
+import logging
+import multiprocessing
+import time
+
+import numpy as np
+
+from .log_pipeline import configure_child_logging, flush_rate_limited, get_pipeline
+from .precision import precision_dtype
+from .snapshot import frozen
+from .statistics import STAT_FIELDS
+
+logger_proc = logging.getLogger(f"{__name__}")
+
+# Mensajes del proceso hijo al padre: (tipo, carga)
+#   ('generation', (snapshot sin historial, filas nuevas de las estadísticas por generación))
+#   ('stopped', snapshot final completo, o None)
+#   ('result', GeneticOptimizer sin evaluador, para exportar y guardar la ejecución)
+#   ('error', mensaje)
+
+
+def _run_in_child(params, conn, stop_event, log_queue=None, log_level=logging.INFO):
+    """Punto de entrada del proceso hijo: ejecuta GeneticOptimizer y envía sus snapshots por conn."""
+    from .genetic_algorithm import GeneticOptimizer  # Importación en el hijo (arranque 'spawn')
+
+    if log_queue is not None:
+        configure_child_logging(log_queue, log_level)  # Los registros del hijo van al log de la GUI
+
+    sent_history = 0
+
+    def send_generation(snapshot):
+        nonlocal sent_history
+        # El historial crece en cada generación: solo viajan las filas nuevas (el padre las
+        # acumula, ver GAProcess.receive), no el historial completo en cada mensaje
+        history = snapshot.statistics_history
+        tail = np.array(history[sent_history:])
+        sent_history = len(history)
+        conn.send(('generation', (snapshot._replace(fitness_history=None, statistics_history=None), tail)))
+        if stop_event.is_set():
+            optimizer.request_stop()
+
+    def send_stopped(final_snapshot):
+        conn.send(('stopped', final_snapshot))
+
+    optimizer = None
+    try:
+        optimizer = GeneticOptimizer(params, params.get("func_str", ""),
+                                     on_generation_callback=send_generation, on_stop_callback=send_stopped)
+        if not stop_event.is_set():
+            optimizer.run()
+        else:
+            conn.send(('stopped', None))
+        conn.send(('result', optimizer))
+    except Exception as e:
+        logger_proc.error(f"_run_in_child: Error en el proceso del AG: {e}", exc_info=True)
+        conn.send(('error', str(e)))
+        conn.send(('stopped', None))
+    finally:
+        if optimizer is not None:
+            optimizer.close()
+        flush_rate_limited()
+        conn.close()
+
+
+class GAProcess:
+    """
+    Ejecuta GeneticOptimizer en un proceso aparte (multiprocessing, arranque 'spawn') y
+    recibe sus GenerationSnapshot por un pipe. La evaluación del fitness no compite por el
+    GIL con la GUI: cada uno usa su propio núcleo. Los snapshots llegan completos (el
+    historial de estadísticas se reconstruye aquí a partir de las filas nuevas) y, al terminar,
+    una copia de resultados del optimizador (sin evaluador) para exportar y guardar.
+    """
+    def __init__(self, params, start_method='spawn', log_queue=None):
+        self.params = params
+        # Por defecto, la cola del LogPipeline del proceso (si está configurado)
+        pipeline = get_pipeline()
+        self.log_queue = log_queue if log_queue is not None else (pipeline.queue if pipeline else None)
+        self._ctx = multiprocessing.get_context(start_method)
+        self._conn = None
+        self._stop_event = self._ctx.Event()
+        self.process = None
+        self.optimizer = None
+        self._history = np.full((int(params['num_generations']) + 1, len(STAT_FIELDS)), np.nan, dtype=precision_dtype(params))
+        self._history_size = 0
+
+    def start(self):
+        receiver, sender = self._ctx.Pipe(duplex=False)
+        args = (self.params, sender, self._stop_event, self.log_queue, logging.getLogger().getEffectiveLevel())
+        # No daemon: puede lanzar sus propios procesos de evaluación (eval_workers)
+        self.process = self._ctx.Process(target=_run_in_child, args=args, name="GAProcess")
+        self.process.start()
+        sender.close()  # Solo el hijo escribe: así recv() detecta EOF si el hijo muere
+        self._conn = receiver
+        logger_proc.info(f"GAProcess: Proceso del AG iniciado (pid {self.process.pid}).")
+
+    def request_stop(self):
+        """El hijo termina al final de la generación en curso y envía su snapshot final."""
+        self._stop_event.set()
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def terminate(self):
+        """Termina el hijo sin esperar a la generación en curso (sus workers de evaluación salen solos)."""
+        if self.is_alive():
+            self.process.terminate()
+
+    def _append_history(self, tail):
+        needed = self._history_size + len(tail)
+        if needed > len(self._history):
+            # Nuevo array (no se redimensiona en sitio): las vistas de snapshots anteriores siguen válidas
+            grown = np.full((max(needed, 2 * len(self._history)), len(STAT_FIELDS)), np.nan, dtype=self._history.dtype)
+            grown[:self._history_size] = self._history[:self._history_size]
+            self._history = grown
+        self._history[self._history_size:needed] = tail
+        self._history_size = needed
+
+    def receive(self, timeout=0.1):
+        """
+        Espera hasta timeout segundos el siguiente mensaje del hijo y lo devuelve como
+        (tipo, carga); None si no llegó nada. ('eof', None) si el hijo cerró el pipe.
+        """
+        try:
+            if not self._conn.poll(timeout):
+                return None
+            kind, payload = self._conn.recv()
+        except (EOFError, OSError):
+            return 'eof', None
+        if kind == 'generation':
+            snapshot, tail = payload
+            self._append_history(tail)
+            statistics = frozen(self._history[:self._history_size], copy=False)
+            payload = snapshot._replace(fitness_history=statistics[:, 0], statistics_history=statistics)
+        elif kind == 'result':
+            self.optimizer = payload
+        return kind, payload
+
+    def join(self, timeout=None, terminate_after=None):
+        """Espera al hijo; si terminate_after se agota sin que termine, lo termina a la fuerza."""
+        if self.process is None:
+            return
+        self.process.join(terminate_after if terminate_after is not None else timeout)
+        if self.process.is_alive() and terminate_after is not None:
+            logger_proc.warning("GAProcess: El proceso del AG no terminó a tiempo; se fuerza su terminación.")
+            self.process.terminate()
+            self.process.join(timeout)
+        if self._conn is not None:
+            self._conn.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    demo_params = {
+        'func_str': "x * sin(10 * x) + 1", 'range_min': -1.0, 'range_max': 2.0, 'pop_size': 60,
+        'num_generations': 200, 'selection_type': 'sss', 'keep_elitism': 2, 'crossover_type': 'single_point',
+        'crossover_prob': 0.8, 'mutation_prob': 0.1, 'optimization_type': 'maximize', 'random_seed': 3,
+    }
+    runner = GAProcess(demo_params)
+    start = time.perf_counter()
+    runner.start()
+    generations, final = 0, None
+    while True:
+        message = runner.receive(timeout=1.0)
+        if message is None:
+            continue
+        kind, payload = message
+        if kind == 'generation':
+            generations += 1
+        elif kind == 'stopped':
+            final = payload
+        elif kind in ('result', 'eof', 'error'):
+            break
+    runner.join(timeout=5)
+    print(f"{generations} snapshots recibidos en {time.perf_counter() - start:.2f} s (incluye el arranque del proceso)")
+    if final is not None:
+        print(f"Mejor: x={final.best_details['x_value']:.5f}, f(x)={final.best_details['f_x_value']:.5f}; "
+              f"historial de {len(final.fitness_history)} generaciones; "
+              f"optimizador devuelto con {len(runner.optimizer.archive)} evaluaciones.")
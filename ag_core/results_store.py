@@ -0,0 +1,306 @@
+# ag_core/results_store.py
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+
+import numpy as np
+
+logger_store = logging.getLogger(f"{__name__}")
+
+# Parámetros que no cambian el problema ni el AG (no entran en el hash de configuración)
+_NON_CONFIG_PARAMS = ('random_seed', 'execution')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    func_str TEXT NOT NULL,
+    optimization_type TEXT NOT NULL,
+    backend TEXT,
+    params_json TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    random_seed INTEGER,
+    pop_size INTEGER,
+    num_generations INTEGER,
+    generations_completed INTEGER,
+    duration_s REAL,
+    evaluations INTEGER,
+    best_x REAL,
+    best_f REAL,
+    best_generation INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_func ON runs (func_str, optimization_type, best_f);
+CREATE INDEX IF NOT EXISTS idx_runs_params ON runs (params_hash, best_f);
+CREATE INDEX IF NOT EXISTS idx_runs_best ON runs (optimization_type, best_f);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at);
+
+CREATE TABLE IF NOT EXISTS generations (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    generation INTEGER NOT NULL,
+    best REAL,
+    mean REAL,
+    worst REAL,
+    feasible_ratio REAL,
+    median REAL,
+    std REAL,
+    gene_std REAL,
+    gene_entropy REAL,
+    unique_ratio REAL,
+    selection_differential REAL,
+    PRIMARY KEY (run_id, generation)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS solutions (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    x REAL,
+    f REAL,
+    f_values TEXT,
+    PRIMARY KEY (run_id, kind, idx)
+) WITHOUT ROWID;
+"""
+
+# Columnas de la tabla generations (las de la segunda fila se añadieron después: ver ResultsStore._migrate)
+_GENERATION_COLUMNS = ('generation', 'best', 'mean', 'worst', 'feasible_ratio',
+                       'median', 'std', 'gene_std', 'gene_entropy', 'unique_ratio', 'selection_differential')
+
+# Columnas por las que se puede ordenar una consulta (evita interpolar texto arbitrario en el SQL)
+_ORDER_COLUMNS = ('created_at', 'best_f', 'duration_s', 'generations_completed', 'evaluations', 'id')
+
+
+def default_results_path():
+    """Ruta de la base de resultados: GA_OPTIMIZER_RESULTS_DB o ~/.local/share/ga_optimizer/results.sqlite."""
+    return os.environ.get('GA_OPTIMIZER_RESULTS_DB') or \
+        os.path.join(os.path.expanduser('~'), '.local', 'share', 'ga_optimizer', 'results.sqlite')
+
+
+def _to_float(value):
+    """float de Python o None (SQLite no guarda NaN: se convierte en NULL)."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _to_int(value):
+    """int de Python o None (los enteros de NumPy no son tipos nativos de SQLite)."""
+    return None if value is None else int(value)
+
+
+class ResultsStore:
+    """
+    Base de datos SQLite local con el resultado de cada ejecución: metadatos (parámetros,
+    semilla, duración), un resumen por generación y las soluciones finales. Cada ejecución
+    se escribe en una única transacción con inserciones masivas; los índices sobre función,
+    hash de configuración y calidad permiten buscar entre decenas de miles de ejecuciones.
+    """
+    def __init__(self, path=None):
+        self.path = path or default_results_path()
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ':memory:':
+            self.conn.execute("PRAGMA journal_mode = WAL")  # Lectores (navegador) no bloquean al escritor
+        self.conn.executescript(_SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        """Añade a una base anterior las columnas de estadísticas que le falten (quedan a NULL)."""
+        existing = {row['name'] for row in self.conn.execute("PRAGMA table_info(generations)")}
+        for column in _GENERATION_COLUMNS:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE generations ADD COLUMN {column} REAL")
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def params_hash(params):
+        """Hash de la configuración (sin semilla ni modo de ejecución): agrupa las repeticiones de un experimento."""
+        config = {k: v for k, v in params.items() if k not in _NON_CONFIG_PARAMS}
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+    # --- Escritura ---
+
+    def record_run(self, ga_optimizer, params, best_solution_details=None, status='completed'):
+        """Guarda una ejecución terminada de GeneticOptimizer y devuelve su id."""
+        ga_instance = ga_optimizer.ga_instance
+        best = best_solution_details or ga_optimizer.get_best_solution_details() or {}
+        func_str = "; ".join(params.get('func_strs') or [params['func_str']])
+        run_row = (
+            getattr(ga_optimizer, 'run_started_at', None) or datetime.datetime.now().isoformat(timespec='seconds'),
+            func_str, params['optimization_type'], params.get('backend', 'pygad'),
+            json.dumps(params, sort_keys=True, default=str), self.params_hash(params),
+            _to_int(getattr(ga_optimizer, 'random_seed', params.get('random_seed'))),
+            _to_int(params.get('pop_size')), _to_int(params.get('num_generations')),
+            _to_int(ga_instance.generations_completed) if ga_instance is not None else 0,
+            _to_float(getattr(ga_optimizer, 'run_duration_s', None)),
+            len(ga_optimizer.archive) if getattr(ga_optimizer, 'archive', None) is not None else None,
+            _to_float(best.get('x_value')), _to_float(best.get('f_x_value')), _to_int(best.get('generation')),
+            status,
+        )
+        generation_rows = [
+            (_to_int(s['generation']),) + tuple(_to_float(s.get(name)) for name in _GENERATION_COLUMNS[1:])
+            for s in getattr(ga_optimizer, 'generation_summaries', [])
+        ]
+        solution_rows = self._solution_rows(ga_optimizer, best)
+
+        with self.conn:  # Una transacción por ejecución
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, func_str, optimization_type, backend, params_json, params_hash, "
+                "random_seed, pop_size, num_generations, generations_completed, duration_s, evaluations, "
+                "best_x, best_f, best_generation, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                run_row)
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                f"INSERT INTO generations (run_id, {', '.join(_GENERATION_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(_GENERATION_COLUMNS))})",
+                [(run_id,) + row for row in generation_rows])
+            self.conn.executemany(
+                "INSERT INTO solutions (run_id, kind, idx, x, f, f_values) VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id,) + row for row in solution_rows])
+        logger_store.info(f"record_run: Ejecución {run_id} guardada en {self.path} "
+                          f"({len(generation_rows)} generaciones, {len(solution_rows)} soluciones).")
+        return run_id
+
+    @staticmethod
+    def _solution_rows(ga_optimizer, best):
+        rows = []
+        if best.get('x_value') is not None:
+            f_values = json.dumps(best['f_values']) if best.get('f_values') is not None else None
+            rows.append(('best', 0, _to_float(best['x_value']), _to_float(best.get('f_x_value')), f_values))
+        ga_instance = ga_optimizer.ga_instance
+        if ga_instance is not None and ga_instance.last_generation_fitness is not None:
+            # Valores reales del objetivo (como en los snapshots), no el fitness interno: este
+            # incluye penalizaciones, el valor de los puntos fallidos y predicciones del sustituto
+            F = ga_optimizer.population_objective_values()
+            xs = np.asarray(ga_instance.population)[:, 0]
+            for i, (x, f) in enumerate(zip(xs, F)):
+                rows.append(('population', i, _to_float(x), _to_float(f[0]),
+                             json.dumps([_to_float(v) for v in f]) if len(f) > 1 else None))
+        front = ga_optimizer.get_pareto_front() if getattr(ga_optimizer, 'multi_objective', False) else None
+        if front is not None:
+            for i, (x, f) in enumerate(zip(front[0][:, 0], front[1])):
+                rows.append(('pareto', i, _to_float(x), _to_float(f[0]), json.dumps([_to_float(v) for v in f])))
+        return rows
+
+    def delete_run(self, run_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE id = ?", (int(run_id),))
+
+    # --- Consulta ---
+
+    def query_runs(self, func_str=None, func_contains=None, optimization_type=None, params_hash=None,
+                   best_min=None, best_max=None, since=None, order_by='created_at', descending=True,
+                   limit=200, offset=0):
+        """
+        Ejecuciones que cumplen los filtros (todos opcionales), como lista de dicts sin los
+        parámetros completos. order_by: una de _ORDER_COLUMNS.
+        """
+        if order_by not in _ORDER_COLUMNS:
+            raise ValueError(f"No se puede ordenar por '{order_by}' (use {', '.join(_ORDER_COLUMNS)}).")
+        clauses, args = [], []
+        for clause, value in (("func_str = ?", func_str), ("func_str LIKE ?", f"%{func_contains}%" if func_contains else None),
+                              ("optimization_type = ?", optimization_type), ("params_hash = ?", params_hash),
+                              ("best_f >= ?", best_min), ("best_f <= ?", best_max), ("created_at >= ?", since)):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (f"SELECT id, created_at, func_str, optimization_type, backend, params_hash, random_seed, pop_size, "
+               f"num_generations, generations_completed, duration_s, evaluations, best_x, best_f, best_generation, status "
+               f"FROM runs {where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id DESC LIMIT ? OFFSET ?")
+        return [dict(row) for row in self.conn.execute(sql, args + [int(limit), int(offset)])]
+
+    def count_runs(self):
+        return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def get_run(self, run_id):
+        """Metadatos completos de una ejecución (con 'params' ya decodificado), o None."""
+        row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (int(run_id),)).fetchone()
+        if row is None:
+            return None
+        run = dict(row)
+        run['params'] = json.loads(run.pop('params_json'))
+        return run
+
+    def get_generations(self, run_id):
+        """Resumen por generación como dict de arrays (una clave por columna de _GENERATION_COLUMNS; NaN si falta)."""
+        columns = _GENERATION_COLUMNS
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM generations WHERE run_id = ? ORDER BY generation",
+            (int(run_id),)).fetchall()
+        data = np.array([tuple(r) for r in rows], dtype=float).reshape(-1, len(columns))
+        return {name: data[:, i] for i, name in enumerate(columns)}
+
+    def get_generations_many(self, run_ids, chunk_size=500):
+        """
+        Resumen por generación de varias ejecuciones con consultas por bloques (clave primaria
+        (run_id, generation)): {run_id: dict de arrays como get_generations}.
+        """
+        columns = _GENERATION_COLUMNS
+        run_ids = [int(r) for r in run_ids]
+        result = {run_id: {name: np.empty(0) for name in columns} for run_id in run_ids}
+        for start in range(0, len(run_ids), chunk_size):
+            chunk = run_ids[start:start + chunk_size]
+            rows = self.conn.execute(
+                f"SELECT run_id, {', '.join(columns)} FROM generations "
+                f"WHERE run_id IN ({', '.join('?' * len(chunk))}) ORDER BY run_id, generation", chunk).fetchall()
+            if not rows:
+                continue
+            data = np.array([tuple(r) for r in rows], dtype=float)
+            ids, first = np.unique(data[:, 0].astype(np.int64), return_index=True)
+            for run_id, block in zip(ids, np.split(data[:, 1:], first[1:])):
+                result[int(run_id)] = {name: block[:, i] for i, name in enumerate(columns)}
+        return result
+
+    def get_solutions(self, run_id, kind='population'):
+        """Soluciones guardadas ('best', 'population' o 'pareto') como (x (n,), F (n,) o (n, m))."""
+        rows = self.conn.execute("SELECT x, f, f_values FROM solutions WHERE run_id = ? AND kind = ? ORDER BY idx",
+                                 (int(run_id), kind)).fetchall()
+        x = np.array([r['x'] for r in rows], dtype=float)
+        if rows and rows[0]['f_values'] is not None:
+            F = np.array([json.loads(r['f_values']) for r in rows], dtype=float)
+        else:
+            F = np.array([r['f'] for r in rows], dtype=float)
+        return x, F
+
+
+def open_results_store(path=None):
+    """ResultsStore en la ruta por defecto, o None si la base no se puede abrir."""
+    try:
+        return ResultsStore(path)
+    except (OSError, sqlite3.Error) as e:
+        logger_store.warning(f"open_results_store: No se pudo abrir la base de resultados: {e}. No se guardarán las ejecuciones.")
+        return None
+
+
+if __name__ == '__main__':
+    import time
+
+    logging.basicConfig(level=logging.WARNING)
+    store = ResultsStore(':memory:')
+
+    class _Stub:  # Ejecución mínima con la interfaz que lee record_run
+        random_seed, run_duration_s, archive, multi_objective = 1, 0.5, [], False
+        ga_instance = None
+        generation_summaries = [{'generation': g, 'best': g, 'mean': g / 2, 'worst': 0.0} for g in range(1, 51)]
+        def get_best_solution_details(self):
+            return {'x_value': 1.0, 'f_x_value': float(np.random.rand()), 'generation': 3}
+
+    start = time.perf_counter()
+    for i in range(2000):
+        store.record_run(_Stub(), {'func_str': f"x**2 + {i % 20}", 'optimization_type': 'minimize', 'pop_size': 50})
+    print(f"2000 ejecuciones guardadas en {time.perf_counter() - start:.2f} s")
+    start = time.perf_counter()
+    best = store.query_runs(func_str="x**2 + 7", order_by='best_f', descending=False, limit=3)
+    print(f"Consulta indexada en {1000 * (time.perf_counter() - start):.2f} ms:", [(r['id'], round(r['best_f'], 4)) for r in best])
+    print("Generaciones de la mejor:", store.get_generations(best[0]['id'])['best'][:5])
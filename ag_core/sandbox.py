@@ -0,0 +1,317 @@
+# ag_core/sandbox.py
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from .evaluators import Evaluator
+
+try:
+    import resource  # Solo POSIX: límite de memoria de los procesos de evaluación
+except ImportError:
+    resource = None
+
+logger_sandbox = logging.getLogger(f"{__name__}")
+
+STARTUP_TIMEOUT = 60.0  # Arranque de un proceso de evaluación ('spawn': importa numpy y asteval)
+
+
+def _apply_memory_limit(memory_mb):
+    """
+    Limita el espacio de direcciones del proceso (RLIMIT_AS) a lo que ya ocupa más memory_mb:
+    una evaluación que reserve más recibe MemoryError en lugar de agotar la memoria del nodo.
+    Devuelve False si la plataforma no admite rlimits.
+    """
+    if resource is None or not memory_mb:
+        return False
+    baseline = 0
+    try:
+        with open('/proc/self/statm') as f:  # Linux: páginas ya reservadas (intérprete, numpy...)
+            baseline = int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    limit = baseline + int(float(memory_mb) * 2 ** 20)
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    return True
+
+
+def _send_values(conn, evaluate, solutions):
+    try:
+        conn.send(('ok', np.asarray(evaluate(solutions), dtype=float)))
+    except MemoryError:
+        conn.send(('error', "memoria agotada (límite de la evaluación)"))
+    except Exception as e:
+        conn.send(('error', str(e)))
+
+
+def _sandbox_worker(func_strs, use_compiled, memory_mb, conn):
+    """
+    Proceso de evaluación con límites. Recibe (soluciones, modo) por conn:
+    - 'batch': si todas las expresiones están compiladas, un único mensaje con los valores
+      del lote; si no, un mensaje por solución, para que el padre sepa cuál se colgó.
+    - 'points': un mensaje por solución aunque haya ruta compilada.
+    - 'probe': como 'points' con safe_eval_function, que lanza el error de la expresión.
+    Cada mensaje es ('ok', valores) o ('error', mensaje). El límite de memoria se aplica
+    tras preparar el evaluador, así que solo cuenta lo que reserven las evaluaciones.
+    """
+    from .evaluators import ExpressionEvaluator, MultiObjectiveEvaluator  # Importación en el hijo ('spawn')
+    from .function_parser import safe_eval_function
+
+    logging.getLogger('ag_core').setLevel(logging.ERROR)  # Los avisos por punto ya los resume el padre
+    evaluators = [ExpressionEvaluator(f, use_compiled=use_compiled) for f in func_strs]
+    evaluator = MultiObjectiveEvaluator(evaluators) if len(evaluators) > 1 else evaluators[0]
+    vectorized = all(e.compiled is not None for e in evaluators)
+    _apply_memory_limit(memory_mb)
+    conn.send(('ready', vectorized))
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break  # El padre cerró la conexión o murió
+        if task is None:
+            break
+        solutions, mode = task
+        if mode == 'batch' and vectorized:
+            _send_values(conn, evaluator.evaluate, solutions)
+        elif mode == 'probe':
+            for solution in solutions:
+                _send_values(conn, lambda X: [safe_eval_function(f, X[0]) for f in func_strs], solution)
+        else:
+            for solution in solutions:
+                _send_values(conn, evaluator.evaluate, solution[None])
+
+
+def _start_worker(ctx, func_strs, use_compiled, memory_mb, name):
+    """
+    Arranca un proceso de evaluación y espera a que esté listo. Devuelve (proceso, conexión,
+    vectorizado): vectorizado indica si responde a los lotes con un único mensaje.
+    """
+    parent_conn, child_conn = ctx.Pipe()
+    process = ctx.Process(target=_sandbox_worker, args=(func_strs, use_compiled, memory_mb, child_conn),
+                          name=name, daemon=True)
+    process.start()
+    child_conn.close()
+    try:
+        ready = parent_conn.poll(STARTUP_TIMEOUT) and parent_conn.recv()
+    except EOFError:
+        ready = None  # Terminó durante el arranque
+    if not ready:
+        process.kill()
+        process.join(timeout=2.0)
+        parent_conn.close()
+        raise RuntimeError(f"El proceso de evaluación no arrancó en {STARTUP_TIMEOUT:.0f} s "
+                           f"(código de salida {process.exitcode}).")
+    return process, parent_conn, ready[1]
+
+
+def _stop_worker(process, conn):
+    process.kill()
+    process.join(timeout=2.0)
+    conn.close()
+
+
+class SandboxedEvaluator(Evaluator):
+    """
+    Evalúa las expresiones objetivo en 'workers' procesos con presupuestos:
+    - eval_timeout: segundos por evaluación. Con el intérprete, cada proceso responde
+      solución a solución; si una no llega a tiempo (o el proceso muere), se penaliza,
+      el proceso se mata y otro sigue con el resto del tramo. Con la ruta compilada el
+      tramo llega en un mensaje (eval_timeout por solución); si falla, se repite punto a
+      punto para aislar las culpables.
+    - generation_timeout: segundos por lote completo (una generación); lo que quede sin
+      evaluar al vencer se da por expirado.
+    - memory_mb: memoria adicional por proceso (RLIMIT_AS, solo POSIX).
+    Las soluciones expiradas o fallidas devuelven NaN (el AG las penaliza); timeouts y
+    crashes cuentan las expiradas y los procesos caídos.
+    """
+    def __init__(self, func_strs, workers=1, use_compiled=True, eval_timeout=None, generation_timeout=None,
+                 memory_mb=None):
+        self.func_strs = list(func_strs)
+        self.num_objectives = len(self.func_strs)
+        self.workers = max(1, int(workers))
+        self.use_compiled = use_compiled
+        self.eval_timeout = float(eval_timeout) if eval_timeout else None
+        self.generation_timeout = float(generation_timeout) if generation_timeout else None
+        self.memory_mb = float(memory_mb) if memory_mb else None
+        self.timeouts = 0
+        self.crashes = 0
+        self._ctx = multiprocessing.get_context('spawn')
+        self._processes = [None] * self.workers  # (proceso, conexión, vectorizado) o None si hay que arrancarlo
+        if self.memory_mb and resource is None:
+            logger_sandbox.warning("SandboxedEvaluator: Esta plataforma no admite límites de memoria (rlimit); "
+                                   "solo se aplican los de tiempo.")
+        logger_sandbox.info(f"SandboxedEvaluator: {self.workers} procesos de evaluación con límites "
+                            f"(por evaluación: {self.eval_timeout or '-'} s, por generación: "
+                            f"{self.generation_timeout or '-'} s, memoria: {self.memory_mb or '-'} MB).")
+
+    def _kill(self, i):
+        if self._processes[i] is not None:
+            _stop_worker(*self._processes[i][:2])
+            self._processes[i] = None
+
+    def _dispatch(self, i, job, solutions, generation_deadline):
+        """Envía al proceso i lo pendiente del tramo; False si ya no queda nada."""
+        if not len(job['pending']):
+            return False
+        if self._processes[i] is None:
+            self._processes[i] = _start_worker(self._ctx, self.func_strs, self.use_compiled, self.memory_mb,
+                                               f"SandboxWorker-{i}")
+        job['current'], job['pending'] = job['pending'], job['pending'][:0]
+        job['batch'] = job['mode'] == 'batch' and self._processes[i][2]
+        self._processes[i][1].send((solutions[job['current']], job['mode']))
+        self._set_deadline(job, generation_deadline)
+        return True
+
+    def _set_deadline(self, job, generation_deadline):
+        """Plazo del próximo mensaje: eval_timeout por solución que cubre (todo el tramo si va por lotes)."""
+        deadlines = [generation_deadline] if generation_deadline is not None else []
+        if self.eval_timeout:
+            deadlines.append(time.monotonic() + self.eval_timeout * (len(job['current']) if job['batch'] else 1))
+        job['deadline'] = min(deadlines) if deadlines else None
+
+    def _fail_current(self, job, solutions, reason):
+        """
+        El mensaje esperado no llegó (o es un error). Por lotes: repetir el tramo punto a
+        punto; punto a punto: penalizar la solución en curso y seguir con las demás.
+        """
+        if job['batch'] and len(job['current']) > 1:
+            job['mode'] = 'points'
+        else:
+            logger_sandbox.warning(f"SandboxedEvaluator: Solución {solutions[job['current'][0]]} penalizada: {reason}")
+            job['current'] = job['current'][1:]
+        job['pending'] = np.concatenate([job['current'], job['pending']])
+        job['current'] = job['current'][:0]
+
+    def evaluate(self, solutions):
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        n = len(solutions)
+        values = np.full((n,) if self.num_objectives == 1 else (n, self.num_objectives), np.nan)
+        if n == 0:
+            return values
+        generation_deadline = time.monotonic() + self.generation_timeout if self.generation_timeout else None
+        jobs = {}
+        for i, chunk in enumerate(np.array_split(np.arange(n), min(self.workers, n))):
+            jobs[i] = {'pending': chunk, 'current': chunk[:0], 'mode': 'batch', 'batch': False, 'deadline': None}
+            self._dispatch(i, jobs[i], solutions, generation_deadline)
+
+        while jobs:
+            deadlines = [job['deadline'] for job in jobs.values() if job['deadline'] is not None]
+            timeout = max(min(deadlines) - time.monotonic(), 0.0) if deadlines else None
+            ready = wait([self._processes[i][1] for i in jobs], timeout)
+            now = time.monotonic()
+            for i in list(jobs):
+                job, conn = jobs[i], self._processes[i][1]
+                if conn in ready:
+                    try:
+                        status, result = conn.recv()
+                    except (EOFError, OSError):
+                        self.crashes += 1
+                        self._kill(i)
+                        self._fail_current(job, solutions, "el proceso de evaluación terminó")
+                    else:
+                        if status == 'ok' or not job['batch']:
+                            # Un error punto a punto solo anula esa solución: el proceso sigue con el tramo
+                            done = job['current'][:len(result) if status == 'ok' else 1]
+                            job['current'] = job['current'][len(done):]
+                            if status == 'ok':
+                                values[done] = result.reshape(values[done].shape)
+                            else:
+                                logger_sandbox.warning(f"SandboxedEvaluator: Fallo al evaluar la solución "
+                                                       f"{solutions[done[0]]}: {result}")
+                            if len(job['current']):
+                                self._set_deadline(job, generation_deadline)
+                                continue  # Siguen llegando valores del mismo tramo
+                        else:
+                            self._fail_current(job, solutions, result)
+                elif job['deadline'] is not None and now >= job['deadline']:
+                    self._kill(i)
+                    if generation_deadline is not None and now >= generation_deadline:
+                        expired = len(job['current']) + len(job['pending'])
+                        self.timeouts += expired
+                        logger_sandbox.warning(f"SandboxedEvaluator: Límite por generación ({self.generation_timeout} s) "
+                                               f"agotado; {expired} soluciones sin evaluar se penalizan.")
+                        del jobs[i]
+                        continue
+                    self.timeouts += not job['batch'] or len(job['current']) == 1
+                    self._fail_current(job, solutions, f"superó {self.eval_timeout} s")
+                else:
+                    continue
+                if not self._dispatch(i, job, solutions, generation_deadline):
+                    del jobs[i]
+        return values
+
+    def close(self):
+        for i, entry in enumerate(self._processes):
+            if entry is None:
+                continue
+            process, conn, _ = entry
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.kill()
+            conn.close()
+            self._processes[i] = None
+
+
+def probe_expression_cost(func_strs, range_min, range_max, points=8, timeout=2.0, memory_mb=None):
+    """
+    Sondeo corto de las expresiones antes de una ejecución, en un proceso con límites
+    (timeout segundos por punto, memory_mb de memoria) y con el intérprete seguro: valida
+    las expresiones en el centro del intervalo (ValueError con el error de la expresión,
+    como safe_eval_function) y cronometra 'points' valores repartidos en el intervalo.
+    Lanza ValueError si algún punto agota los límites; si no, devuelve los segundos por
+    evaluación (mediana, suma de las expresiones), una cota superior si son compilables.
+    """
+    func_strs = [func_strs] if isinstance(func_strs, str) else list(func_strs)
+    low, high = float(range_min), float(range_max)
+    X = np.concatenate([[(low + high) / 2], np.linspace(low, high, int(points))]).reshape(-1, 1)
+    process, conn, _ = _start_worker(multiprocessing.get_context('spawn'), func_strs, False, memory_mb, "SandboxProbe")
+    try:
+        elapsed = []
+        for k, x in enumerate(X):
+            start = time.perf_counter()
+            conn.send((x.reshape(1, 1), 'probe'))
+            if not conn.poll(timeout):
+                raise ValueError(f"La evaluación en x={x[0]:g} superó {timeout:g} s; revise la expresión "
+                                 f"o aumente el límite por evaluación.")
+            try:
+                status, result = conn.recv()
+            except EOFError:
+                raise ValueError(f"El proceso de evaluación terminó al evaluar x={x[0]:g} (¿memoria agotada?).")
+            elapsed.append(time.perf_counter() - start)
+            if status != 'ok' and k == 0:
+                raise ValueError(result)  # Error de la expresión en el punto de validación
+    finally:
+        _stop_worker(process, conn)
+    return float(np.median(elapsed))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.WARNING)
+    # 'np.ones(...)' gigante solo para x > 0 y un bucle largo solo cerca de x = -1: el resto se evalúa normal
+    func_str = "np.ones(int(5e8)).sum() if x > 0 else (sum([k for k in range(10**8)]) if -1.05 < x < -0.95 else x * x)"
+    X = np.array([[-3.0], [-1.0], [-0.5], [0.5], [2.0]])
+    evaluator = SandboxedEvaluator([func_str], workers=2, eval_timeout=1.0, generation_timeout=20.0, memory_mb=256)
+    try:
+        start = time.perf_counter()
+        values = evaluator.evaluate(X)
+        print(f"Valores: {values} en {time.perf_counter() - start:.1f} s; "
+              f"expiradas: {evaluator.timeouts}, procesos caídos: {evaluator.crashes}")
+        start = time.perf_counter()
+        print(f"Segundo lote: {evaluator.evaluate(X[:3] * 0.5)} en {time.perf_counter() - start:.1f} s")
+    finally:
+        evaluator.close()
+    print(f"Sondeo 'x * x': {1e3 * probe_expression_cost('x * x', -5, 5):.2f} ms por evaluación")
+    try:
+        probe_expression_cost("sum([k for k in range(10**9)])", -5, 5, timeout=0.5)
+    except ValueError as e:
+        print(f"Sondeo de una expresión lenta: {e}")
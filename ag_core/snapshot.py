@@ -0,0 +1,65 @@
+# ag_core/snapshot.py
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .statistics import STAT_FIELDS
+
+
+def frozen(array, copy=True):
+    """
+    Array de solo lectura: copia (por defecto) o vista de un buffer que ya no se modifica.
+    Las copias son float64 salvo que el original sea float32 (modo de precisión reducida).
+    """
+    if array is None:
+        return None
+    dtype = np.float32 if getattr(array, 'dtype', None) == np.float32 else float
+    array = np.array(array, dtype=dtype, copy=True) if copy else np.asarray(array).view()
+    array.flags.writeable = False
+    return array
+
+
+class GenerationSnapshot(NamedTuple):
+    """
+    Estado inmutable de una generación, creado en el hilo del AG y enviado a la GUI.
+    La GUI solo lee snapshots: nunca toca la instancia viva del AG (que el hilo del AG
+    sigue modificando) ni provoca re-evaluaciones del fitness. Los arrays son copias de
+    solo lectura o vistas de solo lectura de buffers que ya no se escriben; es picklable,
+    así que también puede viajar entre procesos.
+    """
+    generation: int
+    num_generations: int
+    optimization_type: str
+    multi_objective: bool
+    objective_labels: tuple
+    population: np.ndarray          # (n, genes)
+    fitness: np.ndarray             # Fitness interno (n,) o (n, objetivos), a maximizar
+    f_values: np.ndarray            # Valor real de cada objetivo (n,) o (n, objetivos); NaN si falló o solo hay predicción del sustituto
+    best_x: float                   # Mejor individuo de esta generación
+    best_f: float
+    best_details: Optional[dict]    # Mejor solución según GeneticOptimizer.get_best_solution_details (copia propia)
+    fitness_history: np.ndarray     # Mejor aptitud real por generación hasta esta (vista de solo lectura)
+    pareto_X: Optional[np.ndarray]  # Frente de Pareto acumulado (modo multiobjetivo)
+    pareto_F: Optional[np.ndarray]
+    feasible_ratio: Optional[float]
+    archive_points: Optional[np.ndarray]  # Puntos evaluados (solo en el snapshot final)
+    archive_values: Optional[np.ndarray]
+    elapsed_s: float
+    generation_time_s: float
+    final: bool = False
+    restarts: int = 0               # Reinicios por estancamiento hasta esta generación
+    statistics_history: Optional[np.ndarray] = None  # (generaciones, len(STAT_FIELDS)); columna 0 = fitness_history
+
+    def statistics(self, name):
+        """Serie de una estadística por generación (nombre de ag_core.statistics.STAT_FIELDS), o None."""
+        if self.statistics_history is None:
+            return None
+        return self.statistics_history[:, STAT_FIELDS.index(name)]
+
+    @property
+    def x_values(self):
+        return self.population[:, 0]
+
+    @property
+    def generations_completed(self):
+        return self.generation
@@ -0,0 +1,150 @@
+# ag_core/surrogate.py
+import logging
+import math
+
+import numpy as np
+
+from .evaluators import Evaluator
+
+logger_surrogate = logging.getLogger(f"{__name__}")
+
+
+class RBFSurrogate:
+    """
+    Interpolante RBF poliarmónico cúbico (phi(r) = r^3) con cola lineal, en NumPy puro.
+    Las entradas se normalizan a [0, 1] con los límites del dominio y las salidas se
+    estandarizan, por lo que no hay hiperparámetros de ancho que ajustar.
+    """
+    def __init__(self, low, high):
+        self.low = np.atleast_1d(np.asarray(low, dtype=float))
+        self.high = np.atleast_1d(np.asarray(high, dtype=float))
+        self._centers = None
+        self._weights = None
+        self._poly = None
+        self._y_mean, self._y_std = 0.0, 1.0
+
+    def _scale(self, X):
+        return (np.atleast_2d(X) - self.low) / (self.high - self.low)
+
+    @staticmethod
+    def _kernel(A, B):
+        d = np.sqrt(((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=2))
+        return d ** 3
+
+    @property
+    def is_fitted(self):
+        return self._weights is not None
+
+    def fit(self, X, y):
+        Xs = self._scale(X)
+        y = np.asarray(y, dtype=float)
+        self._y_mean = float(y.mean())
+        self._y_std = float(y.std()) or 1.0
+        ys = (y - self._y_mean) / self._y_std
+
+        n, d = Xs.shape
+        P = np.hstack([np.ones((n, 1)), Xs])
+        A = np.zeros((n + d + 1, n + d + 1))
+        A[:n, :n] = self._kernel(Xs, Xs)
+        A[:n, n:] = P
+        A[n:, :n] = P.T
+        rhs = np.concatenate([ys, np.zeros(d + 1)])
+        # lstsq tolera puntos duplicados (sistema singular)
+        coef = np.linalg.lstsq(A, rhs, rcond=None)[0]
+        self._centers, self._weights, self._poly = Xs, coef[:n], coef[n:]
+
+    def predict(self, X):
+        Xs = self._scale(X)
+        P = np.hstack([np.ones((len(Xs), 1)), Xs])
+        ys = self._kernel(Xs, self._centers) @ self._weights + P @ self._poly
+        return ys * self._y_std + self._y_mean
+
+
+class SurrogateEvaluator(Evaluator):
+    """
+    Evaluador con pre-filtrado por modelo sustituto delante de otro evaluador.
+    En cada lote predice f(x) con un RBF ajustado al archivo de evaluaciones reales y
+    solo envía al evaluador real la fracción 'true_fraction' más prometedora; el resto
+    recibe el valor predicho. El modelo se re-entrena cada 'retrain_interval' generaciones
+    (el optimizador llama a next_generation() al final de cada una).
+    - archive: EvaluationArchive donde el evaluador interno registra las evaluaciones reales
+      (por defecto inner.archive, p. ej. un ArchiveEvaluator); el modelo se entrena con él.
+    - maximize: sentido de la optimización (qué predicciones son "prometedoras").
+    - min_archive: evaluaciones reales válidas necesarias antes de empezar a filtrar.
+    - max_train_points: tamaño máximo del conjunto de entrenamiento (los más recientes).
+    """
+    def __init__(self, inner, low, high, maximize=True, true_fraction=0.3,
+                 retrain_interval=5, min_archive=30, max_train_points=300, archive=None):
+        if not (0.0 < true_fraction <= 1.0):
+            raise ValueError("true_fraction debe estar en (0, 1].")
+        self.inner = inner
+        self.archive = archive if archive is not None else getattr(inner, 'archive', None)
+        if self.archive is None:
+            raise ValueError("SurrogateEvaluator necesita el archivo de evaluaciones reales (archive o inner.archive).")
+        self.maximize = maximize
+        self.true_fraction = float(true_fraction)
+        self.retrain_interval = max(1, int(retrain_interval))
+        self.min_archive = int(min_archive)
+        self.max_train_points = int(max_train_points)
+        self.model = RBFSurrogate(low, high)
+
+        self._generations_since_fit = 0
+        self.true_evaluations = 0
+        self.surrogate_evaluations = 0
+
+    def next_generation(self):
+        """Cuenta una generación completada para el intervalo de re-entrenamiento."""
+        self._generations_since_fit += 1
+
+    def _retrain_if_due(self):
+        if self.model.is_fitted and self._generations_since_fit < self.retrain_interval:
+            return
+        values = np.asarray(self.archive.values, dtype=float)
+        valid = np.flatnonzero(np.isfinite(values))
+        if len(valid) < self.min_archive:
+            return
+        valid = valid[-self.max_train_points:]
+        self.model.fit(np.asarray(self.archive.points, dtype=float)[valid], values[valid])
+        self._generations_since_fit = 0
+        logger_surrogate.debug(f"SurrogateEvaluator: modelo re-entrenado con {len(valid)} puntos.")
+
+    def evaluate(self, solutions):
+        return self.evaluate_with_mask(solutions)[0]
+
+    def evaluate_with_mask(self, solutions):
+        """
+        Como evaluate(), pero devuelve también la máscara (n,) de las filas evaluadas con
+        el objetivo real; el resto lleva la predicción del modelo, no f(x).
+        """
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        self._retrain_if_due()
+
+        if not self.model.is_fitted:
+            return self.evaluate_true(solutions), np.ones(len(solutions), dtype=bool)
+
+        predicted = self.model.predict(solutions)
+        n_true = max(1, math.ceil(self.true_fraction * len(solutions)))
+        order = np.argsort(-predicted if self.maximize else predicted)
+        promising = order[:n_true]
+
+        values = predicted.copy()
+        values[promising] = self.evaluate_true(solutions[promising])
+        self.surrogate_evaluations += len(solutions) - n_true
+        evaluated = np.zeros(len(solutions), dtype=bool)
+        evaluated[promising] = True
+        return values, evaluated
+
+    def evaluate_true(self, solutions):
+        """Evalúa con el objetivo real (sin filtrar); el evaluador interno lo registra en el archivo."""
+        solutions = np.atleast_2d(np.asarray(solutions, dtype=float))
+        values = np.asarray(self.inner.evaluate(solutions), dtype=float)
+        self.true_evaluations += len(values)
+        return values
+
+    def savings(self):
+        """Fracción de evaluaciones resueltas por el sustituto en lugar del objetivo real."""
+        total = self.true_evaluations + self.surrogate_evaluations
+        return self.surrogate_evaluations / total if total else 0.0
+
+    def close(self):
+        self.inner.close()
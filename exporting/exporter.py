@@ -1,5 +1,6 @@
 # exporting/exporter.py
 import pandas as pd
+import numpy as np
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -23,10 +24,14 @@ def export_population_to_csv(ga_instance, func_str, filename="ga_population_resu
         return False, "No hay datos de población para exportar."
     data = []
     population = ga_instance.population
-    try:
-        pop_fitness_internal = ga_instance.cal_pop_fitness()
-    except Exception: # Si cal_pop_fitness falla (ej. no está listo)
-        pop_fitness_internal = [None] * len(population)
+    # Fitness ya calculado de la última generación (la copia de resultados de un proceso
+    # hijo no tiene evaluador, y cal_pop_fitness() volvería a evaluar toda la población)
+    pop_fitness_internal = getattr(ga_instance, 'last_generation_fitness', None)
+    if pop_fitness_internal is None or len(pop_fitness_internal) != len(population):
+        try:
+            pop_fitness_internal = ga_instance.cal_pop_fitness()
+        except Exception: # Si cal_pop_fitness falla (ej. no está listo)
+            pop_fitness_internal = [None] * len(population)
 
     for i, sol_genes in enumerate(population):
         x_value = sol_genes[0] 
@@ -60,6 +65,61 @@ def export_population_to_csv(ga_instance, func_str, filename="ga_population_resu
     except Exception as e:
         return False, f"Error al exportar CSV: {e}"
 
+def export_archive_to_csv(ga_optimizer, filename="ga_evaluations.csv"):
+    """Exporta todos los puntos evaluados durante la ejecución (archivo de evaluaciones)."""
+    archive = getattr(ga_optimizer, 'archive', None) if ga_optimizer else None
+    if archive is None or len(archive) == 0:
+        return False, "No hay evaluaciones archivadas para exportar."
+    points, values = archive.as_arrays()
+    df = pd.DataFrame(points, columns=[f"Gen_{i}" if points.shape[1] > 1 else "Valor_X" for i in range(points.shape[1])])
+    df.insert(0, "Evaluacion_ID", np.arange(1, len(values) + 1))
+    if values.ndim == 2:  # Modo multiobjetivo: una columna por objetivo
+        for k in range(values.shape[1]):
+            df[f"Valor_f{k + 1}(x)_Real"] = values[:, k]
+    else:
+        df["Valor_f(x)_Real"] = values
+    try:
+        df.to_csv(filename, index=False, float_format="%.10g")
+        return True, f"{len(values)} evaluaciones ({archive.unique_count()} puntos únicos) exportadas a {filename}"
+    except Exception as e:
+        return False, f"Error al exportar CSV de evaluaciones: {e}"
+
+def export_pareto_front_to_csv(ga_optimizer, filename="ga_pareto_front.csv"):
+    """Exporta el frente de Pareto acumulado (modo multiobjetivo): x y el valor real de cada objetivo."""
+    front = ga_optimizer.get_pareto_front() if ga_optimizer else None
+    if front is None or len(front[1]) == 0:
+        return False, "No hay frente de Pareto para exportar."
+    X, F = front
+    df = pd.DataFrame({"Solucion_ID": np.arange(1, len(F) + 1), "Valor_X": X[:, 0]})
+    for k, (func_str, objective_type) in enumerate(zip(ga_optimizer.objective_strs, ga_optimizer.objective_types)):
+        df[f"f{k + 1}(x) [{objective_type}: {func_str}]"] = F[:, k]
+    try:
+        df.to_csv(filename, index=False, float_format="%.10g")
+        return True, f"Frente de Pareto ({len(F)} soluciones no dominadas) exportado a {filename}"
+    except Exception as e:
+        return False, f"Error al exportar CSV del frente de Pareto: {e}"
+
+# Encabezados de las estadísticas por generación (CSV y PDF)
+_STATISTICS_COLUMNS = {
+    'generation': "Generacion", 'best': "Mejor", 'mean': "Media", 'median': "Mediana", 'std': "Desv_Tipica",
+    'worst': "Peor", 'gene_std': "Desv_Tipica_Genes", 'gene_entropy': "Entropia_Genes",
+    'unique_ratio': "Fraccion_Unicos", 'selection_differential': "Diferencial_Seleccion",
+    'feasible_ratio': "Fraccion_Factibles",
+}
+
+def export_generation_statistics_to_csv(ga_optimizer, filename="ga_generation_statistics.csv"):
+    """Exporta las estadísticas por generación (aptitud, diversidad y selección; ver ag_core.statistics)."""
+    summaries = getattr(ga_optimizer, 'generation_summaries', None) if ga_optimizer else None
+    if not summaries:
+        return False, "No hay estadísticas por generación para exportar."
+    df = pd.DataFrame(summaries)
+    df = df.rename(columns=_STATISTICS_COLUMNS)
+    try:
+        df.to_csv(filename, index=False, float_format="%.10g")
+        return True, f"Estadísticas de {len(df)} generaciones exportadas a {filename}"
+    except Exception as e:
+        return False, f"Error al exportar CSV de estadísticas: {e}"
+
 def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_solution_details, filename="ga_report.pdf"):
     if not main_window_ref or not ga_optimizer or not ga_optimizer.ga_instance or \
        not best_solution_details or not params_snapshot:
@@ -79,7 +139,7 @@ def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_so
     story.append(Spacer(1, 0.2*inch))
 
     story.append(Paragraph("<b>Parámetros de Configuración</b>", styles['h2']))
-    func_str_display = params_snapshot['func_str']
+    func_str_display = "; ".join(params_snapshot.get('func_strs') or [params_snapshot['func_str']])
     if len(func_str_display) > 60: # Acortar si es muy larga para la tabla
         func_str_display = func_str_display[:57] + "..."
 
@@ -95,7 +155,20 @@ def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_so
         ["<b>Método Selección:</b>", params_snapshot['selection_type']],
         ["<b>Tipo Cruce:</b>", params_snapshot['crossover_type']],
         ["<b>Elitismo (N mejores):</b>", str(params_snapshot['keep_elitism'])],
+        ["<b>Semilla Aleatoria:</b>", str(getattr(ga_optimizer, 'random_seed', params_snapshot.get('random_seed')))],
     ]
+    constraints = getattr(ga_optimizer, 'constraints', None)
+    if constraints is not None:
+        constraints_display = "; ".join(constraints.constraint_strs)
+        if len(constraints_display) > 60:
+            constraints_display = constraints_display[:57] + "..."
+        config_data.append([Paragraph("<b>Restricciones:</b>", styles['Normal']),
+                            Paragraph(f"<font face=Courier size=9>{constraints_display}</font>", styles['Normal'])])
+        config_data.append(["<b>Manejo de Restricciones:</b>", ga_optimizer.constraint_handling])
+        if ga_optimizer.feasibility_history:
+            config_data.append(["<b>Población Final Factible:</b>",
+                                f"{ga_optimizer.feasibility_history[-1]['feasible_ratio']:.0%}"
+                                f" ({ga_optimizer.repaired_count} reparadas)"])
     config_table = Table(config_data, colWidths=[2.2*inch, 4.6*inch], hAlign='LEFT')
     config_table.setStyle(TableStyle([
         ('GRID', (0,0), (-1,-1), 0.5, colors.Color(0.8,0.8,0.8)), # Gris más claro
@@ -109,23 +182,11 @@ def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_so
     story.append(config_table)
     story.append(Spacer(1, 0.2*inch))
 
-    story.append(Paragraph("<b>Mejor Solución Encontrada Globalmente</b>", styles['h2']))
-    best_sol_data = [
-        ["<b>Valor X:</b>", f"{best_solution_details['x_value']:.8f}"],
-        ["<b>Valor f(X) Real:</b>", f"{best_solution_details['f_x_value']:.8f}"],
-        ["<b>Fitness Interno PyGAD:</b>", f"{best_solution_details['internal_fitness']:.8f}"],
-        ["<b>Encontrada en Generación:</b>", str(best_solution_details['generation'])],
-    ]
-    best_sol_table = Table(best_sol_data, colWidths=[2.2*inch, 4.6*inch], hAlign='LEFT')
-    best_sol_table.setStyle(TableStyle([
-        ('GRID', (0,0), (-1,-1), 0.5, colors.Color(0.8,0.8,0.8)),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        # ('BACKGROUND', (0,0), (0,-1), colors.whitesmoke),
-        ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-        ('TOPPADDING', (0,0), (-1,-1), 6),
-    ]))
-    story.append(best_sol_table)
+    if getattr(ga_optimizer, 'multi_objective', False):
+        _append_pareto_section(story, styles, ga_optimizer, best_solution_details)
+    else:
+        _append_best_solution_section(story, styles, ga_optimizer, best_solution_details)
+    _append_statistics_section(story, styles, ga_optimizer)
     story.append(Spacer(1, 0.1*inch)) # Menos espacio antes del page break
     story.append(PageBreak())
 
@@ -144,7 +205,9 @@ def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_so
     else: story.append(Paragraph("Gráfico de aptitud no disponible.", styles['Normal']))
     story.append(Spacer(1, 0.2*inch))
 
-    story.append(Paragraph("<b>Gráfico de Población (Última Generación)</b>", styles['h2']))
+    population_title = "Frente de Pareto (Espacio de Objetivos)" if getattr(ga_optimizer, 'multi_objective', False) \
+        else "Gráfico de Población (Última Generación)"
+    story.append(Paragraph(f"<b>{population_title}</b>", styles['h2']))
     fig_population = plotter.get_population_plot_fig_from_canvas(main_window_ref.population_plot_canvas)
     if fig_population:
         img_buffer_pop = io.BytesIO()
@@ -162,6 +225,75 @@ def export_report_to_pdf(main_window_ref, ga_optimizer, params_snapshot, best_so
     except Exception as e:
         return False, f"Error al generar PDF: {e}\n{traceback.format_exc()}"
 
+_RESULT_TABLE_STYLE = TableStyle([
+    ('GRID', (0,0), (-1,-1), 0.5, colors.Color(0.8,0.8,0.8)),
+    ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+    ('TOPPADDING', (0,0), (-1,-1), 6),
+])
+
+def _append_best_solution_section(story, styles, ga_optimizer, best_solution_details):
+    story.append(Paragraph("<b>Mejor Solución Encontrada Globalmente</b>", styles['h2']))
+    best_sol_data = [
+        ["<b>Valor X:</b>", f"{best_solution_details['x_value']:.8f}"],
+        ["<b>Valor f(X) Real:</b>", f"{best_solution_details['f_x_value']:.8f}"],
+        ["<b>Fitness Interno PyGAD:</b>", f"{best_solution_details['internal_fitness']:.8f}"],
+        ["<b>Encontrada en Generación:</b>", str(best_solution_details['generation'])],
+    ]
+    if getattr(ga_optimizer, 'archive', None) is not None:
+        best_sol_data.append(["<b>Evaluaciones (únicas):</b>", f"{len(ga_optimizer.archive)} ({ga_optimizer.archive.unique_count()})"])
+    best_sol_table = Table(best_sol_data, colWidths=[2.2*inch, 4.6*inch], hAlign='LEFT')
+    best_sol_table.setStyle(_RESULT_TABLE_STYLE)
+    story.append(best_sol_table)
+
+def _append_statistics_section(story, styles, ga_optimizer):
+    """Estadísticas de la población en la primera y la última generación (aptitud, diversidad, selección)."""
+    summaries = getattr(ga_optimizer, 'generation_summaries', None)
+    if not summaries:
+        return
+    first, last = summaries[0], summaries[-1]
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph("<b>Estadísticas de la Población</b>", styles['h2']))
+    data = [["", f"Generación {first['generation']}", f"Generación {last['generation']}"]]
+    for key, label in _STATISTICS_COLUMNS.items():
+        if key == 'generation' or key not in last:
+            continue
+        data.append([f"<b>{label.replace('_', ' ')}:</b>",
+                     *(f"{s.get(key, float('nan')):.6g}" for s in (first, last))])
+    table = Table(data, colWidths=[2.2*inch, 2.3*inch, 2.3*inch], hAlign='LEFT')
+    table.setStyle(_RESULT_TABLE_STYLE)
+    story.append(table)
+
+def _append_pareto_section(story, styles, ga_optimizer, best_solution_details, max_rows=25):
+    """Modo multiobjetivo: objetivos, solución de compromiso y (una muestra de) el frente de Pareto."""
+    story.append(Paragraph("<b>Frente de Pareto (Modo Multiobjetivo)</b>", styles['h2']))
+    summary_data = [[f"<b>Objetivo f{k + 1}:</b>", f"{objective_type}: {func_str}"]
+                    for k, (func_str, objective_type) in enumerate(zip(ga_optimizer.objective_strs, ga_optimizer.objective_types))]
+    summary_data.append(["<b>Soluciones no dominadas:</b>", str(best_solution_details['pareto_size'])])
+    summary_data.append(["<b>Compromiso X:</b>", f"{best_solution_details['x_value']:.8f}"])
+    summary_data.append(["<b>Compromiso f(X):</b>", ", ".join(f"{v:.6f}" for v in best_solution_details['f_values'])])
+    if getattr(ga_optimizer, 'archive', None) is not None:
+        summary_data.append(["<b>Evaluaciones (únicas):</b>", f"{len(ga_optimizer.archive)} ({ga_optimizer.archive.unique_count()})"])
+    summary_table = Table(summary_data, colWidths=[2.2*inch, 4.6*inch], hAlign='LEFT')
+    summary_table.setStyle(_RESULT_TABLE_STYLE)
+    story.append(summary_table)
+    story.append(Spacer(1, 0.15*inch))
+
+    X, F = ga_optimizer.get_pareto_front()
+    # Muestra equiespaciada a lo largo del frente (ordenado por f1) si es muy largo
+    rows = np.unique(np.linspace(0, len(F) - 1, min(len(F), max_rows)).round().astype(int)) if len(F) else []
+    front_data = [["X"] + [f"f{k + 1}(X)" for k in range(F.shape[1])]]
+    front_data += [[f"{X[i, 0]:.6f}"] + [f"{v:.6f}" for v in F[i]] for i in rows]
+    front_table = Table(front_data, hAlign='LEFT', repeatRows=1)
+    front_table.setStyle(TableStyle([
+        ('GRID', (0,0), (-1,-1), 0.5, colors.Color(0.8,0.8,0.8)),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,-1), 8),
+    ]))
+    story.append(Paragraph(f"Frente (mostrando {len(rows)} de {len(F)} soluciones):", styles['Normal']))
+    story.append(front_table)
+
 def export_animation_to_gif(ga_optimizer, func_str, x_range, optimization_type, filename="ga_evolution.gif", fps=10):
     if not ga_optimizer or not hasattr(ga_optimizer, 'population_history') or not ga_optimizer.population_history:
         return False, "No hay historial de población para generar la animación."
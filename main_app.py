@@ -4,35 +4,52 @@ import os
 # import threading # QThread maneja los hilos de Qt
 import traceback
 import datetime
+import time
+import multiprocessing
 import logging # <--- AÑADIDO para logging
 
+import numpy as np
+
 from PySide6.QtCore import QThread, Signal, QObject, Slot, QTimer
 from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
 
 # Importaciones de módulos del proyecto
 from ui.main_window import MainWindow, QtConsoleOutputRedirector
 from ag_core.genetic_algorithm import GeneticOptimizer
-from ag_core.function_parser import safe_eval_function
+from ag_core.process_runner import GAProcess
+from ag_core.log_pipeline import setup_logging, get_pipeline
+from ag_core.sandbox import probe_expression_cost
+from ag_core.results_store import open_results_store
+from ag_core.initialization import best_points
+from ui.run_browser import RunBrowserDialog
+from ui.run_comparison import RunComparisonDialog
 from visualization import plotter
 from exporting import exporter
 
 # --- Configuración del Logging ---
 LOG_FILENAME = 'ga_optimizer_app.log'
-logging.basicConfig(
-    level=logging.DEBUG, # Capturar desde DEBUG hacia arriba
-    format='%(asctime)s - %(levelname)s - %(name)s - %(threadName)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILENAME, mode='w'), # Escribir a archivo, 'w' para sobrescribir en cada ejecución
-        logging.StreamHandler(sys.stdout) # También a la consola de la terminal
-    ]
-)
+# Logging asíncrono (ag_core.log_pipeline): los hilos solo encolan y un listener escribe.
+# Los procesos hijo del AG (arranque 'spawn') reimportan este módulo: solo el proceso
+# principal configura el log, para no truncar el archivo de la GUI
+if multiprocessing.parent_process() is None:
+    setup_logging(
+        LOG_FILENAME, # 'w': se sobrescribe en cada ejecución
+        level=logging.INFO, # Ajustable en caliente desde la consola de la GUI
+        stream=sys.stdout # También a la consola de la terminal
+    )
 logger = logging.getLogger(__name__)
 
+PROBE_TIMEOUT_S = 2.0  # Límite por evaluación del sondeo inicial si no se fija eval_timeout
+LONG_RUN_WARNING_S = 600.0  # Coste de evaluación estimado a partir del cual se pide confirmación
+
+# Segundos que se espera a que el proceso del AG atienda una parada antes de terminarlo
+STOP_GRACE_S = 5.0
+
 
 # --- Worker QThread para el Algoritmo Genético ---
 class GAWorker(QObject):
     generation_update_signal = Signal(object)
-    ag_stopped_signal = Signal(object) # object puede ser ga_instance o None
+    ag_stopped_signal = Signal(object) # object puede ser el GenerationSnapshot final o None
     error_occurred_signal = Signal(str)
 
     def __init__(self, params_dict):
@@ -71,16 +88,20 @@ class GAWorker(QObject):
             logger.error(error_msg, exc_info=True) # exc_info=True para loggear el traceback completo
             self.error_occurred_signal.emit(str(e)) # Enviar solo el mensaje de error a la GUI
             self.ag_stopped_signal.emit(None) # Indicar parada con error
+        finally:
+            if self.ga_optimizer_ref:
+                self.ga_optimizer_ref.close() # Cerrar conexiones del evaluador externo, si lo hay
         logger.info("GAWorker: El método run() ha finalizado.")
 
 
-    def _emit_generation_update(self, ga_instance):
+    def _emit_generation_update(self, snapshot):
+        # El snapshot es inmutable: la GUI puede leerlo mientras este hilo sigue evolucionando
         if not self._should_stop:
-            self.generation_update_signal.emit(ga_instance)
+            self.generation_update_signal.emit(snapshot)
 
-    def _emit_ag_stopped(self, ga_instance):
-        logger.info(f"GAWorker: AG detenido internamente, emitiendo ag_stopped_signal. Instancia: {'Presente' if ga_instance else 'Ausente/Error'}")
-        self.ag_stopped_signal.emit(ga_instance)
+    def _emit_ag_stopped(self, final_snapshot):
+        logger.info(f"GAWorker: AG detenido internamente, emitiendo ag_stopped_signal. Snapshot final: {'Presente' if final_snapshot else 'Ausente/Error'}")
+        self.ag_stopped_signal.emit(final_snapshot)
 
     def get_optimizer(self):
         return self.ga_optimizer_ref
@@ -89,11 +110,94 @@ class GAWorker(QObject):
     def request_stop(self):
         logger.info("GAWorker: Solicitud de parada (request_stop) recibida.")
         self._should_stop = True
-        if self.ga_optimizer_ref and self.ga_optimizer_ref.ga_instance:
-            # PyGAD no tiene un método stop() explícito que podamos llamar para interrumpir run()
-            # Esta bandera _should_stop ayudará a prevenir nuevas emisiones de señales
-            # y podría usarse si PyGAD se ejecutara iterativamente.
-            logger.debug("GAWorker: _should_stop establecido a True. PyGAD.run() es bloqueante.")
+        if self.ga_optimizer_ref:
+            # run() termina al final de la generación en curso (on_generation devuelve "stop");
+            # _should_stop evita, mientras tanto, nuevas emisiones de señales
+            self.ga_optimizer_ref.request_stop()
+            logger.debug("GAWorker: Parada solicitada al optimizador.")
+
+
+class GAProcessWorker(QObject):
+    """
+    Misma interfaz que GAWorker, pero el AG corre en un proceso aparte (ag_core.process_runner):
+    este objeto, en su QThread, solo espera los snapshots del pipe (sin retener el GIL) y
+    los reemite como señales, así que el fitness y la GUI no compiten por el intérprete.
+    """
+    generation_update_signal = Signal(object)
+    ag_stopped_signal = Signal(object)
+    error_occurred_signal = Signal(str)
+
+    def __init__(self, params_dict):
+        super().__init__()
+        self.params = params_dict
+        self.ga_process: GAProcess = None
+        self._should_stop = False
+        logger.debug(f"GAProcessWorker: Inicializado con params: {self.params}")
+
+    @Slot()
+    def run(self):
+        logger.info("GAProcessWorker: El método run() ha comenzado.")
+        final_snapshot, stopped_received, stop_deadline = None, False, None
+        try:
+            self.ga_process = GAProcess(self.params)
+            if self._should_stop:
+                self.ga_process.request_stop()
+            self.ga_process.start()
+            while True:
+                if self._should_stop and stop_deadline is None:
+                    stop_deadline = time.monotonic() + STOP_GRACE_S
+                if stop_deadline is not None and time.monotonic() > stop_deadline and self.ga_process.is_alive():
+                    # La generación en curso no termina: a diferencia de un hilo, el proceso se puede matar
+                    logger.warning("GAProcessWorker: El AG no atendió la parada a tiempo; terminando el proceso.")
+                    self.ga_process.terminate()
+                message = self.ga_process.receive(timeout=0.1)
+                if message is None:
+                    continue
+                kind, payload = message
+                if kind == 'generation':
+                    if not self._should_stop:
+                        self.generation_update_signal.emit(payload)
+                elif kind == 'error':
+                    self.error_occurred_signal.emit(payload)
+                elif kind == 'stopped':
+                    # Se emite al llegar el optimizador: el controlador lo lee al recibir la parada
+                    final_snapshot, stopped_received = payload, True
+                elif kind == 'result':
+                    break
+                elif kind == 'eof':
+                    if not stopped_received and not self._should_stop:
+                        raise RuntimeError("El proceso del AG terminó sin completar la ejecución.")
+                    if not stopped_received:
+                        # Parada pedida por el usuario y proceso terminado tras STOP_GRACE_S: no es un error
+                        logger.info("GAProcessWorker: Proceso del AG terminado tras la parada; sin snapshot final.")
+                    break
+            logger.info("GAProcessWorker: AG detenido en el proceso hijo, emitiendo ag_stopped_signal.")
+            self.ag_stopped_signal.emit(final_snapshot)
+        except Exception as e:
+            error_msg = f"Error crítico en GAProcessWorker.run(): {e}"
+            logger.error(error_msg, exc_info=True)
+            self.error_occurred_signal.emit(str(e))
+            self.ag_stopped_signal.emit(None)
+        finally:
+            if self.ga_process:
+                self.ga_process.join(timeout=1.0, terminate_after=2.0)
+        logger.info("GAProcessWorker: El método run() ha finalizado.")
+
+    def get_optimizer(self):
+        # Copia de resultados del optimizador enviada por el hijo (sin evaluador)
+        return self.ga_process.optimizer if self.ga_process else None
+
+    @Slot()
+    def request_stop(self):
+        logger.info("GAProcessWorker: Solicitud de parada (request_stop) recibida.")
+        self._should_stop = True
+        if self.ga_process:
+            self.ga_process.request_stop()
+
+    def terminate(self):
+        """Termina el proceso del AG de inmediato (al cerrar la aplicación)."""
+        if self.ga_process:
+            self.ga_process.terminate()
 
 
 class ApplicationController:
@@ -107,6 +211,9 @@ class ApplicationController:
         
         self.ag_qthread: QThread = None
         self.ga_worker_obj: GAWorker = None
+        # Base de resultados local: cada ejecución terminada se guarda para poder recargarla
+        self.results_store = open_results_store()
+        self._loaded_run_id = None # Ejecución recargada del historial (fuente del arranque en caliente)
 
         # Pasar referencias importantes a la ventana para su uso interno
         self.window.plotter_module = plotter 
@@ -119,9 +226,13 @@ class ApplicationController:
         self.window.btn_start.clicked.connect(self.on_start_clicked)
         self.window.btn_pause.clicked.connect(self.on_pause_resume_clicked)
         self.window.btn_reset.clicked.connect(self.on_reset_clicked)
+        self.window.btn_history.clicked.connect(self.on_history_clicked)
         self.window.btn_export_csv.clicked.connect(self.on_export_csv_clicked)
         self.window.btn_export_pdf.clicked.connect(self.on_export_pdf_clicked)
         self.window.btn_export_gif.clicked.connect(self.on_export_gif_clicked)
+        self.window.btn_export_evaluations.clicked.connect(self.on_export_evaluations_clicked)
+        self.window.btn_export_statistics.clicked.connect(self.on_export_statistics_clicked)
+        self.window.combo_log_level.currentTextChanged.connect(self.on_log_level_changed)
         
         # Conectar el evento de cierre de la ventana del ApplicationController
         # QApplication.instance().aboutToQuit.connect(self.handle_app_about_to_quit)
@@ -154,17 +265,30 @@ class ApplicationController:
             return
 
         try:
-            # Validar función antes de pasarla al hilo
-            test_x = (params["range_min"] + params["range_max"]) / 2
-            logger.debug(f"ApplicationController: Validando función '{params['func_str']}' con x={test_x}")
-            safe_eval_function(params["func_str"], test_x)
-            logger.info("ApplicationController: Función objetivo validada exitosamente.")
+            # Validar función antes de pasarla al hilo: sondeo corto en un proceso con límites,
+            # para que una expresión que se cuelga o agota la memoria no bloquee la GUI
+            func_strs = params.get("func_strs") or [params["func_str"]]
+            logger.debug(f"ApplicationController: Sondeando el coste de {func_strs} en [{params['range_min']}, {params['range_max']}]")
+            cost = probe_expression_cost(func_strs, params["range_min"], params["range_max"],
+                                         timeout=params.get("eval_timeout") or PROBE_TIMEOUT_S,
+                                         memory_mb=params.get("eval_memory_mb"))
+            estimate = cost * params["pop_size"] * params["num_generations"]
+            logger.info(f"ApplicationController: Función objetivo validada exitosamente "
+                        f"({1e3 * cost:.2f} ms por evaluación; ~{estimate:.0f} s de evaluación estimados).")
+            if estimate > LONG_RUN_WARNING_S and QMessageBox.question(
+                    self.window, "Ejecución Larga",
+                    f"Con el intérprete, la evaluación se estima en ~{estimate / 60:.0f} min "
+                    f"({1e3 * cost:.1f} ms por evaluación). ¿Iniciar igualmente?") != QMessageBox.StandardButton.Yes:
+                self.window.status_bar_widget.showMessage("Ejecución cancelada (coste estimado alto).")
+                return
         except ValueError as e:
             error_msg = f"Función objetivo inválida: {e}"
             QMessageBox.critical(self.window, "Error en Función Objetivo", error_msg)
             self.window.status_bar_widget.showMessage(f"Error en función: {str(e)[:50]}...")
             logger.error(f"ApplicationController: {error_msg}", exc_info=False) # No necesitamos el traceback aquí
             return
+        except RuntimeError as e_probe:
+            logger.warning(f"ApplicationController: No se pudo sondear el coste de la función ({e_probe}); se inicia sin estimación.")
         except KeyError as e_key:
              error_msg = f"Falta el parámetro '{e_key}' para validar la función."
              QMessageBox.critical(self.window, "Error en Parámetros", error_msg)
@@ -172,6 +296,9 @@ class ApplicationController:
              logger.error(f"ApplicationController: {error_msg}")
              return
 
+        if self.window.chk_warm_start.isChecked():
+            params["warm_start"] = self._warm_start_solutions(params["pop_size"])
+
         self.current_params = params
         self.best_solution_ever = None
         self.current_ga_optimizer = None # Limpiar instancia anterior
@@ -186,7 +313,10 @@ class ApplicationController:
         logger.info(f"ApplicationController: Parámetros para GAWorker: {self.current_params}")
 
         self.ag_qthread = QThread(parent=self.window) # Establecer parent para mejor gestión de Qt
-        self.ga_worker_obj = GAWorker(self.current_params)
+        # 'process': el AG corre en otro proceso y el QThread solo recibe sus snapshots;
+        # 'thread': el AG corre en el propio QThread (mismo intérprete que la GUI)
+        worker_class = GAProcessWorker if self.current_params.get("execution", "thread") == "process" else GAWorker
+        self.ga_worker_obj = worker_class(self.current_params)
         self.ga_worker_obj.moveToThread(self.ag_qthread)
 
         self.ga_worker_obj.generation_update_signal.connect(self.handle_generation_update)
@@ -202,7 +332,7 @@ class ApplicationController:
         self.window.update_gui_for_run_state(True, False)
         
         self.ag_qthread.start()
-        logger.info("ApplicationController: QThread del AG iniciado.")
+        logger.info(f"ApplicationController: QThread del AG iniciado ({worker_class.__name__}).")
 
     @Slot()
     def on_pause_resume_clicked(self):
@@ -248,6 +378,7 @@ class ApplicationController:
         self.current_ga_optimizer = None
         self.current_params = None
         self.best_solution_ever = None
+        self._loaded_run_id = None
         self._update_window_references() # Actualizar referencias en MainWindow
 
         plotter.clear_plots_qt(self.window.fitness_plot_canvas, self.window.population_plot_canvas)
@@ -280,26 +411,30 @@ class ApplicationController:
 
     # --- Slots para manejar señales del GAWorker ---
     @Slot(object)
-    def handle_generation_update(self, ga_instance_snapshot):
-        # logger.debug(f"Controller: Recibida actualización de generación {ga_instance_snapshot.generations_completed}")
-        if self.is_paused_ga or not self.current_ga_optimizer or not self.current_params:
+    def handle_generation_update(self, snapshot):
+        # logger.debug(f"Controller: Recibida actualización de generación {snapshot.generation}")
+        if self.is_paused_ga or not self.current_params:
             return
 
-        # Actualizar el mejor global aquí en el controlador
-        current_best_details_gen = self.current_ga_optimizer.get_best_solution_details()
+        # Actualizar el mejor global aquí en el controlador (sin tocar el optimizador vivo)
+        current_best_details_gen = snapshot.best_details
         if current_best_details_gen:
-            if self.best_solution_ever is None or \
+            # En modo multiobjetivo el "mejor" es la solución de compromiso del frente actual.
+            # Con restricciones, un punto factible sustituye siempre a uno no factible
+            feasible_now = current_best_details_gen.get("feasible", True)
+            feasible_before = self.best_solution_ever.get("feasible", True) if self.best_solution_ever else True
+            if snapshot.multi_objective or self.best_solution_ever is None or feasible_now != feasible_before or \
                (self.current_params["optimization_type"] == "maximize" and current_best_details_gen["f_x_value"] > self.best_solution_ever["f_x_value"]) or \
                (self.current_params["optimization_type"] == "minimize" and current_best_details_gen["f_x_value"] < self.best_solution_ever["f_x_value"]):
                 self.best_solution_ever = current_best_details_gen.copy()
                 self._update_window_references() # Actualizar la referencia en la ventana
 
         # Dejar que la ventana actualice su UI
-        self.window.handle_generation_update(ga_instance_snapshot)
+        self.window.handle_generation_update(snapshot)
 
     @Slot(object)
-    def handle_ag_stopped(self, ga_final_instance):
-        logger.info(f"Controller: AG detenido (señal de GAWorker). Instancia: {'Presente' if ga_final_instance else 'Ausente/Error'}")
+    def handle_ag_stopped(self, final_snapshot):
+        logger.info(f"Controller: AG detenido (señal de GAWorker). Snapshot final: {'Presente' if final_snapshot else 'Ausente/Error'}")
         
         if self.ga_worker_obj: # Obtener la instancia final del optimizador del worker
             self.current_ga_optimizer = self.ga_worker_obj.get_optimizer()
@@ -309,7 +444,9 @@ class ApplicationController:
         self._update_window_references() # Actualizar referencias y estado en la ventana
 
         # Llamar al handler de la ventana para actualizar la UI
-        self.window.handle_ag_stopped(ga_final_instance) 
+        self.window.handle_ag_stopped(final_snapshot) 
+        if final_snapshot is not None:
+            self._save_run_to_store()
 
         # Asegurarse de que el hilo QThread se detenga si aún está activo
         if self.ag_qthread and self.ag_qthread.isRunning():
@@ -332,6 +469,84 @@ class ApplicationController:
             self.window.update_gui_for_run_state(False, False)
 
 
+    @Slot(str)
+    def on_log_level_changed(self, level_name):
+        pipeline = get_pipeline()
+        if pipeline is not None:
+            pipeline.set_level(level_name)
+            logger.warning(f"Controller: Nivel de log cambiado a {level_name}.")
+
+    # --- Base de resultados ---
+    def _save_run_to_store(self):
+        if self.results_store is None or not self.current_ga_optimizer or not self.current_params:
+            return
+        status = 'stopped' if self.ga_worker_obj and self.ga_worker_obj._should_stop else 'completed'
+        try:
+            run_id = self.results_store.record_run(self.current_ga_optimizer, self.current_params,
+                                                   self.best_solution_ever, status=status)
+            self.window.status_bar_widget.showMessage(f"Optimización completada. Guardada en el historial (ejecución {run_id}).")
+        except Exception as e:
+            logger.error(f"Controller: No se pudo guardar la ejecución en la base de resultados: {e}", exc_info=True)
+
+    @Slot()
+    def on_history_clicked(self):
+        if self.results_store is None:
+            QMessageBox.warning(self.window, "Historial", "La base de resultados no está disponible.")
+            return
+        dialog = RunBrowserDialog(self.results_store, parent=self.window)
+        if not dialog.exec():
+            return
+        if dialog.action == 'load':
+            self._load_stored_run(dialog.selected_run_id)
+        elif dialog.action == 'compare':
+            logger.info(f"Controller: Comparando {len(dialog.selected_run_ids)} ejecuciones del historial.")
+            RunComparisonDialog(self.results_store, dialog.selected_run_ids, plotter, parent=self.window).exec()
+
+    def _load_stored_run(self, run_id):
+        """Recarga una ejecución guardada (parámetros, curvas y población final) sin volver a ejecutarla."""
+        run = self.results_store.get_run(run_id)
+        if run is None:
+            QMessageBox.warning(self.window, "Historial", f"La ejecución {run_id} ya no existe.")
+            return
+        logger.info(f"Controller: Recargando ejecución {run_id} del historial.")
+        self._perform_actual_reset_logic()
+        self.window.set_parameters_to_gui(run['params'])
+        self._loaded_run_id = run_id
+        pareto = self.results_store.get_solutions(run_id, 'pareto') if run['params'].get('func_strs') else None
+        plotter.plot_stored_run_qt(self.window.fitness_plot_canvas, self.window.population_plot_canvas, run,
+                                   self.results_store.get_generations(run_id),
+                                   self.results_store.get_solutions(run_id, 'population'), pareto)
+        best_text = "Sin solución válida." if run['best_f'] is None else \
+            f"Mejor X: {run['best_x']:.6f}\nf(X): {run['best_f']:.6f} (Gen {run['best_generation']})"
+        self.window.te_best_solution_info.setText(
+            f"HISTORIAL #{run_id} ({run['created_at']}, {run['status']}):\n{best_text}\n"
+            f"Generaciones: {run['generations_completed']} | Duración: {run['duration_s'] or 0:.2f} s | Semilla: {run['random_seed']}")
+        self.window.status_bar_widget.showMessage(f"Ejecución {run_id} recargada del historial.")
+
+    def _warm_start_solutions(self, n):
+        """
+        Mejores soluciones (lista, de mejor a peor) para sembrar la siguiente ejecución: las de
+        la última ejecución de esta sesión o, si no la hay, la población de la recargada del historial.
+        """
+        solutions = []
+        if self.current_ga_optimizer is not None:
+            solutions = self.current_ga_optimizer.warm_start_solutions(n)
+            source = "la última ejecución"
+        elif self._loaded_run_id is not None and self.results_store is not None:
+            run = self.results_store.get_run(self._loaded_run_id)
+            if run is not None:
+                x, F = self.results_store.get_solutions(self._loaded_run_id, 'population')
+                types = run['params'].get('objective_types') or [run['params']['optimization_type']]
+                signs = np.array([1.0 if t == 'maximize' else -1.0 for t in types])
+                if len(x):
+                    solutions = best_points(x.reshape(len(x), -1), F.reshape(len(x), -1) * signs, n).tolist()
+            source = f"la ejecución {self._loaded_run_id} del historial"
+        if not solutions:
+            logger.warning("Controller: Arranque en caliente sin soluciones previas; se usa solo la estrategia de inicialización.")
+            return None
+        logger.info(f"Controller: Arranque en caliente con {len(solutions)} soluciones de {source}.")
+        return solutions
+
     # --- Slots para botones de exportación ---
     # (Estos métodos no cambian significativamente, solo usan las variables de instancia del controlador)
     @Slot()
@@ -343,9 +558,12 @@ class ApplicationController:
             if filename:
                 self.window.status_bar_widget.showMessage(f"Exportando a {os.path.basename(filename)}...")
                 QApplication.processEvents() # Dar oportunidad a la GUI de actualizarse
-                success, msg = exporter.export_population_to_csv(
-                    self.current_ga_optimizer.ga_instance, self.current_params["func_str"], filename
-                )
+                if self.current_ga_optimizer.multi_objective:
+                    success, msg = exporter.export_pareto_front_to_csv(self.current_ga_optimizer, filename)
+                else:
+                    success, msg = exporter.export_population_to_csv(
+                        self.current_ga_optimizer.ga_instance, self.current_params["func_str"], filename
+                    )
                 self.window.lbl_export_status.setText(msg)
                 self.window.status_bar_widget.showMessage(msg)
                 if success: QMessageBox.information(self.window, "Exportación CSV", msg)
@@ -355,6 +573,42 @@ class ApplicationController:
             logger.warning("Controller: Intento de exportar CSV sin datos suficientes.")
 
 
+    @Slot()
+    def on_export_evaluations_clicked(self):
+        logger.debug("Controller: Exportar Evaluaciones presionado.")
+        if self.current_ga_optimizer and len(self.current_ga_optimizer.archive) > 0:
+            default_name = f"ga_evaluations_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            filename, _ = QFileDialog.getSaveFileName(self.window, "Guardar evaluaciones como CSV", default_name, "CSV Files (*.csv)")
+            if filename:
+                self.window.status_bar_widget.showMessage(f"Exportando a {os.path.basename(filename)}...")
+                QApplication.processEvents()
+                success, msg = exporter.export_archive_to_csv(self.current_ga_optimizer, filename)
+                self.window.lbl_export_status.setText(msg)
+                self.window.status_bar_widget.showMessage(msg)
+                if success: QMessageBox.information(self.window, "Exportación de Evaluaciones", msg)
+                else: QMessageBox.warning(self.window, "Error Exportación de Evaluaciones", msg)
+        else:
+            QMessageBox.warning(self.window, "Error Exportación", "No hay evaluaciones archivadas para exportar.")
+            logger.warning("Controller: Intento de exportar evaluaciones sin datos.")
+
+    @Slot()
+    def on_export_statistics_clicked(self):
+        logger.debug("Controller: Exportar Estadísticas presionado.")
+        if self.current_ga_optimizer and getattr(self.current_ga_optimizer, 'generation_summaries', None):
+            default_name = f"ga_statistics_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            filename, _ = QFileDialog.getSaveFileName(self.window, "Guardar estadísticas como CSV", default_name, "CSV Files (*.csv)")
+            if filename:
+                self.window.status_bar_widget.showMessage(f"Exportando a {os.path.basename(filename)}...")
+                QApplication.processEvents()
+                success, msg = exporter.export_generation_statistics_to_csv(self.current_ga_optimizer, filename)
+                self.window.lbl_export_status.setText(msg)
+                self.window.status_bar_widget.showMessage(msg)
+                if success: QMessageBox.information(self.window, "Exportación de Estadísticas", msg)
+                else: QMessageBox.warning(self.window, "Error Exportación de Estadísticas", msg)
+        else:
+            QMessageBox.warning(self.window, "Error Exportación", "No hay estadísticas por generación para exportar.")
+            logger.warning("Controller: Intento de exportar estadísticas sin datos.")
+
     @Slot()
     def on_export_pdf_clicked(self):
         logger.debug("Controller: Exportar PDF presionado.")
@@ -408,6 +662,11 @@ class ApplicationController:
             self.ag_qthread.quit()
             if not self.ag_qthread.wait(2000): # Darle 2 segundos para terminar
                 logger.warning("ApplicationController: El hilo del AG no terminó limpiamente al cerrar la app.")
+                if isinstance(self.ga_worker_obj, GAProcessWorker):
+                    # El proceso del AG no es daemon: sin esto la salida esperaría a que terminase
+                    self.ga_worker_obj.terminate()
+        if self.results_store is not None:
+            self.results_store.close()
         logger.info("ApplicationController: Limpieza de salida completada.")
 
 
@@ -433,7 +692,7 @@ def main_qt_app():
     main_window_instance = MainWindow()
     
     console_redirector = QtConsoleOutputRedirector()
-    console_redirector.text_written.connect(main_window_instance.append_to_console)
+    main_window_instance.attach_console(console_redirector) # Volcado por lotes con temporizador
     # Guardar referencias originales de stdout/stderr
     original_stdout = sys.stdout
     original_stderr = sys.stderr
@@ -468,10 +727,13 @@ def main_qt_app():
         sys.stdout = original_stdout
         sys.stderr = original_stderr
         logger.info(f"Aplicación finalizada con código de salida: {exit_code}")
+        if get_pipeline() is not None:
+            get_pipeline().stop() # Escribir los registros pendientes antes de salir
         sys.exit(exit_code)
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support() # Ejecutables congelados: los procesos hijo del AG arrancan aquí
     # Wrapper para asegurar que cualquier excepción en main_qt_app también se loggee
     try:
         main_qt_app()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from ag_core.genetic_algorithm import GeneticOptimizer
+
+
+def _params(**overrides):
+    params = dict(range_min=-10, range_max=10, pop_size=30, num_generations=8, selection_type='tournament',
+                  keep_elitism=2, crossover_type='single_point', crossover_prob=0.8, mutation_prob=0.2,
+                  optimization_type='maximize', func_str='x*np.sin(x)', backend='numpy', random_seed=1)
+    params.update(overrides)
+    return params
+
+
+def _run(params):
+    snapshots = []
+    optimizer = GeneticOptimizer(params, params['func_str'], on_generation_callback=snapshots.append)
+    optimizer.run()
+    return optimizer, snapshots
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pygad'])
+@pytest.mark.parametrize('objective, extra, true_f', [
+    # Fallida para x < 0: el fitness interno lleva el fitness de fallo
+    ('np.sqrt(x)', {}, lambda x: np.sqrt(np.where(x >= 0, x, np.nan))),
+    # Con penalización el fitness interno de los puntos no factibles no es f(x)
+    ('x*np.sin(x)', dict(constraints='x <= 2; x >= 0', constraint_handling='penalty', constraint_penalty=0.1),
+     lambda x: x * np.sin(x)),
+])
+def test_generation_statistics_use_real_objective_values(backend, objective, extra, true_f):
+    _, snapshots = _run(_params(backend=backend, func_str=objective, **extra))
+    assert snapshots
+    for snapshot in snapshots:
+        f = true_f(np.asarray(snapshot.population, dtype=float)[:, 0])
+        assert snapshot.statistics('worst')[-1] == pytest.approx(np.nanmin(f))
+        assert snapshot.statistics('mean')[-1] == pytest.approx(np.nanmean(f))
+        assert snapshot.statistics('best')[-1] == pytest.approx(np.nanmax(f))
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pygad'])
+def test_repaired_float32_population_keeps_real_values(backend):
+    params = _params(backend=backend, precision='float32', num_generations=15, constraints='x >= 4.123456789',
+                     constraint_handling='repair')
+    optimizer, snapshots = _run(params)
+    assert optimizer.repaired_count > 0
+    for snapshot in snapshots:
+        assert snapshot.population.dtype == np.float32
+        assert not np.isnan(snapshot.f_values).any()
@@ -1,10 +1,12 @@
 # ui/main_window.py
 import sys
-from PySide6.QtCore import Qt, Slot, Signal, QObject 
+import threading
+from collections import deque
+from PySide6.QtCore import Qt, Slot, QObject, QTimer
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QLineEdit, QPushButton, QRadioButton, QComboBox, QProgressBar,
-    QTextEdit, QFrame, QGroupBox, QFileDialog, QMessageBox, QStatusBar, QSizePolicy,
+    QTextEdit, QPlainTextEdit, QCheckBox, QFrame, QGroupBox, QFileDialog, QMessageBox, QStatusBar, QSizePolicy,
     QSpacerItem
 )
 from PySide6.QtGui import QFont, QIcon
@@ -13,6 +15,15 @@ import numpy as np # Necesario para np.isnan en handle_generation_update
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from ag_core.function_parser import parse_objectives
+from ag_core.constraints import ConstraintSet
+from ag_core.initialization import INIT_STRATEGIES, RESTART_STRATEGIES
+from ag_core.precision import PRECISIONS
+
+CONSOLE_MAX_LINES = 5000        # Líneas que conserva la consola (las más antiguas se descartan)
+CONSOLE_FLUSH_INTERVAL_MS = 100 # La consola vuelca el texto acumulado como mucho 10 veces por segundo
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
+
 class MplCanvas(FigureCanvas):
     """Clase base para un canvas de Matplotlib embebido en Qt."""
     def __init__(self, parent=None, width=5, height=4, dpi=100, suptitle=None):
@@ -64,7 +75,9 @@ class MainWindow(QMainWindow):
         opt_config_layout.addLayout(opt_type_layout, 0, 1)
         opt_config_layout.addWidget(QLabel("Función Objetivo f(x):"), 1, 0)
         self.le_func_str = QLineEdit("x * math.sin(x) + 10")
-        self.le_func_str.setToolTip("Ej: x * math.cos(x) o x**2.\nUse 'x'. Funciones 'math.' y 'np.' disponibles (np.sin, np.cos, np.exp).")
+        self.le_func_str.setToolTip("Ej: x * math.cos(x) o x**2.\nUse 'x'. Funciones 'math.' y 'np.' disponibles (np.sin, np.cos, np.exp).\n"
+                                    "Varios objetivos separados por ';' (modo multiobjetivo), con prefijo opcional 'max:'/'min:'.\n"
+                                    "Ej: max: x*np.sin(x); min: x**2")
         opt_config_layout.addWidget(self.le_func_str, 1, 1)
         opt_config_layout.addWidget(QLabel("Intervalo Búsqueda [min, max]:"), 2, 0)
         self.le_range_min = QLineEdit("-10")
@@ -74,6 +87,20 @@ class MainWindow(QMainWindow):
         range_input_layout.addWidget(QLabel("a"))
         range_input_layout.addWidget(self.le_range_max)
         opt_config_layout.addLayout(range_input_layout, 2, 1)
+        opt_config_layout.addWidget(QLabel("Restricciones:"), 3, 0)
+        self.le_constraints = QLineEdit("")
+        self.le_constraints.setPlaceholderText("Ej: x**2 <= 4; x >= -1")
+        self.le_constraints.setToolTip("Restricciones opcionales separadas por ';' con un operador <=, >= o ==.\n"
+                                       "Misma sintaxis que la función objetivo.")
+        self.combo_constraint_handling = QComboBox()
+        self.combo_constraint_handling.addItems(['feasibility', 'penalty', 'repair'])
+        self.combo_constraint_handling.setToolTip("feasibility: reglas de Deb (toda solución factible supera a toda no factible).\n"
+                                                  "penalty: fitness penalizado en proporción a la violación.\n"
+                                                  "repair: las soluciones no factibles se mueven hacia la mejor factible.")
+        constraints_layout = QHBoxLayout()
+        constraints_layout.addWidget(self.le_constraints, 1)
+        constraints_layout.addWidget(self.combo_constraint_handling)
+        opt_config_layout.addLayout(constraints_layout, 3, 1)
         left_v_layout.addWidget(opt_config_group)
 
         ga_params_group = QGroupBox("Parámetros del Algoritmo Genético")
@@ -87,9 +114,57 @@ class MainWindow(QMainWindow):
         self.combo_selection_type.addItems(['sss', 'rws', 'sus', 'random', 'tournament', 'rank'])
         self.combo_selection_type.setCurrentText('sss')
         self.combo_crossover_type = QComboBox()
-        self.combo_crossover_type.addItems(['single_point', 'two_points', 'uniform', 'scattered'])
+        self.combo_crossover_type.addItems(['single_point', 'two_points', 'uniform', 'scattered', 'blend', 'sbx'])
         self.combo_crossover_type.setCurrentText('single_point')
         self.le_keep_elitism = QLineEdit("2")
+        self.combo_backend = QComboBox()
+        self.combo_backend.addItems(['pygad', 'numpy'])
+        self.combo_backend.setCurrentText('pygad')
+        self.combo_backend.setToolTip("pygad: motor PyGAD (selección, cruce, Pc, Pm y elitismo por defecto de PyGAD).\nnumpy: motor vectorizado en NumPy (más generaciones por segundo en objetivos baratos).")
+        self.combo_backend.currentTextChanged.connect(self._update_engine_controls)
+        self._update_engine_controls()
+        self.combo_execution = QComboBox()
+        self.combo_execution.addItems(['process', 'thread'])
+        self.combo_execution.setCurrentText('process')
+        self.combo_execution.setToolTip("process: el AG corre en un proceso aparte (la GUI no compite con el fitness por el GIL).\n"
+                                        "thread: el AG corre en un hilo del mismo proceso que la GUI.")
+        self.combo_init_strategy = QComboBox()
+        self.combo_init_strategy.addItems(list(INIT_STRATEGIES))
+        self.combo_init_strategy.setCurrentText('random')
+        self.combo_init_strategy.setToolTip("random: uniforme (la del motor).\nlhs / sobol / halton: muestreo que cubre el intervalo de forma uniforme.\n"
+                                            "opposition: puntos aleatorios y sus opuestos; se quedan los mejores (evalúa 2 x P₀).")
+        self.chk_warm_start = QCheckBox("Partir de la última ejecución")
+        self.chk_warm_start.setToolTip("Siembra la población inicial con las mejores soluciones de la ejecución anterior\n"
+                                       "(o de la recargada del historial); el resto se muestrea con la estrategia elegida.")
+        self.combo_restart_strategy = QComboBox()
+        self.combo_restart_strategy.addItems(list(RESTART_STRATEGIES))
+        self.combo_restart_strategy.setCurrentText('none')
+        self.combo_restart_strategy.setToolTip("Reinicio tras 20 generaciones sin mejora (un objetivo):\n"
+                                               "ipop: población nueva del doble de tamaño.\n"
+                                               "partial: conserva la mitad mejor y re-muestrea el resto.\n"
+                                               "reseed: población nueva alrededor del mejor global.")
+        # Presupuestos de evaluación (vacío = sin límite): procesos aislados con límites de tiempo y memoria
+        self.le_eval_timeout = QLineEdit("")
+        self.le_eval_timeout.setPlaceholderText("s/eval.")
+        self.le_generation_timeout = QLineEdit("")
+        self.le_generation_timeout.setPlaceholderText("s/gen.")
+        self.le_eval_memory = QLineEdit("")
+        self.le_eval_memory.setPlaceholderText("MB")
+        budgets_tooltip = ("Límites de la evaluación (vacío = sin límite). Con alguno fijado, el objetivo se evalúa en\n"
+                           "procesos aparte: las soluciones que superan el tiempo por evaluación o por generación\n"
+                           "se penalizan, y la memoria adicional de cada proceso se limita (rlimit, solo Linux/macOS).")
+        budgets_layout = QHBoxLayout()
+        for widget in (self.le_eval_timeout, self.le_generation_timeout, self.le_eval_memory):
+            widget.setToolTip(budgets_tooltip)
+            budgets_layout.addWidget(widget)
+        self.combo_precision = QComboBox()
+        self.combo_precision.addItems(list(PRECISIONS))
+        self.combo_precision.setCurrentText('float64')
+        self.combo_precision.setToolTip("Precisión de la población, el fitness y el historial (la evaluación siempre es en float64).\n"
+                                        "float32: la mitad de memoria y operadores más rápidos en poblaciones grandes.")
+        self.le_random_seed = QLineEdit("")
+        self.le_random_seed.setPlaceholderText("Aleatoria")
+        self.le_random_seed.setToolTip("Entero >= 0 para reproducir la ejecución. Vacío: se genera una semilla y se registra en el log.")
         ga_params_layout.addWidget(QLabel("Tamaño Población (P₀):"), 0, 0); ga_params_layout.addWidget(self.le_pop_size, 0, 1)
         ga_params_layout.addWidget(QLabel("Núm. Máx. Generaciones:"), 1, 0); ga_params_layout.addWidget(self.le_num_generations, 1, 1)
         ga_params_layout.addWidget(QLabel("Prob. Cruce (Pc) [0-1]:"), 2, 0); ga_params_layout.addWidget(self.le_crossover_prob, 2, 1)
@@ -97,6 +172,14 @@ class MainWindow(QMainWindow):
         ga_params_layout.addWidget(QLabel("Método Selección:"), 4, 0); ga_params_layout.addWidget(self.combo_selection_type, 4, 1)
         ga_params_layout.addWidget(QLabel("Tipo Cruce:"), 5, 0); ga_params_layout.addWidget(self.combo_crossover_type, 5, 1)
         ga_params_layout.addWidget(QLabel("Elitismo (N mejores):"), 6, 0); ga_params_layout.addWidget(self.le_keep_elitism, 6, 1)
+        ga_params_layout.addWidget(QLabel("Semilla Aleatoria:"), 7, 0); ga_params_layout.addWidget(self.le_random_seed, 7, 1)
+        ga_params_layout.addWidget(QLabel("Motor AG:"), 8, 0); ga_params_layout.addWidget(self.combo_backend, 8, 1)
+        ga_params_layout.addWidget(QLabel("Ejecución:"), 9, 0); ga_params_layout.addWidget(self.combo_execution, 9, 1)
+        ga_params_layout.addWidget(QLabel("Inicialización:"), 10, 0); ga_params_layout.addWidget(self.combo_init_strategy, 10, 1)
+        ga_params_layout.addWidget(self.chk_warm_start, 11, 0, 1, 2)
+        ga_params_layout.addWidget(QLabel("Reinicios:"), 12, 0); ga_params_layout.addWidget(self.combo_restart_strategy, 12, 1)
+        ga_params_layout.addWidget(QLabel("Límites Evaluación:"), 13, 0); ga_params_layout.addLayout(budgets_layout, 13, 1)
+        ga_params_layout.addWidget(QLabel("Precisión:"), 14, 0); ga_params_layout.addWidget(self.combo_precision, 14, 1)
         left_v_layout.addWidget(ga_params_group)
 
         control_results_group = QGroupBox("Control y Resultados")
@@ -106,6 +189,8 @@ class MainWindow(QMainWindow):
         self.btn_start = QPushButton(" Iniciar"); control_buttons_layout.addWidget(self.btn_start)
         self.btn_pause = QPushButton(" Pausar"); control_buttons_layout.addWidget(self.btn_pause)
         self.btn_reset = QPushButton(" Reiniciar"); control_buttons_layout.addWidget(self.btn_reset)
+        self.btn_history = QPushButton(" Historial"); control_buttons_layout.addWidget(self.btn_history)
+        self.btn_history.setToolTip("Buscar y recargar ejecuciones anteriores guardadas en la base de resultados.")
         control_results_layout.addLayout(control_buttons_layout)
         progress_layout = QHBoxLayout()
         progress_layout.addWidget(QLabel("Progreso:"))
@@ -137,16 +222,33 @@ class MainWindow(QMainWindow):
         self.btn_export_csv = QPushButton("Exportar CSV"); export_layout.addWidget(self.btn_export_csv)
         self.btn_export_pdf = QPushButton("Exportar PDF"); export_layout.addWidget(self.btn_export_pdf)
         self.btn_export_gif = QPushButton("Exportar GIF"); export_layout.addWidget(self.btn_export_gif)
+        self.btn_export_evaluations = QPushButton("Exportar Evaluaciones"); export_layout.addWidget(self.btn_export_evaluations)
+        self.btn_export_statistics = QPushButton("Exportar Estadísticas"); export_layout.addWidget(self.btn_export_statistics)
         self.lbl_export_status = QLabel(""); export_layout.addWidget(self.lbl_export_status); export_layout.addStretch(1)
         right_v_layout.addWidget(export_group)
 
         console_group = QGroupBox("Consola de Salida")
         console_group.setFont(QFont("Arial", 10, QFont.Bold))
         console_layout = QVBoxLayout(console_group)
-        self.te_console_output = QTextEdit()
+        console_header_layout = QHBoxLayout()
+        console_header_layout.addStretch(1)
+        console_header_layout.addWidget(QLabel("Nivel de log:"))
+        self.combo_log_level = QComboBox()
+        self.combo_log_level.addItems(LOG_LEVELS)
+        self.combo_log_level.setCurrentText('INFO')
+        self.combo_log_level.setToolTip("Nivel del log (archivo y terminal); se aplica en caliente.")
+        console_header_layout.addWidget(self.combo_log_level)
+        console_layout.addLayout(console_header_layout)
+        # QPlainTextEdit con límite de bloques: añadir es barato y la memoria queda acotada
+        self.te_console_output = QPlainTextEdit()
         self.te_console_output.setReadOnly(True); self.te_console_output.setFont(QFont("Courier New", 8))
+        self.te_console_output.setMaximumBlockCount(CONSOLE_MAX_LINES)
         self.te_console_output.setMinimumHeight(100)
         console_layout.addWidget(self.te_console_output)
+        self._console_source = None
+        self._console_timer = QTimer(self)
+        self._console_timer.setInterval(CONSOLE_FLUSH_INTERVAL_MS)
+        self._console_timer.timeout.connect(self._flush_console)
         right_v_layout.addWidget(console_group)
         main_app_layout.addWidget(right_column_widget, 2)
 
@@ -169,8 +271,24 @@ class MainWindow(QMainWindow):
                 "mutation_prob": float(self.le_mutation_prob.text()),
                 "selection_type": self.combo_selection_type.currentText(),
                 "crossover_type": self.combo_crossover_type.currentText(),
-                "keep_elitism": int(self.le_keep_elitism.text())
+                "keep_elitism": int(self.le_keep_elitism.text()),
+                "random_seed": int(self.le_random_seed.text()) if self.le_random_seed.text().strip() else None,
+                "backend": self.combo_backend.currentText(),
+                "execution": self.combo_execution.currentText(),
+                "init_strategy": self.combo_init_strategy.currentText(),
+                "restart_strategy": self.combo_restart_strategy.currentText(),
+                "constraints": self.le_constraints.text().strip(),
+                "constraint_handling": self.combo_constraint_handling.currentText(),
+                "eval_timeout": float(self.le_eval_timeout.text()) if self.le_eval_timeout.text().strip() else None,
+                "generation_timeout": float(self.le_generation_timeout.text()) if self.le_generation_timeout.text().strip() else None,
+                "eval_memory_mb": float(self.le_eval_memory.text()) if self.le_eval_memory.text().strip() else None,
+                "precision": self.combo_precision.currentText()
             }
+            # Varios objetivos separados por ';' (prefijos opcionales 'max:'/'min:') -> modo multiobjetivo
+            func_strs, objective_types = parse_objectives(params["func_str"], params["optimization_type"])
+            if len(func_strs) > 1:
+                params["func_strs"], params["objective_types"] = func_strs, objective_types
+                params["func_str"] = func_strs[0]
             # Validaciones
             if not params["func_str"]: raise ValueError("La función objetivo no puede estar vacía.")
             if params["range_min"] >= params["range_max"]: raise ValueError("El mínimo del intervalo debe ser menor que el máximo.")
@@ -179,6 +297,10 @@ class MainWindow(QMainWindow):
             if not (0.0 <= params["crossover_prob"] <= 1.0): raise ValueError("Prob. cruce debe estar entre 0.0 y 1.0.")
             if not (0.0 <= params["mutation_prob"] <= 1.0): raise ValueError("Prob. mutación debe estar entre 0.0 y 1.0.")
             if not (0 <= params["keep_elitism"] < params["pop_size"]): raise ValueError("Elitismo debe ser >= 0 y menor que el tamaño de la población.")
+            if params["random_seed"] is not None and not (0 <= params["random_seed"] < 2**32): raise ValueError("La semilla debe estar entre 0 y 2^32 - 1.")
+            if any(params[key] is not None and params[key] <= 0 for key in ("eval_timeout", "generation_timeout", "eval_memory_mb")):
+                raise ValueError("Los límites de evaluación deben ser positivos (vacío = sin límite).")
+            if params["constraints"]: ConstraintSet(params["constraints"])  # Lanza ValueError si alguna no es válida
             
             self.status_bar_widget.showMessage("Parámetros recolectados y validados.")
             print(f"[DEBUG MainWindow] Parámetros validados y devueltos: {params}") # NUEVO PRINT
@@ -196,61 +318,95 @@ class MainWindow(QMainWindow):
             return None # MUY IMPORTANTE: devolver None si hay error
 
     @Slot(object)
-    def handle_generation_update(self, ga_instance_snapshot):
+    def handle_generation_update(self, snapshot):
+        """Actualiza la UI con un GenerationSnapshot (nunca con la instancia viva del AG)."""
         current_params = self.current_params_dict
-        best_solution_global = self.best_solution_details_dict
-        optimizer_ref = self.ga_optimizer_instance
 
         # Usar el estado 'paused' de la instancia de MainWindow, que es actualizado por ApplicationController
-        if self.app_state.get("paused", False) or not optimizer_ref or not current_params:
+        if self.app_state.get("paused", False) or not current_params:
             return
 
-        if ga_instance_snapshot:
-            self.progress_bar.setValue(int((ga_instance_snapshot.generations_completed / current_params["num_generations"]) * 100))
-            self.progress_bar.setFormat(f"{ga_instance_snapshot.generations_completed}/{current_params['num_generations']}")
+        if snapshot:
+            self.progress_bar.setValue(int((snapshot.generation / snapshot.num_generations) * 100))
+            self.progress_bar.setFormat(f"{snapshot.generation}/{snapshot.num_generations}")
 
-            current_best_details_gen = optimizer_ref.get_best_solution_details()
-            if current_best_details_gen:
+            current_best_details_gen = snapshot.best_details
+            if snapshot.multi_objective:
+                self.te_best_solution_info.setText(
+                    self._pareto_info_text(current_best_details_gen, f"Gen: {snapshot.generation} | "))
+            elif current_best_details_gen:
                 # La lógica para actualizar self.best_solution_details_dict (el "mejor global")
                 # debe estar en ApplicationController. Aquí, MainWindow solo lo lee para mostrarlo.
                 best_solution_global_display = self.best_solution_details_dict # Leer el valor actualizado por el controller
 
-                info_text = (f"Gen: {ga_instance_snapshot.generations_completed} | "
-                             f"Mejor Actual X: {current_best_details_gen['x_value']:.4f}, f(X): {current_best_details_gen['f_x_value']:.4f}\n")
+                # best_details es el mejor de toda la ejecución; el de la población actual va en best_x/best_f
+                info_text = (f"Gen: {snapshot.generation} | "
+                             f"Mejor Actual X: {snapshot.best_x:.4f}, f(X): {snapshot.best_f:.4f}\n")
                 if best_solution_global_display:
                     info_text += (f"Mejor Global X: {best_solution_global_display['x_value']:.4f}, f(X): {best_solution_global_display['f_x_value']:.4f} (Gen {best_solution_global_display['generation']})")
+                    if best_solution_global_display.get('feasible') is False:
+                        info_text += " (no factible: aún no hay puntos factibles)"
                 else:
                     info_text += "Mejor Global: Aún no determinado."
+                if snapshot.feasible_ratio is not None:
+                    info_text += f"\nFactibles: {snapshot.feasible_ratio:.0%}"
+                if snapshot.restarts:
+                    info_text += f"\nReinicios: {snapshot.restarts}"
+                info_text += self._diversity_info_text(snapshot)
                 self.te_best_solution_info.setText(info_text)
 
-            if self.plotter_module:
-                self.plotter_module.update_fitness_plot_qt(self.fitness_plot_canvas, optimizer_ref)
-                self.plotter_module.update_population_plot_qt(
-                    self.population_plot_canvas, ga_instance_snapshot,
-                    current_params["func_str"],
-                    (current_params["range_min"], current_params["range_max"])
-                )
-            self.status_bar_widget.showMessage(f"Generación {ga_instance_snapshot.generations_completed} procesada.")
+            self._plot_snapshot(snapshot)
+            self.status_bar_widget.showMessage(f"Generación {snapshot.generation} procesada ({snapshot.generation_time_s * 1000:.0f} ms).")
+
+    @staticmethod
+    def _diversity_info_text(snapshot):
+        """Línea con la diversidad de la generación (entropía de genes, únicos) y el diferencial de selección."""
+        if snapshot.statistics_history is None or not len(snapshot.statistics_history):
+            return ""
+        entropy, unique, differential = (snapshot.statistics(name)[-1] for name in
+                                         ('gene_entropy', 'unique_ratio', 'selection_differential'))
+        text = f"\nDiversidad: entropía {entropy:.2f}, únicos {unique:.0%}"
+        if np.isfinite(differential):
+            text += f" | Dif. selección: {differential:.4g}"
+        return text
+
+    def _plot_snapshot(self, snapshot):
+        if not self.plotter_module or not self.current_params_dict:
+            return
+        if snapshot.multi_objective:
+            self.plotter_module.update_pareto_plot_qt(self.population_plot_canvas, snapshot)
+        else:
+            self.plotter_module.update_fitness_plot_qt(self.fitness_plot_canvas, snapshot)
+            self.plotter_module.update_population_plot_qt(
+                self.population_plot_canvas, snapshot,
+                self.current_params_dict["func_str"],
+                (self.current_params_dict["range_min"], self.current_params_dict["range_max"])
+            )
 
     @Slot(object)
-    def handle_ag_stopped(self, ga_final_instance):
+    def handle_ag_stopped(self, final_snapshot):
         print("MainWindow: AG detenido (recibido de señal).")
         # self.app_state es actualizado por ApplicationController
         self.update_gui_for_run_state(self.app_state["running"], self.app_state["paused"]) 
 
-        optimizer = self.ga_optimizer_instance 
         current_params = self.current_params_dict
         best_solution_global = self.best_solution_details_dict # Ya debería estar actualizado por el controller
 
-        if optimizer and optimizer.ga_instance and current_params:
-            final_progress_val = int((optimizer.ga_instance.generations_completed / current_params["num_generations"]) * 100)
+        if final_snapshot is not None and current_params:
+            final_progress_val = int((final_snapshot.generation / final_snapshot.num_generations) * 100)
             self.progress_bar.setValue(final_progress_val)
-            self.progress_bar.setFormat(f"{optimizer.ga_instance.generations_completed}/{current_params['num_generations']} (Finalizado)")
+            self.progress_bar.setFormat(f"{final_snapshot.generation}/{final_snapshot.num_generations} (Finalizado)")
 
-            if best_solution_global:
+            if final_snapshot.multi_objective and best_solution_global:
+                self.te_best_solution_info.setText(self._pareto_info_text(best_solution_global, "FINAL: "))
+                self.status_bar_widget.showMessage("Optimización completada.")
+                QMessageBox.information(self, "Información", "Optimización Completada!")
+            elif best_solution_global:
                 info_text = (f"FINAL: Mejor Global X: {best_solution_global['x_value']:.6f}\n"
                              f"f(X): {best_solution_global['f_x_value']:.6f} (Encontrado en Gen: {best_solution_global['generation']})\n"
-                             f"Generaciones completadas: {optimizer.ga_instance.generations_completed}")
+                             f"Generaciones completadas: {final_snapshot.generation} en {final_snapshot.elapsed_s:.2f} s")
+                if best_solution_global.get('feasible') is False:
+                    info_text += "\nNo factible: ningún punto evaluado cumple las restricciones."
                 self.te_best_solution_info.setText(info_text)
                 self.status_bar_widget.showMessage("Optimización completada.")
                 QMessageBox.information(self, "Información", "Optimización Completada!")
@@ -258,17 +414,20 @@ class MainWindow(QMainWindow):
                 self.te_best_solution_info.setText("No se encontró una solución válida al finalizar.")
                 self.status_bar_widget.showMessage("Optimización terminada, sin solución válida.")
 
-            if self.plotter_module:
-                self.plotter_module.update_fitness_plot_qt(self.fitness_plot_canvas, optimizer)
-                self.plotter_module.update_population_plot_qt(
-                    self.population_plot_canvas, optimizer.ga_instance,
-                    current_params["func_str"],
-                    (current_params["range_min"], current_params["range_max"])
-                )
+            self._plot_snapshot(final_snapshot)
         else:
             self.te_best_solution_info.setText("Ejecución terminada con errores o sin resultados válidos.")
             self.status_bar_widget.showMessage("Ejecución terminada (sin instancia de AG válida).")
 
+    @staticmethod
+    def _pareto_info_text(details, prefix=""):
+        """Resumen del frente de Pareto (modo multiobjetivo) para el cuadro de información."""
+        if not details:
+            return f"{prefix}Frente de Pareto: aún vacío."
+        f_values = ", ".join(f"{v:.4f}" for v in details['f_values'])
+        return (f"{prefix}Frente de Pareto: {details['pareto_size']} soluciones no dominadas\n"
+                f"Compromiso X: {details['x_value']:.6f}, f(X) = [{f_values}]")
+
     @Slot(str)
     def handle_thread_error(self, error_msg):
         QMessageBox.critical(self, "Error del AG", f"Error en el hilo del AG: {error_msg}")
@@ -276,6 +435,15 @@ class MainWindow(QMainWindow):
         # self.app_state es actualizado por ApplicationController
         self.update_gui_for_run_state(self.app_state["running"], self.app_state["paused"])
 
+    def _update_engine_controls(self, *_):
+        """Los operadores, Pc, Pm y el elitismo solo los usa el motor NumPy: con PyGAD se desactivan."""
+        numpy_engine = self.combo_backend.currentText() == 'numpy'
+        tooltip = "" if numpy_engine else "Solo se aplica con el motor 'numpy'; PyGAD usa su configuración por defecto."
+        for widget in (self.le_crossover_prob, self.le_mutation_prob, self.combo_selection_type,
+                       self.combo_crossover_type, self.le_keep_elitism):
+            widget.setEnabled(numpy_engine)
+            widget.setToolTip(tooltip)
+
     def update_gui_for_run_state(self, running, paused=False):
         """Actualiza el estado de los widgets de la UI basado en el estado de ejecución."""
         self.btn_start.setEnabled(not running)
@@ -286,18 +454,27 @@ class MainWindow(QMainWindow):
         # para habilitar el botón de reset cuando no se está ejecutando.
         can_reset = (self.ga_optimizer_instance is not None and not running) or running
         self.btn_reset.setEnabled(can_reset)
+        self.btn_history.setEnabled(not running)
 
         config_widgets = [
             self.rb_maximize, self.rb_minimize, self.le_func_str, self.le_range_min, self.le_range_max,
             self.le_pop_size, self.le_num_generations, self.le_crossover_prob, self.le_mutation_prob,
-            self.combo_selection_type, self.combo_crossover_type, self.le_keep_elitism
+            self.combo_selection_type, self.combo_crossover_type, self.le_keep_elitism, self.le_random_seed,
+            self.combo_backend, self.combo_execution, self.combo_init_strategy, self.chk_warm_start,
+            self.combo_restart_strategy, self.le_constraints, self.combo_constraint_handling, self.combo_precision
         ]
         for widget in config_widgets:
             widget.setEnabled(not running)
+        if not running:
+            self._update_engine_controls()
         
         has_results = self.ga_optimizer_instance is not None and self.ga_optimizer_instance.ga_instance is not None
         self.btn_export_csv.setEnabled(not running and has_results)
         self.btn_export_pdf.setEnabled(not running and has_results and self.best_solution_details_dict is not None)
+        has_evaluations = has_results and getattr(self.ga_optimizer_instance, 'archive', None) is not None and len(self.ga_optimizer_instance.archive) > 0
+        self.btn_export_evaluations.setEnabled(bool(not running and has_evaluations))
+        has_statistics = has_results and bool(getattr(self.ga_optimizer_instance, 'generation_summaries', None))
+        self.btn_export_statistics.setEnabled(bool(not running and has_statistics))
         
         # --- CORRECCIÓN PARA TypeError ---
         # Asegurar que has_history_for_gif_bool sea un booleano explícito
@@ -309,10 +486,51 @@ class MainWindow(QMainWindow):
         self.btn_export_gif.setEnabled(bool(not running and has_results and has_history_for_gif_bool))
         # ---------------------------------
 
+    def set_parameters_to_gui(self, params):
+        """Rellena los widgets con los parámetros de una ejecución guardada (inverso de get_parameters_from_gui)."""
+        self.rb_maximize.setChecked(params.get("optimization_type") == "maximize")
+        self.rb_minimize.setChecked(params.get("optimization_type") == "minimize")
+        if params.get("func_strs"):
+            prefix = {"maximize": "max: ", "minimize": "min: "}
+            self.le_func_str.setText("; ".join(f"{prefix[t]}{f}" for f, t in zip(params["func_strs"], params["objective_types"])))
+        else:
+            self.le_func_str.setText(params.get("func_str", ""))
+        line_edits = [(self.le_range_min, "range_min"), (self.le_range_max, "range_max"), (self.le_pop_size, "pop_size"),
+                      (self.le_num_generations, "num_generations"), (self.le_crossover_prob, "crossover_prob"),
+                      (self.le_mutation_prob, "mutation_prob"), (self.le_keep_elitism, "keep_elitism")]
+        for widget, key in line_edits:
+            if key in params:
+                widget.setText(str(params[key]))
+        self.le_random_seed.setText("" if params.get("random_seed") is None else str(params["random_seed"]))
+        self.le_constraints.setText(params.get("constraints") or "")
+        for widget, key in ((self.le_eval_timeout, "eval_timeout"), (self.le_generation_timeout, "generation_timeout"),
+                            (self.le_eval_memory, "eval_memory_mb")):
+            widget.setText("" if params.get(key) is None else f"{params[key]:g}")
+        combos = [(self.combo_selection_type, "selection_type"), (self.combo_crossover_type, "crossover_type"),
+                  (self.combo_backend, "backend"), (self.combo_execution, "execution"),
+                  (self.combo_init_strategy, "init_strategy"), (self.combo_restart_strategy, "restart_strategy"),
+                  (self.combo_constraint_handling, "constraint_handling"), (self.combo_precision, "precision")]
+        for combo, key in combos:
+            if params.get(key) and combo.findText(params[key]) >= 0:
+                combo.setCurrentText(params[key])
+
     def append_to_console(self, message: str):
-        self.te_console_output.append(str(message).strip())
+        self.te_console_output.appendPlainText(str(message).strip())
         self.te_console_output.ensureCursorVisible()
 
+    def attach_console(self, redirector):
+        """Vuelca periódicamente a la consola el texto que acumula redirector (QtConsoleOutputRedirector)."""
+        self._console_source = redirector
+        self._console_timer.start()
+
+    @Slot()
+    def _flush_console(self):
+        text, dropped = self._console_source.take()
+        if dropped:
+            self.append_to_console(f"[... {dropped} caracteres omitidos ...]")
+        if text.strip():
+            self.append_to_console(text)  # Un solo append por intervalo, no uno por print
+
     def closeEvent(self, event):
         # Se delega al ApplicationController para manejar el cierre si es necesario
         # (por ejemplo, para detener hilos)
@@ -325,18 +543,48 @@ class MainWindow(QMainWindow):
 
 
 class QtConsoleOutputRedirector(QObject):
-    text_written = Signal(str)
+    """
+    Sustituto de sys.stdout/sys.stderr para la consola de la GUI. write() solo acumula el
+    texto (desde cualquier hilo, sin señales de Qt); MainWindow.attach_console lo vuelca
+    por lotes con un temporizador. Si se acumula más de max_pending_chars, se descarta lo
+    más antiguo y se informa cuánto.
+    """
+    def __init__(self, max_pending_chars=200_000):
+        super().__init__()
+        self.max_pending_chars = max_pending_chars
+        self._chunks = deque()
+        self._pending_chars = 0
+        self._dropped_chars = 0
+        self._lock = threading.Lock()
+
     def write(self, text):
-        self.text_written.emit(text)
+        if not text:
+            return
+        with self._lock:
+            self._chunks.append(text)
+            self._pending_chars += len(text)
+            while self._pending_chars > self.max_pending_chars and len(self._chunks) > 1:
+                dropped = self._chunks.popleft()
+                self._pending_chars -= len(dropped)
+                self._dropped_chars += len(dropped)
+
     def flush(self):
         pass
 
+    def take(self):
+        """Devuelve (texto acumulado, caracteres descartados) y vacía el búfer."""
+        with self._lock:
+            text, dropped = "".join(self._chunks), self._dropped_chars
+            self._chunks.clear()
+            self._pending_chars = self._dropped_chars = 0
+        return text, dropped
+
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window_test = MainWindow() 
     console_redirector_test = QtConsoleOutputRedirector()
-    console_redirector_test.text_written.connect(window_test.append_to_console)
+    window_test.attach_console(console_redirector_test)
     sys.stdout = console_redirector_test
     sys.stderr = console_redirector_test
     print("Ventana de prueba de ui/main_window.py iniciada.")
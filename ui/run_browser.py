@@ -0,0 +1,151 @@
+# ui/run_browser.py
+from PySide6.QtCore import Qt, Slot
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView, QMessageBox
+)
+
+# (encabezado, clave en el dict de ResultsStore.query_runs, formato)
+_COLUMNS = [
+    ("ID", 'id', "{}"),
+    ("Fecha", 'created_at', "{}"),
+    ("Función", 'func_str', "{}"),
+    ("Tipo", 'optimization_type', "{}"),
+    ("Mejor f(x)", 'best_f', "{:.6g}"),
+    ("Mejor x", 'best_x', "{:.6g}"),
+    ("Gens", 'generations_completed', "{}"),
+    ("Duración (s)", 'duration_s', "{:.2f}"),
+    ("Semilla", 'random_seed', "{}"),
+    ("Motor", 'backend', "{}"),
+]
+
+_ORDER_OPTIONS = [("Más recientes", 'created_at', True), ("Mejor f(x) ascendente", 'best_f', False),
+                  ("Mejor f(x) descendente", 'best_f', True), ("Más lentas", 'duration_s', True)]
+
+
+class RunBrowserDialog(QDialog):
+    """
+    Navegador de ejecuciones guardadas en la base de resultados: filtra por función, tipo
+    y calidad con consultas indexadas. Al cerrarse, action indica qué hacer con la
+    selección: 'load' (recargar selected_run_id sin volver a ejecutarla) o 'compare'
+    (comparar selected_run_ids).
+    """
+    def __init__(self, results_store, parent=None, page_size=500):
+        super().__init__(parent)
+        self.setWindowTitle("Historial de Ejecuciones")
+        self.resize(1000, 500)
+        self.store = results_store
+        self.page_size = page_size
+        self.selected_run_id = None
+        self.selected_run_ids = []
+        self.action = None
+
+        layout = QVBoxLayout(self)
+        filters_layout = QHBoxLayout()
+        filters_layout.addWidget(QLabel("Función contiene:"))
+        self.le_func_filter = QLineEdit()
+        self.le_func_filter.setPlaceholderText("Ej: sin(x)")
+        self.le_func_filter.returnPressed.connect(self.refresh)
+        filters_layout.addWidget(self.le_func_filter, 2)
+        filters_layout.addWidget(QLabel("Tipo:"))
+        self.combo_type_filter = QComboBox()
+        self.combo_type_filter.addItems(["Todos", "maximize", "minimize"])
+        filters_layout.addWidget(self.combo_type_filter)
+        filters_layout.addWidget(QLabel("Orden:"))
+        self.combo_order = QComboBox()
+        self.combo_order.addItems([label for label, _, _ in _ORDER_OPTIONS])
+        filters_layout.addWidget(self.combo_order)
+        self.btn_search = QPushButton("Buscar")
+        self.btn_search.clicked.connect(self.refresh)
+        filters_layout.addWidget(self.btn_search)
+        layout.addLayout(filters_layout)
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _, _ in _COLUMNS])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.on_load_clicked)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.lbl_count = QLabel("")
+        buttons_layout.addWidget(self.lbl_count)
+        buttons_layout.addStretch(1)
+        self.btn_delete = QPushButton("Eliminar")
+        self.btn_delete.clicked.connect(self.on_delete_clicked)
+        self.btn_compare = QPushButton("Comparar")
+        self.btn_compare.setToolTip("Superponer las curvas de aptitud de las ejecuciones seleccionadas (Ctrl+A: todas las listadas).")
+        self.btn_compare.clicked.connect(self.on_compare_clicked)
+        self.btn_load = QPushButton("Cargar")
+        self.btn_load.setDefault(True)
+        self.btn_load.clicked.connect(self.on_load_clicked)
+        self.btn_close = QPushButton("Cerrar")
+        self.btn_close.clicked.connect(self.reject)
+        for button in (self.btn_delete, self.btn_compare, self.btn_load, self.btn_close):
+            buttons_layout.addWidget(button)
+        layout.addLayout(buttons_layout)
+
+        self.refresh()
+
+    @Slot()
+    def refresh(self):
+        _, order_by, descending = _ORDER_OPTIONS[self.combo_order.currentIndex()]
+        type_filter = self.combo_type_filter.currentText()
+        runs = self.store.query_runs(
+            func_contains=self.le_func_filter.text().strip() or None,
+            optimization_type=None if type_filter == "Todos" else type_filter,
+            order_by=order_by, descending=descending, limit=self.page_size)
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            for col, (_, key, fmt) in enumerate(_COLUMNS):
+                value = run.get(key)
+                item = QTableWidgetItem("-" if value is None else fmt.format(value))
+                if col == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, run['id'])
+                self.table.setItem(row, col, item)
+        self.table.resizeColumnsToContents()
+        self.lbl_count.setText(f"Mostrando {len(runs)} de {self.store.count_runs()} ejecuciones guardadas.")
+
+    def _current_run_id(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return None
+        return self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+
+    def _selected_run_ids(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        return [self.table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows]
+
+    @Slot()
+    def on_load_clicked(self):
+        run_id = self._current_run_id()
+        if run_id is None:
+            QMessageBox.information(self, "Información", "Seleccione una ejecución.")
+            return
+        self.selected_run_id = run_id
+        self.action = 'load'
+        self.accept()
+
+    @Slot()
+    def on_compare_clicked(self):
+        run_ids = self._selected_run_ids()
+        if len(run_ids) < 2:
+            QMessageBox.information(self, "Información", "Seleccione al menos dos ejecuciones para comparar.")
+            return
+        self.selected_run_ids = run_ids
+        self.action = 'compare'
+        self.accept()
+
+    @Slot()
+    def on_delete_clicked(self):
+        run_id = self._current_run_id()
+        if run_id is None:
+            return
+        if QMessageBox.question(self, "Eliminar", f"¿Eliminar la ejecución {run_id} del historial?") == QMessageBox.StandardButton.Yes:
+            self.store.delete_run(run_id)
+            self.refresh()
@@ -0,0 +1,95 @@
+# ui/run_comparison.py
+import numpy as np
+from PySide6.QtCore import Slot
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QCheckBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
+)
+
+from ui.main_window import MplCanvas
+
+_METRICS = [("Mejor", 'best'), ("Media", 'mean'), ("Peor", 'worst')]
+_SUMMARY_HEADERS = ["Configuración", "Ejecuciones", "Mediana mejor f(x)", "p10", "p90", "Duración media (s)"]
+
+
+class RunComparisonDialog(QDialog):
+    """
+    Panel de comparación de ejecuciones guardadas: superpone sus curvas de aptitud (mejor,
+    media o peor) con bandas de percentiles por configuración y resume la calidad final
+    de cada configuración, ordenada de mejor a peor, para elegir tras un barrido.
+    """
+    def __init__(self, results_store, run_ids, plotter_module, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Comparación de {len(run_ids)} Ejecuciones")
+        self.resize(1100, 750)
+        self.plotter_module = plotter_module
+        self.runs = [run for run in (results_store.get_run(r) for r in run_ids) if run is not None]
+        self.curves = results_store.get_generations_many([run['id'] for run in self.runs])
+
+        layout = QVBoxLayout(self)
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Métrica:"))
+        self.combo_metric = QComboBox()
+        self.combo_metric.addItems([label for label, _ in _METRICS])
+        self.combo_metric.currentIndexChanged.connect(self.redraw)
+        controls_layout.addWidget(self.combo_metric)
+        self.chk_group = QCheckBox("Agrupar por configuración")
+        self.chk_group.setChecked(True)
+        self.chk_group.setToolTip("Una banda y un color por configuración (mismos parámetros salvo la semilla).")
+        self.chk_group.toggled.connect(self.redraw)
+        controls_layout.addWidget(self.chk_group)
+        controls_layout.addStretch(1)
+        self.btn_close = QPushButton("Cerrar")
+        self.btn_close.clicked.connect(self.accept)
+        controls_layout.addWidget(self.btn_close)
+        layout.addLayout(controls_layout)
+
+        self.canvas = MplCanvas(self, width=9, height=5, suptitle="Comparación de Ejecuciones")
+        layout.addWidget(self.canvas, 3)
+
+        self.summary_table = QTableWidget(0, len(_SUMMARY_HEADERS))
+        self.summary_table.setHorizontalHeaderLabels(_SUMMARY_HEADERS)
+        self.summary_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.summary_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.summary_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.summary_table, 1)
+
+        self._fill_summary()
+        self.redraw()
+
+    @staticmethod
+    def _config_label(run):
+        func_str = run['func_str'] if len(run['func_str']) <= 30 else run['func_str'][:27] + "..."
+        return f"{func_str} | P={run['pop_size']} | {run['backend']} [{run['params_hash'][:6]}]"
+
+    def _groups(self):
+        if not self.chk_group.isChecked():
+            return None
+        return {run['id']: self._config_label(run) for run in self.runs}
+
+    def _fill_summary(self):
+        """Calidad final por configuración, de la mejor a la peor según el sentido de optimización."""
+        by_config = {}
+        for run in self.runs:
+            by_config.setdefault(self._config_label(run), []).append(run)
+        rows = []
+        for label, runs in by_config.items():
+            best = np.array([r['best_f'] for r in runs if r['best_f'] is not None], dtype=float)
+            durations = np.array([r['duration_s'] for r in runs if r['duration_s'] is not None], dtype=float)
+            p10, median, p90 = np.percentile(best, [10, 50, 90]) if len(best) else (np.nan,) * 3
+            sign = -1.0 if runs[0]['optimization_type'] == 'maximize' else 1.0
+            rows.append((sign * median if len(best) else np.inf, label, len(runs), median, p10, p90,
+                         durations.mean() if len(durations) else np.nan))
+        rows.sort(key=lambda row: row[0])
+        self.summary_table.setRowCount(len(rows))
+        for i, (_, label, count, median, p10, p90, duration) in enumerate(rows):
+            values = [label, str(count)] + [f"{v:.6g}" if np.isfinite(v) else "-" for v in (median, p10, p90)] + \
+                [f"{duration:.2f}" if np.isfinite(duration) else "-"]
+            for j, value in enumerate(values):
+                self.summary_table.setItem(i, j, QTableWidgetItem(value))
+        self.summary_table.resizeColumnsToContents()
+
+    @Slot()
+    def redraw(self):
+        metric = _METRICS[self.combo_metric.currentIndex()][1]
+        self.plotter_module.plot_runs_comparison_qt(self.canvas, self.curves, metric=metric, groups=self._groups())
@@ -3,9 +3,9 @@ from matplotlib.animation import FuncAnimation
 import numpy as np
 
 try:
-    from ..ag_core.function_parser import safe_eval_function
+    from ..ag_core.function_parser import evaluate_function_batch, sample_function_curve
 except ImportError: # Para pruebas directas
-    from ag_core.function_parser import safe_eval_function # Asume que está en el mismo nivel o PYTHONPATH
+    from ag_core.function_parser import evaluate_function_batch, sample_function_curve # Asume que está en el mismo nivel o PYTHONPATH
 
 def create_ga_animation(population_history, func_str, x_range, optimization_type, best_solution_history, interval=200):
     """
@@ -24,23 +24,15 @@ def create_ga_animation(population_history, func_str, x_range, optimization_type
     fig_anim, ax_anim = plt.subplots(figsize=(7, 5))
     plt.style.use('seaborn-v0_8-whitegrid')
 
-    # Graficar la función objetivo una vez
-    x_func = np.linspace(x_range[0], x_range[1], 300)
-    y_func = []
-    for x_val in x_func:
-        try:
-            y_func.append(safe_eval_function(func_str, x_val))
-        except ValueError:
-            y_func.append(np.nan)
+    # Graficar la función objetivo una vez (muestreo cacheado en memoria y en disco)
+    x_func, y_func = sample_function_curve(func_str, x_range, 300)
     ax_anim.plot(x_func, y_func, color='darkgrey', linestyle='--', linewidth=1.5, label="f(x)")
 
     # Establecer límites fijos para los ejes para evitar reescalado en cada frame
     all_pop_x = [x for gen_pop in population_history for x in gen_pop]
     all_y_vals_for_limit = list(y_func) # Copiar
     if all_pop_x:
-        for x_val in all_pop_x: # Solo para límites, no necesita ser super eficiente
-            try: all_y_vals_for_limit.append(safe_eval_function(func_str, x_val))
-            except: pass
+        all_y_vals_for_limit.extend(evaluate_function_batch(func_str, all_pop_x).tolist())
     
     valid_y_for_limit = [y for y in all_y_vals_for_limit if y is not None and not np.isnan(y)]
     if valid_y_for_limit:
@@ -63,12 +55,7 @@ def create_ga_animation(population_history, func_str, x_range, optimization_type
 
     def update_frame(gen_idx):
         current_pop_x = population_history[gen_idx]
-        current_pop_y = []
-        for x_val in current_pop_x:
-            try:
-                current_pop_y.append(safe_eval_function(func_str, x_val))
-            except ValueError:
-                current_pop_y.append(np.nan)
+        current_pop_y = evaluate_function_batch(func_str, current_pop_x).tolist()
         
         pop_scatter.set_offsets(np.c_[current_pop_x, current_pop_y])
         
@@ -0,0 +1,115 @@
+# visualization/decimation.py
+import warnings
+
+import numpy as np
+
+
+def _bin_rows(Y, n_bins):
+    """Reparte las columnas de Y (filas, n) en n_bins bloques iguales, rellenando con NaN. Devuelve (bloques, tamaño)."""
+    rows, n = Y.shape
+    size = -(-n // n_bins)  # ceil
+    padded = np.full((rows, n_bins * size), np.nan)
+    padded[:, :n] = Y
+    return padded.reshape(rows, n_bins, size), size
+
+
+def minmax_decimate_rows(Y, n_bins):
+    """
+    Decimación min-max de varias series que comparten el eje x (índice de columna):
+    en cada bloque se conservan el mínimo y el máximo, en su orden original, así que el
+    trazo a n_bins píxeles de ancho es idéntico al de la serie completa.
+    Devuelve (índices de columna (filas, k), valores (filas, k)); sin cambios si ya es corta.
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    rows, n = Y.shape
+    if n <= 2 * n_bins:
+        return np.broadcast_to(np.arange(n), (rows, n)), Y
+    blocks, size = _bin_rows(Y, n_bins)
+    nan = np.isnan(blocks)
+    arg_min = np.argmin(np.where(nan, np.inf, blocks), axis=2)
+    arg_max = np.argmax(np.where(nan, -np.inf, blocks), axis=2)
+    offsets = np.arange(n_bins) * size
+    idx = np.sort(np.stack([arg_min, arg_max], axis=2), axis=2) + offsets[None, :, None]
+    idx = np.minimum(idx.reshape(rows, -1), n - 1)
+    return idx, np.take_along_axis(Y, idx, axis=1)
+
+
+def minmax_decimate(x, y, n_bins):
+    """Decimación min-max de una serie (x, y) a como mucho 2 * n_bins puntos."""
+    x = np.asarray(x)
+    idx, y_dec = minmax_decimate_rows(np.asarray(y, dtype=float)[None, :], n_bins)
+    return x[idx[0]], y_dec[0]
+
+
+def lttb_decimate(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: reduce la serie a n_out puntos conservando su forma
+    visual (en cada bloque se elige el punto que forma el triángulo de mayor área con el
+    punto elegido anterior y la media del bloque siguiente). Primer y último punto se
+    conservan; los NaN se descartan. Un bucle de Python por punto de salida, no de entrada.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(y)
+    x, y = x[finite], y[finite]
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 bloques entre los extremos
+    starts, ends = edges[:-1], edges[1:]
+    cum_x, cum_y = np.r_[0.0, np.cumsum(x)], np.r_[0.0, np.cumsum(y)]
+    # Media del bloque siguiente a cada bloque (el último usa el punto final)
+    next_x = np.r_[(cum_x[ends[1:]] - cum_x[starts[1:]]) / (ends[1:] - starts[1:]), x[-1]]
+    next_y = np.r_[(cum_y[ends[1:]] - cum_y[starts[1:]]) / (ends[1:] - starts[1:]), y[-1]]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i, (s, e) in enumerate(zip(starts, ends)):
+        area = np.abs((x[a] - next_x[i]) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (next_y[i] - y[a]))
+        a = s + int(np.argmax(area))
+        selected[i + 1] = a
+    return x[selected], y[selected]
+
+
+def envelope_decimate(x, lower, upper, n_bins):
+    """
+    Decimación de una banda (p. ej. percentiles): por bloque, el mínimo del borde inferior
+    y el máximo del superior en el centro del bloque. La banda decimada contiene a la original.
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) <= 2 * n_bins:
+        return x, np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+    blocks, _ = _bin_rows(np.vstack([x, lower, upper]), n_bins)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # Bloques totalmente NaN (series que terminan antes)
+        return np.nanmean(blocks[0], axis=1), np.nanmin(blocks[1], axis=1), np.nanmax(blocks[2], axis=1)
+
+
+def pixel_width(ax, default=800):
+    """Ancho en píxeles del área de ejes (resolución a la que decimar)."""
+    try:
+        width = int(ax.get_window_extent().width)
+    except Exception:
+        return default
+    return width if width > 0 else default
+
+
+def column_percentiles(Y, percentiles):
+    """
+    Percentiles por columna ignorando NaN (interpolación lineal, como np.nanpercentile),
+    vectorizados con una sola ordenación: np.nanpercentile itera columna a columna y es
+    cientos de veces más lento con 10000 generaciones. Devuelve (len(percentiles), columnas).
+    """
+    Y = np.sort(np.atleast_2d(np.asarray(Y, dtype=float)), axis=0)  # NaN al final de cada columna
+    counts = np.isfinite(Y).sum(axis=0)
+    result = np.full((len(percentiles), Y.shape[1]), np.nan)
+    has_data = counts > 0
+    for i, q in enumerate(percentiles):
+        pos = (counts - 1).clip(min=0) * (q / 100.0)
+        low = np.floor(pos).astype(np.int64)
+        high = np.minimum(low + 1, (counts - 1).clip(min=0))
+        cols = np.arange(Y.shape[1])
+        low_val, high_val = Y[low, cols], Y[high, cols]
+        result[i] = np.where(has_data, low_val + (pos - low) * (high_val - low_val), np.nan)
+    return result
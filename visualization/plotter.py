@@ -4,26 +4,31 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
 
+from matplotlib.collections import LineCollection
+
+try:
+    from ..ag_core.function_parser import sample_function_curve
+except ImportError: # Ejecución desde main_app.py (visualization es un paquete de primer nivel)
+    from ag_core.function_parser import sample_function_curve
 try:
-    from ..ag_core.function_parser import safe_eval_function
-except ImportError: 
-    # Para pruebas directas de este módulo, si function_parser.py está en una ruta accesible
-    # o si se ajusta el PYTHONPATH. Asumir que está en el mismo nivel para prueba directa.
-    # from ag_core.function_parser import safe_eval_function
-    # Para pruebas, es mejor comentar la importación relativa si se ejecuta solo este archivo
-    # y definir una función dummy si es necesario.
-    # O asegurar que la estructura de carpetas permita la importación relativa al ejecutar directamente.
-    # Por ahora, la dejaremos así asumiendo que la ejecución principal es desde main_app.py
-    pass # Opcional: from ag_core.function_parser import safe_eval_function si se configura bien para pruebas
+    from .decimation import column_percentiles, envelope_decimate, lttb_decimate, minmax_decimate, minmax_decimate_rows, pixel_width
+except ImportError:
+    from visualization.decimation import column_percentiles, envelope_decimate, lttb_decimate, minmax_decimate, minmax_decimate_rows, pixel_width
+
+# Nivel de detalle: por encima de estos tamaños se dibuja sin marcadores / como densidad,
+# para que el coste de redibujar no crezca con la duración de la ejecución
+_MARKER_MAX_POINTS = 200
+_DENSITY_MIN_POINTS = 500
+_HEXBIN_GRIDSIZE = 40
 
 
 # --- Funciones específicas para la integración con PySide6 ---
 
-def update_fitness_plot_qt(mpl_canvas: FigureCanvas, ga_optimizer_instance):
+def update_fitness_plot_qt(mpl_canvas: FigureCanvas, snapshot):
     """
     Actualiza el gráfico de evolución de la aptitud en un MplCanvas de Qt.
     :param mpl_canvas: La instancia de MplCanvas (de ui.main_window) donde se dibujará.
-    :param ga_optimizer_instance: La instancia de GeneticOptimizer que contiene el historial.
+    :param snapshot: GenerationSnapshot con el historial de la mejor aptitud (fitness_history).
     """
     if mpl_canvas is None or mpl_canvas.axes is None:
         print("Error: Canvas de fitness no proporcionado o no inicializado.")
@@ -32,24 +37,33 @@ def update_fitness_plot_qt(mpl_canvas: FigureCanvas, ga_optimizer_instance):
     ax = mpl_canvas.axes # Acceder a los ejes del canvas
     ax.clear() # Limpiar los ejes antes de redibujar
 
-    if ga_optimizer_instance is None or not hasattr(ga_optimizer_instance, 'best_solution_fitness_history') or \
-       not ga_optimizer_instance.best_solution_fitness_history: # Comprobar también si la lista está vacía
-        # Mostrar mensaje si no hay datos o instancia
+    if snapshot is None or snapshot.fitness_history is None:
+        # Mostrar mensaje si no hay datos
         ax.text(0.5, 0.5, "No hay datos de fitness", ha='center', va='center', transform=ax.transAxes)
     else:
-        fitness_history = np.array(ga_optimizer_instance.best_solution_fitness_history)
+        fitness_history = snapshot.fitness_history
         if not fitness_history.size: 
             ax.text(0.5, 0.5, "Esperando datos...", ha='center', va='center', transform=ax.transAxes)
         else:
-            generations = np.arange(len(fitness_history))
-            ax.plot(generations, fitness_history, marker='.', linestyle='-', color='dodgerblue', label='Mejor Aptitud (Real)')
-            
-            if len(fitness_history) > 0:
-                if ga_optimizer_instance.optimization_type == "maximize":
-                    best_gen_idx = np.argmax(fitness_history)
+            generations = np.arange(1, len(fitness_history) + 1)
+            # LTTB al ancho en píxeles: el número de vértices no depende de las generaciones
+            plot_x, plot_y = lttb_decimate(generations, fitness_history, pixel_width(ax))
+            ax.plot(plot_x, plot_y, marker='.' if len(plot_x) <= _MARKER_MAX_POINTS else None,
+                    linestyle='-', color='dodgerblue', label='Mejor Aptitud (Real)')
+            # Media y mediana de la población (estadísticas calculadas en el proceso del AG)
+            if snapshot.statistics_history is not None:
+                for name, style, label in (('mean', '--', 'Media'), ('median', ':', 'Mediana')):
+                    series = snapshot.statistics(name)
+                    if np.isfinite(series).any():
+                        plot_x, plot_y = lttb_decimate(generations, series, pixel_width(ax))
+                        ax.plot(plot_x, plot_y, linestyle=style, color='grey', linewidth=1.0, label=label)
+
+            if np.isfinite(fitness_history).any():
+                if snapshot.optimization_type == "maximize":
+                    best_gen_idx = np.nanargmax(fitness_history)
                 else: 
-                    best_gen_idx = np.argmin(fitness_history)
-                ax.plot(best_gen_idx, fitness_history[best_gen_idx], '*', markersize=10, color='red', label='Mejor Global Histórico')
+                    best_gen_idx = np.nanargmin(fitness_history)
+                ax.plot(generations[best_gen_idx], fitness_history[best_gen_idx], '*', markersize=10, color='red', label='Mejor Global Histórico')
             ax.legend(fontsize='small')
 
     ax.set_xlabel("Generación")
@@ -67,11 +81,26 @@ def update_fitness_plot_qt(mpl_canvas: FigureCanvas, ga_optimizer_instance):
     mpl_canvas.draw_idle()
 
 
-def update_population_plot_qt(mpl_canvas: FigureCanvas, ga_instance_snapshot, func_str, x_range):
+def _scatter_or_density(ax, x, y, cmap, label, **scatter_kwargs):
+    """
+    Dispersión para pocos puntos; por encima de _DENSITY_MIN_POINTS, un hexbin (densidad)
+    con coste de dibujo fijo: el número de hexágonos no depende del número de puntos.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if valid.sum() <= _DENSITY_MIN_POINTS:
+        return ax.scatter(x[valid], y[valid], label=label, **scatter_kwargs)
+    return ax.hexbin(x[valid], y[valid], gridsize=_HEXBIN_GRIDSIZE, cmap=cmap, mincnt=1, bins='log',
+                     linewidths=0, alpha=0.8, label=f"{label} (densidad)")
+
+
+def update_population_plot_qt(mpl_canvas: FigureCanvas, snapshot, func_str, x_range):
     """
     Actualiza el gráfico de población en un MplCanvas de Qt.
     :param mpl_canvas: La instancia de MplCanvas donde se dibujará.
-    :param ga_instance_snapshot: La instancia de PyGAD de la generación actual.
+    :param snapshot: GenerationSnapshot de la generación actual (x, f(x) y mejor individuo ya
+                     calculados en el hilo del AG: aquí no se evalúa la población). El snapshot
+                     final incluye además todos los puntos evaluados.
     :param func_str: La función objetivo como string.
     :param x_range: Tupla (min_x, max_x).
     """
@@ -82,7 +111,7 @@ def update_population_plot_qt(mpl_canvas: FigureCanvas, ga_instance_snapshot, fu
     ax = mpl_canvas.axes
     ax.clear()
 
-    if ga_instance_snapshot is None or not func_str or not x_range :
+    if snapshot is None or not func_str or not x_range :
         ax.text(0.5, 0.5, "No hay datos de población", ha='center', va='center', transform=ax.transAxes)
         ax.set_xlabel("Valor de x")
         ax.set_ylabel("Valor de f(x)")
@@ -96,46 +125,32 @@ def update_population_plot_qt(mpl_canvas: FigureCanvas, ga_instance_snapshot, fu
         mpl_canvas.draw_idle()
         return
 
-    generation_num = ga_instance_snapshot.generations_completed
+    generation_num = snapshot.generation
 
     # Graficar la función objetivo
-    x_func_vals = np.linspace(x_range[0], x_range[1], 200)
-    y_func_vals = []
-    for x_val_f in x_func_vals:
-        try:
-            y_func_vals.append(safe_eval_function(func_str, x_val_f))
-        except (ValueError, TypeError): # Capturar TypeError también por si acaso
-            y_func_vals.append(np.nan)
+    # (muestreo cacheado en memoria y en disco por expresión, rango y resolución)
+    x_func_vals, y_func_vals = sample_function_curve(func_str, x_range, 200)
     ax.plot(x_func_vals, y_func_vals, color='darkgrey', linestyle='--', linewidth=1.5, label="f(x)")
 
-    # Obtener la población actual
-    population = ga_instance_snapshot.population
+    # Todos los puntos evaluados durante la ejecución (sin re-evaluar f(x))
+    if snapshot.archive_points is not None and len(snapshot.archive_points) > 0:
+        _scatter_or_density(ax, snapshot.archive_points[:, 0], snapshot.archive_values, 'Greys', "Evaluados",
+                            color='grey', s=4, alpha=0.3, linewidths=0)
+
+    # Población actual con su f(x) ya evaluado
     pop_y_evaluated = [] 
 
-    if population is not None and len(population) > 0:
-        pop_x_coords = np.array([sol[0] for sol in population])
-        current_pop_y_coords = []
-        for x_val_p in pop_x_coords:
-            try:
-                y_val_p = safe_eval_function(func_str, x_val_p)
-                current_pop_y_coords.append(y_val_p)
-                if not np.isnan(y_val_p): pop_y_evaluated.append(y_val_p)
-            except (ValueError, TypeError):
-                current_pop_y_coords.append(np.nan)
+    if len(snapshot.population) > 0:
+        pop_x_coords, current_pop_y_coords = snapshot.x_values, snapshot.f_values
+        pop_y_evaluated.extend(current_pop_y_coords[~np.isnan(current_pop_y_coords)].tolist())
         
-        ax.scatter(pop_x_coords, current_pop_y_coords, color='deepskyblue', s=25, alpha=0.8, edgecolors='black', linewidth=0.5, label=f"Población")
+        _scatter_or_density(ax, pop_x_coords, current_pop_y_coords, 'Blues', "Población",
+                            color='deepskyblue', s=25, alpha=0.8, edgecolors='black', linewidth=0.5)
 
     # Marcar la mejor solución de la generación actual
-    if ga_instance_snapshot.best_solution_generation != -1: 
-        best_sol_genes, _, _ = ga_instance_snapshot.best_solution()
-        if best_sol_genes is not None and len(best_sol_genes) > 0:
-            best_sol_x_coord = best_sol_genes[0]
-            try:
-                best_sol_y_coord = safe_eval_function(func_str, best_sol_x_coord)
-                if not np.isnan(best_sol_y_coord): pop_y_evaluated.append(best_sol_y_coord)
-                ax.scatter([best_sol_x_coord], [best_sol_y_coord], color='crimson', s=80, marker='*', zorder=5, edgecolors='black', label="Mejor de Gen.")
-            except (ValueError, TypeError):
-                pass 
+    if np.isfinite(snapshot.best_f):
+        pop_y_evaluated.append(snapshot.best_f)
+        ax.scatter([snapshot.best_x], [snapshot.best_f], color='crimson', s=80, marker='*', zorder=5, edgecolors='black', label="Mejor de Gen.")
 
     ax.set_xlabel("Valor de x")
     ax.set_ylabel("Valor de f(x)")
@@ -147,7 +162,7 @@ def update_population_plot_qt(mpl_canvas: FigureCanvas, ga_instance_snapshot, fu
     ax.legend(fontsize='x-small', loc='best') 
     ax.grid(True, linestyle=':', alpha=0.7)
     
-    valid_y_func_for_limits = [y for y in y_func_vals if y is not None and not np.isnan(y)]
+    valid_y_func_for_limits = y_func_vals[~np.isnan(y_func_vals)].tolist()
     all_valid_y_for_limits = valid_y_func_for_limits + pop_y_evaluated
     if all_valid_y_for_limits:
         min_y, max_y = np.min(all_valid_y_for_limits), np.max(all_valid_y_for_limits)
@@ -165,6 +180,183 @@ def update_population_plot_qt(mpl_canvas: FigureCanvas, ga_instance_snapshot, fu
     mpl_canvas.draw_idle()
 
 
+def update_pareto_plot_qt(mpl_canvas: FigureCanvas, snapshot):
+    """
+    Modo multiobjetivo: dibuja en el espacio de objetivos (los dos primeros) la población
+    actual y el frente de Pareto acumulado por GeneticOptimizer.
+    :param mpl_canvas: La instancia de MplCanvas donde se dibujará.
+    :param snapshot: GenerationSnapshot en modo multiobjetivo (incluye el frente y la solución de compromiso).
+    """
+    if mpl_canvas is None or mpl_canvas.axes is None:
+        print("Error: Canvas de población no proporcionado o no inicializado.")
+        return
+
+    ax = mpl_canvas.axes
+    ax.clear()
+    labels = list(snapshot.objective_labels) if snapshot is not None else ["f1(x)", "f2(x)"]
+
+    if snapshot is None or snapshot.pareto_F is None or len(snapshot.pareto_F) == 0:
+        ax.text(0.5, 0.5, "No hay frente de Pareto", ha='center', va='center', transform=ax.transAxes)
+    else:
+        front_f = snapshot.pareto_F
+        # Población actual en el espacio de objetivos (valores reales)
+        pop_f = snapshot.f_values
+        _scatter_or_density(ax, pop_f[:, 0], pop_f[:, 1], 'Blues', "Población",
+                            color='deepskyblue', s=20, alpha=0.6, edgecolors='black', linewidth=0.4)
+        ax.plot(front_f[:, 0], front_f[:, 1], color='crimson', marker='o', markersize=3, linestyle='-',
+                linewidth=1.0, label=f"Frente de Pareto ({len(front_f)})")
+        best = snapshot.best_details
+        if best:
+            ax.scatter([best['f_values'][0]], [best['f_values'][1]], color='gold', s=90, marker='*', zorder=5,
+                       edgecolors='black', label="Compromiso")
+        ax.legend(fontsize='x-small', loc='best')
+        ax.set_title(f"Generación: {snapshot.generation}", fontsize=9, loc='center')
+
+    ax.set_xlabel(labels[0], fontsize=8)
+    ax.set_ylabel(labels[1], fontsize=8)
+    ax.grid(True, linestyle=':', alpha=0.7)
+    try:
+        mpl_canvas.fig.tight_layout(rect=[0, 0.03, 1, 0.95] if mpl_canvas.fig._suptitle else None)
+    except Exception:
+        pass
+    mpl_canvas.draw_idle()
+
+
+def plot_stored_run_qt(fitness_canvas: FigureCanvas, population_canvas: FigureCanvas, run, generations,
+                       population, pareto=None):
+    """
+    Dibuja una ejecución recargada de la base de resultados, sin volver a ejecutarla.
+    :param run: Metadatos de ResultsStore.get_run (incluye 'params').
+    :param generations: Resumen por generación de ResultsStore.get_generations.
+    :param population: (x, F) de la población final (ResultsStore.get_solutions).
+    :param pareto: (x, F) del frente de Pareto en modo multiobjetivo (opcional).
+    """
+    params = run['params']
+    ax = fitness_canvas.axes
+    ax.clear()
+    if len(generations['generation']) == 0:
+        ax.text(0.5, 0.5, "No hay datos de fitness", ha='center', va='center', transform=ax.transAxes)
+    else:
+        n_points = pixel_width(ax)
+        ax.plot(*lttb_decimate(generations['generation'], generations['best'], n_points),
+                linestyle='-', color='dodgerblue', label='Mejor')
+        ax.plot(*lttb_decimate(generations['generation'], generations['mean'], n_points),
+                linestyle='--', color='grey', linewidth=1.0, label='Media')
+        if np.isfinite(generations.get('median', np.empty(0))).any():  # Ejecuciones guardadas con estadísticas
+            ax.plot(*lttb_decimate(generations['generation'], generations['median'], n_points),
+                    linestyle=':', color='grey', linewidth=1.0, label='Mediana')
+        ax.legend(fontsize='small')
+    ax.set_title(f"Ejecución {run['id']} ({run['created_at']})", fontsize=9, loc='center')
+    ax.set_xlabel("Generación")
+    ax.set_ylabel("Aptitud")
+    ax.grid(True, linestyle=':', alpha=0.7)
+
+    ax = population_canvas.axes
+    ax.clear()
+    pop_x, pop_f = population
+    if params.get('func_strs'):
+        if pop_f.ndim == 2 and len(pop_f):
+            _scatter_or_density(ax, pop_f[:, 0], pop_f[:, 1], 'Blues', "Población",
+                                color='deepskyblue', s=20, alpha=0.6, edgecolors='black', linewidth=0.4)
+        if pareto is not None and len(pareto[1]):
+            ax.plot(pareto[1][:, 0], pareto[1][:, 1], color='crimson', marker='o', markersize=3, linestyle='-',
+                    linewidth=1.0, label=f"Frente de Pareto ({len(pareto[1])})")
+        ax.set_xlabel(f"{params['objective_types'][0][:3]}: {params['func_strs'][0]}", fontsize=8)
+        ax.set_ylabel(f"{params['objective_types'][1][:3]}: {params['func_strs'][1]}", fontsize=8)
+    else:
+        x_range = (params['range_min'], params['range_max'])
+        try:
+            x_curve, y_curve = sample_function_curve(params['func_str'], x_range)
+            ax.plot(x_curve, y_curve, color='darkgrey', linestyle='--', linewidth=1.5, label="f(x)")
+        except Exception as e:
+            print(f"Error al muestrear f(x) de la ejecución guardada: {e}")
+        _scatter_or_density(ax, pop_x, pop_f, 'Blues', "Población final",
+                            color='deepskyblue', s=25, alpha=0.8, edgecolors='black', linewidth=0.5)
+        if run.get('best_x') is not None and run.get('best_f') is not None:
+            ax.scatter([run['best_x']], [run['best_f']], color='crimson', s=80, marker='*', zorder=5,
+                       edgecolors='black', label="Mejor Global")
+        ax.set_xlim(*x_range)
+        ax.set_xlabel("Valor de x")
+        ax.set_ylabel("Valor de f(x)")
+    ax.set_title(f"Generación: {run['generations_completed']}", fontsize=9, loc='center')
+    ax.legend(fontsize='x-small', loc='best')
+    ax.grid(True, linestyle=':', alpha=0.7)
+
+    for canvas in (fitness_canvas, population_canvas):
+        try:
+            canvas.fig.tight_layout(rect=[0, 0.03, 1, 0.95] if canvas.fig._suptitle else None)
+        except Exception:
+            pass
+        canvas.draw_idle()
+
+
+def _curves_matrix(curves, run_ids, metric):
+    """Matriz (ejecuciones, generaciones) de la métrica; columna = número de generación, NaN donde no hay dato."""
+    max_gen = max(int(curves[r]['generation'].max()) for r in run_ids)
+    Y = np.full((len(run_ids), max_gen + 1), np.nan)
+    for i, run_id in enumerate(run_ids):
+        Y[i, curves[run_id]['generation'].astype(int)] = curves[run_id][metric]
+    return Y
+
+
+def plot_runs_comparison_qt(mpl_canvas: FigureCanvas, curves, metric='best', groups=None, percentiles=(10, 90)):
+    """
+    Superpone la curva de una métrica ('best', 'mean' o 'worst') de muchas ejecuciones
+    guardadas, con la mediana y una banda de percentiles por grupo de configuración.
+    Todas las curvas de un grupo van en una sola LineCollection y se deciman (min-max) al
+    ancho en píxeles de los ejes, así que 100 ejecuciones x 10000 generaciones se dibujan
+    con unos pocos miles de vértices.
+    :param curves: {run_id: resumen por generación} (ResultsStore.get_generations_many).
+    :param groups: {run_id: etiqueta del grupo} o None (un único grupo).
+    """
+    if mpl_canvas is None or mpl_canvas.axes is None:
+        print("Error: Canvas de comparación no proporcionado o no inicializado.")
+        return
+    ax = mpl_canvas.axes
+    ax.clear()
+    run_ids = [r for r in curves if len(curves[r]['generation'])]
+    if not run_ids:
+        ax.text(0.5, 0.5, "Las ejecuciones no tienen datos por generación", ha='center', va='center', transform=ax.transAxes)
+        mpl_canvas.draw_idle()
+        return
+
+    n_bins = max(pixel_width(ax) // 2, 50)  # Dos vértices (mín, máx) por bloque: ~1 por píxel
+    groups = groups or {r: "Todas" for r in run_ids}
+    labels = list(dict.fromkeys(groups[r] for r in run_ids))
+    colors = plt.cm.tab10(np.arange(len(labels)) % 10)
+    for label, color in zip(labels, colors):
+        ids = [r for r in run_ids if groups[r] == label]
+        Y = _curves_matrix(curves, ids, metric)
+        idx, Y_dec = minmax_decimate_rows(Y, n_bins)
+        segments = []
+        for idx_row, y_row in zip(idx, Y_dec):
+            valid = np.isfinite(y_row)
+            segments.append(np.column_stack([idx_row[valid], y_row[valid]]))
+        ax.add_collection(LineCollection(segments, colors=[color], linewidths=0.6,
+                                         alpha=float(np.clip(3.0 / len(ids), 0.05, 0.6))))
+
+        generations = np.arange(Y.shape[1])
+        low, median, high = column_percentiles(Y, [percentiles[0], 50, percentiles[1]])
+        x_band, low_dec, high_dec = envelope_decimate(generations, low, high, n_bins)
+        ax.fill_between(x_band, low_dec, high_dec, color=color, alpha=0.2, linewidth=0)
+        x_med, median_dec = minmax_decimate(generations, median, n_bins)
+        ax.plot(x_med, median_dec, color=color, linewidth=1.8, label=f"{label} (n={len(ids)})")
+
+    ax.autoscale_view()
+    metric_names = {'best': "Mejor", 'mean': "Media", 'worst': "Peor"}
+    ax.set_title(f"{metric_names.get(metric, metric)} aptitud: mediana y banda p{percentiles[0]}-p{percentiles[1]}",
+                 fontsize=9, loc='center')
+    ax.set_xlabel("Generación")
+    ax.set_ylabel("Aptitud")
+    ax.legend(fontsize='x-small', loc='best')
+    ax.grid(True, linestyle=':', alpha=0.7)
+    try:
+        mpl_canvas.fig.tight_layout(rect=[0, 0.03, 1, 0.95] if mpl_canvas.fig._suptitle else None)
+    except Exception:
+        pass
+    mpl_canvas.draw_idle()
+
+
 def clear_plots_qt(fitness_canvas: FigureCanvas, population_canvas: FigureCanvas):
     """Limpia ambos gráficos de Matplotlib en los canvas de Qt."""
     canvases_details = [